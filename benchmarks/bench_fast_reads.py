@@ -0,0 +1,119 @@
+"""
+一覧取得の読み取り経路 (boto3 resource と 低レベルクライアント + 専用の変換) を比べるベンチマーク
+
+使い方:
+    python -m benchmarks.bench_fast_reads [--sizes 10000,100000] [--threshold 512] [--moto]
+
+既定では、Scan の応答 ({"S": ...} 形式のアイテム) からタスクのリストを作るまでの CPU 時間を比べます。
+応答の JSON 解析までは両経路で同じため、その後の変換だけを測ります。
+
+- resource: TypeDeserializer で全属性を変換 (数値は Decimal) し、decode_task_item で検証して生成する
+- fast    : decode_task_attribute_values で Task の属性だけを直接読み、1回の model_validate で生成する
+
+圧縮された説明文の展開は両経路に共通のため、--threshold を大きくすると変換そのものの差が分かります。
+
+--moto を付けると、moto のテーブルにアイテムを書き込み、TaskDynamoDBRepository.list_tasks 全体の時間も比べます
+(moto 自体の処理時間を含むため、差は小さく見えます)。
+"""
+
+import argparse
+import os
+import sys
+from time import perf_counter
+
+from boto3.dynamodb.types import TypeDeserializer, TypeSerializer
+
+from benchmarks.bench_item_encoding import compact_item, make_corpus
+from src.core.metrics import metrics
+from src.infrastructure.repositories.task_item_codec import (
+    DEFAULT_COMPRESS_THRESHOLD,
+    decode_task_attribute_values,
+    decode_task_item,
+)
+
+TABLE_NAME = "bench-tasks"
+
+
+def resource_path(items: list[dict]) -> list:
+    deserializer = TypeDeserializer()
+    return [decode_task_item({name: deserializer.deserialize(value) for name, value in item.items()}) for item in items]
+
+
+def fast_path(items: list[dict]) -> list:
+    return [decode_task_attribute_values(item) for item in items]
+
+
+def best_of(fn, items, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = perf_counter()
+        fn(items)
+        best = min(best, perf_counter() - start)
+    return best
+
+
+def bench_decode(corpus, size: int, threshold: int, repeat: int) -> None:
+    serializer = TypeSerializer()
+    items = [
+        {name: serializer.serialize(value) for name, value in compact_item(task, threshold).items()}
+        for task in corpus[:size]
+    ]
+    resource = best_of(resource_path, items, repeat)
+    fast = best_of(fast_path, items, repeat)
+    print(
+        f"decode {size:>7d} items: resource {resource * 1000:9.1f} ms ({resource / size * 1e6:5.2f} us/item)  "
+        f"fast {fast * 1000:9.1f} ms ({fast / size * 1e6:5.2f} us/item)  speedup x{resource / fast:4.1f}"
+    )
+
+
+def bench_moto(corpus, size: int) -> None:
+    import boto3
+    from moto import mock_aws
+
+    from src.infrastructure.repositories.task_repository import TaskDynamoDBRepository
+
+    os.environ.setdefault("AWS_DEFAULT_REGION", "ap-northeast-1")
+    with mock_aws():
+        boto3.resource("dynamodb").create_table(
+            TableName=TABLE_NAME,
+            KeySchema=[{"AttributeName": "id", "KeyType": "HASH"}],
+            AttributeDefinitions=[{"AttributeName": "id", "AttributeType": "S"}],
+            BillingMode="PAY_PER_REQUEST",
+        )
+        resource_repository = TaskDynamoDBRepository(TABLE_NAME)
+        fast_repository = TaskDynamoDBRepository(TABLE_NAME, fast_reads=True)
+        resource_repository.batch_create_tasks(corpus[:size])
+
+        timings = {}
+        for label, repository in (("resource", resource_repository), ("fast", fast_repository)):
+            start = perf_counter()
+            tasks = repository.list_tasks()
+            timings[label] = perf_counter() - start
+            assert len(tasks) == size
+        print(
+            f"list_tasks (moto) {size:>7d} items: resource {timings['resource'] * 1000:9.1f} ms  "
+            f"fast {timings['fast'] * 1000:9.1f} ms  speedup x{timings['resource'] / timings['fast']:4.1f}"
+        )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="10000,100000", help="comma separated item counts")
+    parser.add_argument("--threshold", type=int, default=DEFAULT_COMPRESS_THRESHOLD)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--moto", action="store_true", help="also time list_tasks end to end against moto")
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(",")]
+    corpus = make_corpus(max(sizes), seed=1)
+    metrics.enabled = False
+    for size in sizes:
+        bench_decode(corpus, size, args.threshold, args.repeat)
+    if args.moto:
+        for size in sizes:
+            bench_moto(corpus, size)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
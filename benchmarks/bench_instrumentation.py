@@ -0,0 +1,73 @@
+"""
+リクエスト経路に追加した計測 (メトリクス記録と遅延整形のログ) のオーバーヘッドを測るベンチマーク
+
+使い方:
+    python -m benchmarks.bench_instrumentation [--iterations 200000] [--budget-us 5.0]
+
+計測あり/なしの同じ関数の1回あたりの差分が予算 (マイクロ秒) を超えた場合は終了コード 1 を返します。
+"""
+
+import argparse
+import sys
+from time import perf_counter
+
+from src.core.logger import get_logger
+from src.core.metrics import instrumented, metrics, record_dynamodb_call
+
+logger = get_logger("benchmarks.instrumentation")
+
+
+class _Model:
+    name = "GetItem"
+
+
+def bare(task_id: str) -> str:
+    return task_id
+
+
+@instrumented("bench")
+def wrapped(task_id: str) -> str:
+    # 本番と同じく、サンプリングされない DEBUG ログと DynamoDB 呼び出しの計数を含める
+    logger.debug("Fetching task %s.", task_id)
+    record_dynamodb_call(model=_Model)
+    return task_id
+
+
+def per_call_us(fn, iterations: int) -> float:
+    best = float("inf")
+    for _ in range(5):
+        start = perf_counter()
+        for _ in range(iterations):
+            fn("550e8400-e29b-41d4-a716-446655440001")
+        best = min(best, perf_counter() - start)
+        # 計測中に貯まった値は EMF として出力せずに捨てる
+        metrics._values.clear()
+    return best / iterations * 1_000_000
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=200_000)
+    parser.add_argument("--budget-us", type=float, default=5.0, help="allowed overhead per call in microseconds")
+    args = parser.parse_args()
+
+    flush = metrics.flush
+    metrics.flush = lambda: metrics._values.clear()  # type: ignore[method-assign]
+    try:
+        baseline = per_call_us(bare, args.iterations)
+        instrumented_cost = per_call_us(wrapped, args.iterations)
+    finally:
+        metrics.flush = flush  # type: ignore[method-assign]
+
+    overhead = instrumented_cost - baseline
+    print(f"baseline      : {baseline:8.3f} us/call")
+    print(f"instrumented  : {instrumented_cost:8.3f} us/call")
+    print(f"overhead      : {overhead:8.3f} us/call (budget {args.budget_us:.3f} us)")
+    if overhead > args.budget_us:
+        print("FAIL: instrumentation overhead exceeds budget", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,147 @@
+"""
+タスクアイテムの保存形式 (task_item_codec) によるアイテムサイズと消費キャパシティの削減を測るベンチマーク
+
+使い方:
+    python -m benchmarks.bench_item_encoding [--items 10000] [--threshold 512] [--seed 1]
+
+説明文の長さが実際の利用に近い分布 (大半は短く、一部に議事録のような長文を含む) のタスクを生成し、
+列挙値の名前と平文のまま保存する従来の形式と、現在の形式とで次を比較します。
+
+- アイテムサイズ (DynamoDB の計算方法: 属性名 + 値のバイト数)
+- GetItem の RCU (強い整合性、4KB 単位)、PutItem の WCU (1KB 単位)
+- テーブル全体の Scan の RCU (スキャンしたアイテムの合計サイズを 4KB 単位で切り上げ)
+- 変換 1 件あたりの CPU 時間
+"""
+
+import argparse
+import math
+import random
+import sys
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from time import perf_counter
+
+from src.domains.models.task import PRIORITY_DICT, Task, TaskStatus
+from src.infrastructure.repositories.task_item_codec import decode_task_item, encode_task_attributes, item_size
+from src.infrastructure.repositories.task_repository import sync_key, sync_shard
+
+WORDS = (
+    "the customer reported that the export job fails when the report contains more than one thousand rows "
+    "please check the retry policy and the timeout settings of the batch worker before the next release "
+    "会議 議事録 対応 確認 依頼 顧客 仕様 変更 リリース 手順 障害 調査 結果 共有 期限 担当 レビュー 修正 "
+    "deploy staging production rollback monitoring alert dashboard latency error budget owner follow-up"
+).split()
+
+
+def make_text(rng: random.Random, length: int) -> str:
+    words = []
+    size = 0
+    while size < length:
+        word = rng.choice(WORDS)
+        words.append(word)
+        size += len(word.encode("utf-8")) + 1
+    return " ".join(words)
+
+
+def description_length(rng: random.Random) -> int:
+    bucket = rng.random()
+    if bucket < 0.6:
+        return rng.randint(0, 200)
+    if bucket < 0.9:
+        return rng.randint(200, 2_000)
+    return rng.randint(2_000, 20_000)
+
+
+def make_corpus(count: int, seed: int) -> list[Task]:
+    rng = random.Random(seed)
+    start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    return [
+        Task.create(
+            title=make_text(rng, rng.randint(10, 60)),
+            description=make_text(rng, description_length(rng)),
+            due_date=(start + timedelta(days=rng.randint(0, 365))).date().isoformat(),
+            priority=rng.choice(list(PRIORITY_DICT)),
+        ).model_copy(update={"status": rng.choice(list(TaskStatus))})
+        for _ in range(count)
+    ]
+
+
+def _common_attributes(task: Task) -> dict:
+    item = task.model_dump(exclude={"updated_at", "deleted"})
+    item["id"] = str(task.id)
+    item["updated_at"] = task.updated_at.isoformat()
+    item["sync_key"] = sync_key(task.updated_at, item["id"])
+    item["sync_shard"] = sync_shard(item["id"])
+    return item
+
+
+def legacy_item(task: Task) -> dict:
+    item = _common_attributes(task)
+    item["status"] = task.status.value
+    item["priority"] = task.priority.value
+    return item
+
+
+def compact_item(task: Task, threshold: int) -> dict:
+    item = _common_attributes(task)
+    item.update(encode_task_attributes(task, threshold))
+    return item
+
+
+def summarize(label: str, items: list[dict]) -> dict:
+    sizes = [item_size(item) for item in items]
+    total = sum(sizes)
+    summary = {
+        "label": label,
+        "avg": total / len(sizes),
+        "max": max(sizes),
+        "get_rcu": sum(math.ceil(size / 4096) for size in sizes),
+        "put_wcu": sum(math.ceil(size / 1024) for size in sizes),
+        "scan_rcu": math.ceil(total / 4096),
+    }
+    print(
+        f"{label:8s} avg {summary['avg']:9.1f} B  max {summary['max']:7d} B  "
+        f"GetItem {summary['get_rcu']:8d} RCU  PutItem {summary['put_wcu']:8d} WCU  Scan {summary['scan_rcu']:7d} RCU"
+    )
+    return summary
+
+
+def per_item_us(fn, values) -> float:
+    start = perf_counter()
+    for value in values:
+        fn(value)
+    return (perf_counter() - start) / len(values) * 1_000_000
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, default=10_000)
+    parser.add_argument("--threshold", type=int, default=512, help="compress text attributes of at least this size")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    corpus = make_corpus(args.items, args.seed)
+    legacy = [legacy_item(task) for task in corpus]
+    compact = [compact_item(task, args.threshold) for task in corpus]
+
+    print(f"{args.items} tasks, compress threshold {args.threshold} B")
+    before = summarize("legacy", legacy)
+    after = summarize("compact", compact)
+    for key, label in (
+        ("avg", "item size"),
+        ("get_rcu", "GetItem RCU"),
+        ("put_wcu", "PutItem WCU"),
+        ("scan_rcu", "Scan RCU"),
+    ):
+        print(f"{label:12s}: {1 - after[key] / before[key]:6.1%} saved")
+
+    encode_us = per_item_us(lambda task: compact_item(task, args.threshold), corpus)
+    decode_us = per_item_us(decode_task_item, compact)
+    legacy_decode_us = per_item_us(lambda item: Task(**item), legacy)
+    print(f"encode  : {encode_us:7.2f} us/item")
+    print(f"decode  : {decode_us:7.2f} us/item (legacy {legacy_decode_us:.2f} us/item)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
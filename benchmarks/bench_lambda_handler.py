@@ -0,0 +1,177 @@
+"""
+Function URL の呼び出し経路 (Lambda Web Adapter + uvicorn と、イベントを直接 ASGI に渡す経路) を比べるベンチマーク
+
+使い方:
+    python -m benchmarks.bench_lambda_handler [--requests 2000] [--cold-starts 5] [--path /docs]
+
+- リクエストごとのオーバーヘッド
+    - adapter: 別スレッドの uvicorn に localhost の HTTP (keep-alive) でリクエストし、応答を読み切るまで
+    - direct : イベントの JSON を解析し、function_url.handler を呼び、戻り値を JSON にするまで
+  Web Adapter 自体 (Rust) がイベントと HTTP を変換する時間は含まないため、実際の差はこれより大きくなります。
+- コールドスタート (新しいプロセスを起動してから最初の応答を得るまで)
+    - adapter: uvicorn を起動し、Web Adapter の準備完了チェックと同じく 10 ms ごとに接続を試してから1回リクエストする
+    - direct : function_url を読み込み、handler で1回リクエストする
+
+どちらも同じ app を呼び出すため、認証や DynamoDB を使わない path (既定は /docs) を指定してください。
+"""
+
+import argparse
+import http.client
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from time import perf_counter
+
+import uvicorn
+
+from src.core.metrics import metrics
+from src.entrypoints import function_url
+from src.main import app
+
+READINESS_CHECK_INTERVAL_SECONDS = 0.01
+
+DIRECT_COLD_START = """
+import json, sys
+from src.entrypoints.function_url import handler
+result = handler(json.loads(sys.argv[1]), None)
+print(result["statusCode"], flush=True)
+"""
+
+
+def make_event(path: str) -> dict:
+    return {
+        "version": "2.0",
+        "rawPath": path,
+        "rawQueryString": "",
+        "headers": {"host": "bench.lambda-url.ap-northeast-1.on.aws", "accept": "*/*"},
+        "requestContext": {
+            "domainName": "bench.lambda-url.ap-northeast-1.on.aws",
+            "http": {"method": "GET", "path": path, "protocol": "HTTP/1.1", "sourceIp": "203.0.113.1"},
+        },
+        "isBase64Encoded": False,
+    }
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def per_request(samples: list[float]) -> str:
+    samples = sorted(samples)
+    p99 = samples[int(len(samples) * 0.99) - 1]
+    return f"median {statistics.median(samples) * 1e6:8.1f} us  p99 {p99 * 1e6:8.1f} us"
+
+
+def bench_adapter_requests(path: str, requests: int) -> list[float]:
+    port = free_port()
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning", access_log=False))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(READINESS_CHECK_INTERVAL_SECONDS)
+
+    connection = http.client.HTTPConnection("127.0.0.1", port)
+    samples = []
+    try:
+        for _ in range(requests):
+            start = perf_counter()
+            connection.request("GET", path)
+            response = connection.getresponse()
+            response.read()
+            samples.append(perf_counter() - start)
+            assert response.status == 200, response.status
+    finally:
+        connection.close()
+        server.should_exit = True
+        thread.join()
+    return samples
+
+
+def bench_direct_requests(path: str, requests: int) -> list[float]:
+    payload = json.dumps(make_event(path))
+    samples = []
+    for _ in range(requests):
+        start = perf_counter()
+        result = function_url.handler(json.loads(payload), None)
+        json.dumps(result)
+        samples.append(perf_counter() - start)
+        assert result["statusCode"] == 200, result["statusCode"]
+    return samples
+
+
+def cold_start_adapter(path: str) -> float:
+    port = free_port()
+    start = perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "src.main:app", "--port", str(port), "--log-level", "warning"],
+        stdout=subprocess.DEVNULL,
+    )
+    try:
+        while True:
+            connection = http.client.HTTPConnection("127.0.0.1", port)
+            try:
+                connection.request("GET", path)
+                response = connection.getresponse()
+                response.read()
+                break
+            except ConnectionRefusedError:
+                time.sleep(READINESS_CHECK_INTERVAL_SECONDS)
+            finally:
+                connection.close()
+        elapsed = perf_counter() - start
+        assert response.status == 200, response.status
+        return elapsed
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def cold_start_direct(path: str) -> float:
+    start = perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-c", DIRECT_COLD_START, json.dumps(make_event(path))], stdout=subprocess.PIPE, text=True
+    )
+    try:
+        status = process.stdout.readline().strip()
+        elapsed = perf_counter() - start
+        assert status == "200", status
+        return elapsed
+    finally:
+        process.wait()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--cold-starts", type=int, default=5)
+    parser.add_argument("--path", default="/docs", help="path of a route that needs no auth nor AWS")
+    args = parser.parse_args()
+
+    os.environ.setdefault("AWS_DEFAULT_REGION", "ap-northeast-1")
+    os.environ["POWERTOOLS_METRICS_DISABLED"] = "true"
+    metrics.enabled = False
+
+    # 1回目の呼び出し (OpenAPI の生成など) を除く
+    bench_direct_requests(args.path, 10)
+    adapter = bench_adapter_requests(args.path, args.requests)
+    direct = bench_direct_requests(args.path, args.requests)
+    print(f"per request  adapter {per_request(adapter)}")
+    print(f"per request  direct  {per_request(direct)}")
+    print(f"per request  saved   {(statistics.median(adapter) - statistics.median(direct)) * 1e6:8.1f} us (median)")
+
+    if args.cold_starts > 0:
+        adapter_cold = statistics.median(cold_start_adapter(args.path) for _ in range(args.cold_starts))
+        direct_cold = statistics.median(cold_start_direct(args.path) for _ in range(args.cold_starts))
+        print(f"cold start   adapter {adapter_cold * 1000:8.1f} ms  direct {direct_cold * 1000:8.1f} ms (median)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
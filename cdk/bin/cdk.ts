@@ -13,8 +13,13 @@ class BackendStack extends cdk.Stack {
   constructor(scope: Construct, id: string, props?: cdk.StackProps) {
     super(scope, id, props);
 
-    new InfraStack(this, 'InfraStack');
-    const appStack = new AppStack(this, 'AppStack');
+    const infraStack = new InfraStack(this, 'InfraStack');
+    const appStack = new AppStack(this, 'AppStack', {
+      tasksTable: infraStack.tasksTable,
+      archiveBucket: infraStack.archiveBucket,
+      // cdk deploy -c handlerMode=direct で Web Adapter を介さない呼び出しに切り替える
+      handlerMode: this.node.tryGetContext('handlerMode') ?? 'adapter',
+    });
 
     new GlobalStack(app, 'GlobalStack', {
       originUrl: appStack.functionUrl,
@@ -2,30 +2,57 @@ import * as cdk from 'aws-cdk-lib';
 import { Construct } from 'constructs';
 import * as lambda from 'aws-cdk-lib/aws-lambda';
 import * as iam from 'aws-cdk-lib/aws-iam';
+import * as dynamodb from 'aws-cdk-lib/aws-dynamodb';
+import * as s3 from 'aws-cdk-lib/aws-s3';
 import * as path from 'path';
 
+export interface AppStackProps extends cdk.StackProps {
+  // タスクテーブル (CRUD と、SSE の変更フィードに使うストリームの読み取り)
+  readonly tasksTable?: dynamodb.ITable;
+  // 退避済みタスクの読み取り (GET /tasks/archived など) に使うアーカイブバケット
+  readonly archiveBucket?: s3.IBucket;
+  // FastAPI の呼び出し方。'adapter': Lambda Web Adapter 経由 (既定), 'direct': イベントを直接 ASGI に渡す
+  readonly handlerMode?: 'adapter' | 'direct';
+}
+
 export class AppStack extends cdk.Stack {
   public readonly functionUrl: string; // Lambda Function URL をエクスポート
 
-  constructor(scope: Construct, id: string, props?: cdk.StackProps) {
+  constructor(scope: Construct, id: string, props?: AppStackProps) {
     super(scope, id, props);
 
     // 定数：CloudFront が付与するカスタムヘッダーの値
     const customSecret = "MY_CLOUDFRONT_SECRET";
 
+    const handlerMode = props?.handlerMode ?? 'adapter';
+
     // Lambda 関数 (FastAPI) をコンテナイメージから作成
+    // Dockerfile のターゲットで呼び出し方を切り替える (どちらも応答はストリーミングで返す)
     const webAdapterLambda = new lambda.DockerImageFunction(this, 'FastAPIFunction', {
       code: lambda.DockerImageCode.fromImageAsset(path.join(__dirname, '../..'), {
         file: 'Dockerfile',
+        target: handlerMode,
       }),
       memorySize: 1024,
       timeout: cdk.Duration.seconds(300),
-      environment: {
-        AWS_LWA_INVOKE_MODE: 'RESPONSE_STREAM',
-      },
+      environment: handlerMode === 'adapter' ? { AWS_LWA_INVOKE_MODE: 'RESPONSE_STREAM' } : {},
       tracing: lambda.Tracing.ACTIVE,
     });
 
+    if (props?.tasksTable) {
+      webAdapterLambda.addEnvironment('TASKS_TABLE_NAME', props.tasksTable.tableName);
+      // Lambda の実行環境は1度に1リクエストしか処理しないため、
+      // GET /tasks/events には他の実行環境での書き込みをストリーム経由で届ける
+      webAdapterLambda.addEnvironment('TASK_EVENTS_SOURCE', 'dynamodb-stream');
+      props.tasksTable.grantReadWriteData(webAdapterLambda);
+      props.tasksTable.grantStreamRead(webAdapterLambda);
+    }
+
+    if (props?.archiveBucket) {
+      webAdapterLambda.addEnvironment('ARCHIVE_BUCKET', props.archiveBucket.bucketName);
+      props.archiveBucket.grantRead(webAdapterLambda);
+    }
+
     webAdapterLambda.addToRolePolicy(new iam.PolicyStatement({
       sid: "BedrockInvokePolicy",
       effect: iam.Effect.ALLOW,
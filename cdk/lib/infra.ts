@@ -4,12 +4,19 @@ import * as path from 'path';
 import { Stack, StackProps } from 'aws-cdk-lib';
 import { Construct } from 'constructs';
 import * as lambda from 'aws-cdk-lib/aws-lambda';
+import * as lambdaEventSources from 'aws-cdk-lib/aws-lambda-event-sources';
+import * as s3 from 'aws-cdk-lib/aws-s3';
+import * as sqs from 'aws-cdk-lib/aws-sqs';
+import * as events from 'aws-cdk-lib/aws-events';
+import * as targets from 'aws-cdk-lib/aws-events-targets';
 
 import * as dynamodb from 'aws-cdk-lib/aws-dynamodb';
 
 export class InfraStack extends cdk.Stack {
     public readonly userPool: cognito.UserPool;
     public readonly userPoolClient: cognito.UserPoolClient;
+    public readonly archiveBucket: s3.Bucket;
+    public readonly tasksTable: dynamodb.Table;
 
     constructor(scope: Construct, id: string, props?: cdk.StackProps) {
         super(scope, id, props);
@@ -64,17 +71,130 @@ export class InfraStack extends cdk.Stack {
         });
 
         // DB系 ============================
-        const tasksTable = new dynamodb.Table(this, 'TasksTable', {
+        this.tasksTable = new dynamodb.Table(this, 'TasksTable', {
             partitionKey: { name: 'id', type: dynamodb.AttributeType.STRING },
             billingMode: dynamodb.BillingMode.PAY_PER_REQUEST,
+            // 完了したタスクは ttl の時刻を過ぎるとテーブルから削除される
+            timeToLiveAttribute: 'ttl',
+            // 削除されたタスクをアーカイブへ書き出すためにストリームを有効化
+            stream: dynamodb.StreamViewType.NEW_AND_OLD_IMAGES,
         });
 
+        // 差分同期 (GET /tasks/changes) 用。更新時刻順の sync_key を sync_shard ごとに並べる
+        this.tasksTable.addGlobalSecondaryIndex({
+            indexName: 'sync-index',
+            partitionKey: { name: 'sync_shard', type: dynamodb.AttributeType.NUMBER },
+            sortKey: { name: 'sync_key', type: dynamodb.AttributeType.STRING },
+            projectionType: dynamodb.ProjectionType.ALL,
+        });
+
+        const tasksTable = this.tasksTable;
+
         // テーブル名を環境変数として Lambda に渡す
         authLambda.addEnvironment('TASKS_TABLE_NAME', tasksTable.tableName);
 
         // Lambda に DynamoDB へのアクセス権限を付与
         tasksTable.grantReadWriteData(authLambda);
 
+        // アーカイブ系 ============================
+        // TTL で期限切れになったタスクの退避先 (dt=YYYY-MM-DD/ で日付ごとに分割し、index/<タスクID> に格納先を記録)
+        this.archiveBucket = new s3.Bucket(this, 'TaskArchiveBucket', {
+            encryption: s3.BucketEncryption.S3_MANAGED,
+            blockPublicAccess: s3.BlockPublicAccess.BLOCK_ALL,
+            enforceSSL: true,
+            removalPolicy: cdk.RemovalPolicy.RETAIN,
+        });
+
+        const archiveLambda = new lambda.Function(this, 'TaskArchiveHandler', {
+            runtime: lambda.Runtime.PYTHON_3_13,
+            handler: 'src.entrypoints.archive_stream.handler',
+            code: lambda.Code.fromAsset(path.join(__dirname, '../..'), {
+                exclude: ['cdk', 'node_modules', 'tests', '.git', '.venv'],
+                bundling: {
+                    image: lambda.Runtime.PYTHON_3_13.bundlingImage,
+                    command: [
+                        'bash', '-c',
+                        'pip install -r src/requirements.txt -t /asset-output && cp -r src /asset-output/',
+                    ],
+                },
+            }),
+            timeout: cdk.Duration.seconds(60),
+            environment: {
+                ARCHIVE_BUCKET: this.archiveBucket.bucketName,
+                TASKS_TABLE_NAME: tasksTable.tableName,
+            },
+        });
+        this.archiveBucket.grantPut(archiveLambda);
+        // 退避したタスクの墓標を書き戻す
+        tasksTable.grantWriteData(archiveLambda);
+
+        // 再試行を使い切ったバッチの位置 (シャードとシーケンス番号の範囲) の送り先。
+        // テーブルからは TTL で削除済みのため、ストリームの保持期間 (24 時間) 内に読み直して退避し直す
+        const archiveFailureQueue = new sqs.Queue(this, 'TaskArchiveFailureQueue', {
+            encryption: sqs.QueueEncryption.SQS_MANAGED,
+            enforceSSL: true,
+            retentionPeriod: cdk.Duration.days(14),
+        });
+
+        // TTL による削除 (DynamoDB サービス自身による REMOVE) のみを受け取る
+        archiveLambda.addEventSource(new lambdaEventSources.DynamoEventSource(tasksTable, {
+            startingPosition: lambda.StartingPosition.TRIM_HORIZON,
+            batchSize: 100,
+            bisectBatchOnError: true,
+            retryAttempts: 10,
+            onFailure: new lambdaEventSources.SqsDlq(archiveFailureQueue),
+            filters: [
+                lambda.FilterCriteria.filter({
+                    eventName: lambda.FilterRule.isEqual('REMOVE'),
+                    userIdentity: {
+                        type: lambda.FilterRule.isEqual('Service'),
+                        principalId: lambda.FilterRule.isEqual('dynamodb.amazonaws.com'),
+                    },
+                }),
+            ],
+        }));
+
+        // スナップショット系 ============================
+        // 分析用に毎日テーブル全体を Parquet で書き出す (snapshots/dt=YYYY-MM-DD/<時刻>/part-*.parquet)
+        const snapshotBucket = new s3.Bucket(this, 'TaskSnapshotBucket', {
+            encryption: s3.BucketEncryption.S3_MANAGED,
+            blockPublicAccess: s3.BlockPublicAccess.BLOCK_ALL,
+            enforceSSL: true,
+            removalPolicy: cdk.RemovalPolicy.RETAIN,
+            lifecycleRules: [{ expiration: cdk.Duration.days(90) }],
+        });
+
+        const snapshotLambda = new lambda.Function(this, 'TaskSnapshotHandler', {
+            runtime: lambda.Runtime.PYTHON_3_13,
+            handler: 'src.entrypoints.export_snapshot.handler',
+            code: lambda.Code.fromAsset(path.join(__dirname, '../..'), {
+                exclude: ['cdk', 'node_modules', 'tests', '.git', '.venv'],
+                bundling: {
+                    image: lambda.Runtime.PYTHON_3_13.bundlingImage,
+                    command: [
+                        'bash', '-c',
+                        // poetry export --extras analytics で生成した、pyarrow を含むロック済みの依存関係
+                        'pip install -r src/requirements-analytics.txt -t /asset-output && cp -r src /asset-output/',
+                    ],
+                },
+            }),
+            memorySize: 2048,
+            ephemeralStorageSize: cdk.Size.gibibytes(4),
+            timeout: cdk.Duration.minutes(15),
+            environment: {
+                TASKS_TABLE_NAME: tasksTable.tableName,
+                SNAPSHOT_BUCKET: snapshotBucket.bucketName,
+                SNAPSHOT_SEGMENTS: '8',
+            },
+        });
+        tasksTable.grantReadData(snapshotLambda);
+        snapshotBucket.grantPut(snapshotLambda);
+
+        new events.Rule(this, 'TaskSnapshotSchedule', {
+            schedule: events.Schedule.cron({ minute: '0', hour: '18' }), // 03:00 JST
+            targets: [new targets.LambdaFunction(snapshotLambda, { retryAttempts: 2 })],
+        });
+
         // = 出力 ===============================================================================================
         new cdk.CfnOutput(this, 'UserPoolId', {
             value: this.userPool.userPoolId,
@@ -83,5 +203,13 @@ export class InfraStack extends cdk.Stack {
         new cdk.CfnOutput(this, 'UserPoolClientId', {
             value: this.userPoolClient.userPoolClientId,
         });
+
+        new cdk.CfnOutput(this, 'TaskArchiveFailureQueueUrl', {
+            value: archiveFailureQueue.queueUrl,
+        });
+
+        new cdk.CfnOutput(this, 'TaskSnapshotBucketName', {
+            value: snapshotBucket.bucketName,
+        });
     }
 }
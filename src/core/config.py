@@ -6,6 +6,35 @@ class Settings:
     region: str = os.getenv("AWS_REGION", "ap-northeast-1")
     user_pool_id: str = os.getenv("USER_POOL_ID", "")
     app_client_id: str = os.getenv("APP_CLIENT_ID", "")
+    tasks_table_name: str = os.getenv("TASKS_TABLE_NAME", "tasks")
+    # 完了したタスクをテーブルに残す日数 (0 以下で退避しない)
+    archive_retention_days: int = int(os.getenv("ARCHIVE_RETENTION_DAYS", "30"))
+    # 退避先。ARCHIVE_BUCKET が優先され、無ければ ARCHIVE_DIR のローカルディレクトリを使う
+    archive_bucket: str = os.getenv("ARCHIVE_BUCKET", "")
+    archive_dir: str = os.getenv("ARCHIVE_DIR", "")
+    # 削除したタスクの墓標を残す日数。差分同期のトークンはこれより古くなると使えない
+    tombstone_retention_days: int = int(os.getenv("TOMBSTONE_RETENTION_DAYS", "30"))
+    # サーバー間の時計のずれと GSI の反映遅れの上限。差分同期はこの秒数以内の変更を次回も返す
+    sync_safety_window_seconds: float = float(os.getenv("SYNC_SAFETY_WINDOW_SECONDS", "5"))
+    # これ以上のバイト数の title / description を圧縮して保存する
+    item_compress_threshold_bytes: int = int(os.getenv("ITEM_COMPRESS_THRESHOLD_BYTES", "512"))
+    # 一覧取得で低レベルクライアントの高速な読み取り経路を使う
+    dynamodb_fast_reads: bool = os.getenv("DYNAMODB_FAST_READS", "true").lower() == "true"
+    # 定期スナップショットの出力先バケットと並列スキャンの区分数
+    snapshot_bucket: str = os.getenv("SNAPSHOT_BUCKET", "")
+    snapshot_segments: int = int(os.getenv("SNAPSHOT_SEGMENTS", "4"))
+    # タスク変更イベントの発行元。"local": このプロセスでの書き込み, "dynamodb-stream": テーブルのストリーム
+    task_events_source: str = os.getenv("TASK_EVENTS_SOURCE", "local")
+    # SSE のハートビート間隔と、1回の接続を保つ最大秒数 (Lambda のタイムアウトより短くする)
+    sse_heartbeat_seconds: float = float(os.getenv("SSE_HEARTBEAT_SECONDS", "15"))
+    sse_max_duration_seconds: float = float(os.getenv("SSE_MAX_DURATION_SECONDS", "280"))
+    # 構造化ログと EMF メトリクスの設定 (名前は powertools の環境変数に合わせる)
+    service_name: str = os.getenv("POWERTOOLS_SERVICE_NAME", "crud-sample-tasks")
+    metrics_namespace: str = os.getenv("POWERTOOLS_METRICS_NAMESPACE", "CrudSample")
+    metrics_enabled: bool = os.getenv("POWERTOOLS_METRICS_DISABLED", "false").lower() != "true"
+    log_level: str = os.getenv("LOG_LEVEL", "INFO")
+    # DEBUG ログを出力するリクエストの割合 (0.0 - 1.0)
+    log_sampling_rate: float = float(os.getenv("POWERTOOLS_LOGGER_SAMPLE_RATE", "0.0"))
 
 
 @lru_cache
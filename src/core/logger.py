@@ -0,0 +1,33 @@
+import logging
+
+from aws_lambda_powertools import Logger
+
+from .config import get_settings
+
+settings = get_settings()
+
+# JSON 形式の構造化ログを出力するサービス全体のロガー
+# sampling_rate の割合のリクエストだけ DEBUG まで出力する (refresh_sampling で再抽選)
+service_logger = Logger(
+    service=settings.service_name,
+    level=settings.log_level,
+    sampling_rate=settings.log_sampling_rate,
+)
+
+
+def get_logger(name: str) -> logging.Logger:
+    """
+    モジュール用のロガーを取得する
+
+    サービスロガーの子として作成するため、出力形式とレベル (DEBUG のサンプリングを含む) を引き継ぎます。
+    メッセージは logger.info("... %s", value) のように引数で渡し、出力されない場合は整形しないでください。
+
+    :param name: モジュール名 (通常は __name__)
+    :return: 標準ライブラリのロガー
+    """
+    return logging.getLogger(f"{service_logger.name}.{name}")
+
+
+def refresh_sampling() -> None:
+    """リクエストの開始時に、このリクエストで DEBUG ログを出力するかを抽選し直す"""
+    service_logger.refresh_sample_rate_calculation()
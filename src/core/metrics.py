@@ -0,0 +1,114 @@
+import functools
+import threading
+from collections import defaultdict
+from time import perf_counter
+from typing import Callable, Dict, List, Tuple, TypeVar
+
+from aws_lambda_powertools import Metrics
+from aws_lambda_powertools.metrics import MetricUnit
+
+from ..exceptions.errors import BaseAppError
+from .config import get_settings
+
+settings = get_settings()
+
+F = TypeVar("F", bound=Callable)
+
+# EMF の1メトリクスあたりに載せられる値の上限
+MAX_VALUES_PER_METRIC = 100
+
+
+class MetricsRecorder:
+    """
+    リクエスト中のメトリクスをメモリに貯め、flush でまとめて EMF として出力する
+
+    記録時はリストへの追加だけを行い、EMF の組み立てと出力は flush まで遅延させます。
+    同じ名前の値は配列のまま出力されるため、CloudWatch 側で分布 (パーセンタイル) として集計されます。
+    """
+
+    def __init__(self, namespace: str, service: str, enabled: bool = True):
+        self.namespace = namespace
+        self.service = service
+        # False の間は記録しない (CLI など EMF を出力したくない実行環境用)
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._values: Dict[Tuple[str, str], List[float]] = defaultdict(list)
+
+    def add(self, name: str, unit: MetricUnit, value: float) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            values = self._values[(name, unit.value)]
+            values.append(value)
+            full = len(values) >= MAX_VALUES_PER_METRIC
+        if full:
+            self.flush()
+
+    def count(self, name: str, value: int = 1) -> None:
+        self.add(name, MetricUnit.Count, value)
+
+    def latency(self, name: str, milliseconds: float) -> None:
+        self.add(name, MetricUnit.Milliseconds, milliseconds)
+
+    def snapshot(self) -> Dict[str, List[float]]:
+        """未出力のメトリクスを名前ごとに取得する"""
+        with self._lock:
+            return {name: list(values) for (name, _), values in self._values.items()}
+
+    def flush(self) -> None:
+        """貯めたメトリクスを EMF として標準出力に書き出し、クリアする"""
+        with self._lock:
+            pending, self._values = self._values, defaultdict(list)
+        if not pending:
+            return
+        with self._flush_lock:
+            emf = Metrics(namespace=self.namespace, service=self.service)
+            for (name, unit), values in pending.items():
+                for value in values:
+                    emf.add_metric(name=name, unit=unit, value=value)
+            # 上限に達した分は add_metric の中で出力済みのため、残りがある場合だけ出力する
+            if emf.metric_set:
+                emf.flush_metrics()
+
+
+metrics = MetricsRecorder(
+    namespace=settings.metrics_namespace,
+    service=settings.service_name,
+    enabled=settings.metrics_enabled,
+)
+
+
+def instrumented(operation: str) -> Callable[[F], F]:
+    """
+    処理時間 ("<operation>.latency") と BaseAppError のサブクラスごとのエラー数 ("errors.<クラス名>") を記録する
+
+    :param operation: メトリクス名に使う操作名
+    """
+    latency_name = f"{operation}.latency"
+
+    def decorator(fn: F) -> F:
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            start = perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            except BaseAppError as e:
+                metrics.count(f"errors.{type(e).__name__}")
+                raise
+            finally:
+                metrics.latency(latency_name, (perf_counter() - start) * 1000)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
+
+
+def record_dynamodb_call(model, **kwargs) -> None:
+    """botocore の after-call イベントで DynamoDB の API 呼び出し回数 ("dynamodb.<操作名>") を記録する"""
+    metrics.count(f"dynamodb.{model.name}")
+
+
+def instrument_boto3_client(client) -> None:
+    """DynamoDB クライアントの API 呼び出し回数を記録するよう登録する"""
+    client.meta.events.register("after-call.dynamodb", record_dynamodb_call, unique_id="task-metrics-dynamodb-calls")
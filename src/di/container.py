@@ -1,8 +1,27 @@
+from typing import Optional
+
 from injector import Injector, Module, provider, singleton
 
+from ..core.config import get_settings
+from ..domains.interfaces.task_archive import ITaskArchive
+from ..domains.interfaces.task_event_bus import ITaskEventBus
 from ..domains.interfaces.task_repository import ITaskRepository
+from ..domains.models.archive import ArchivePolicy
+from ..infrastructure.events.dynamodb_stream_reader import DynamoDBStreamTaskEventReader
+from ..infrastructure.events.in_memory_event_bus import InMemoryTaskEventBus
+from ..infrastructure.repositories.task_archive import LocalTaskArchive, S3TaskArchive
 from ..infrastructure.repositories.task_repository import TaskDynamoDBRepository
 from ..usecase.task_handler import TaskManager
+from ..usecase.task_importer import TaskImporter
+
+
+def build_task_archive() -> Optional[ITaskArchive]:
+    settings = get_settings()
+    if settings.archive_bucket:
+        return S3TaskArchive(bucket=settings.archive_bucket)
+    if settings.archive_dir:
+        return LocalTaskArchive(root=settings.archive_dir)
+    return None
 
 
 class AppModule(Module):
@@ -10,12 +29,47 @@ class AppModule(Module):
     @provider
     def provide_task_repository(self) -> ITaskRepository:
         # DynamoDBリポジトリを使用する
-        return TaskDynamoDBRepository(table_name="tasks")
+        settings = get_settings()
+        archive_policy = None
+        if settings.archive_retention_days > 0:
+            archive_policy = ArchivePolicy(retention_days=settings.archive_retention_days)
+        return TaskDynamoDBRepository(
+            table_name=settings.tasks_table_name,
+            archive_policy=archive_policy,
+            tombstone_retention_days=settings.tombstone_retention_days,
+            compress_threshold=settings.item_compress_threshold_bytes,
+            fast_reads=settings.dynamodb_fast_reads,
+            sync_safety_window_seconds=settings.sync_safety_window_seconds,
+        )
+
+    @singleton
+    @provider
+    def provide_task_event_bus(self) -> ITaskEventBus:
+        settings = get_settings()
+        bus = InMemoryTaskEventBus()
+        if settings.task_events_source == "dynamodb-stream":
+            reader = DynamoDBStreamTaskEventReader(table_name=settings.tasks_table_name, bus=bus)
+            # 別の実行環境で発行された Last-Event-ID からの再接続はストリームから読み直す
+            bus.set_replay_source(reader.replay)
+            # SSE の購読がある間だけストリームを読む
+            bus.set_activity_hooks(reader.start, lambda: reader.stop(wait=False))
+        return bus
+
+    @singleton
+    @provider
+    def provide_task_service(self, repo: ITaskRepository, event_bus: ITaskEventBus) -> TaskManager:
+        settings = get_settings()
+        return TaskManager(
+            repo,
+            archive=build_task_archive(),
+            event_bus=event_bus,
+            publish_events=settings.task_events_source == "local",
+        )
 
     @singleton
     @provider
-    def provide_task_service(self, repo: ITaskRepository) -> TaskManager:
-        return TaskManager(repo)
+    def provide_task_importer(self, repo: ITaskRepository) -> TaskImporter:
+        return TaskImporter(repo)
 
 
 injector = Injector([AppModule()])
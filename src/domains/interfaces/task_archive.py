@@ -0,0 +1,40 @@
+from abc import ABC, abstractmethod
+from datetime import date, datetime
+from typing import List, Optional, Tuple
+
+from ..models.task import Task
+
+
+class ITaskArchive(ABC):
+    @abstractmethod
+    def archive_tasks(self, tasks: List[Task], archived_at: datetime, batch_id: Optional[str] = None) -> None:
+        """
+        タスクをアーカイブに書き込みます。
+
+        :param tasks: 退避するタスク
+        :param archived_at: 退避日時
+        :param batch_id: 書き込みの識別子。同じ archived_at と batch_id の書き込みは前回の内容を置き換えます (再試行用)
+        """
+
+    @abstractmethod
+    def list_archived_tasks(
+        self, archived_from: date, archived_to: date, cursor: Optional[str] = None, limit: int = 100
+    ) -> Tuple[List[Task], Optional[str]]:
+        """
+        archived_from から archived_to まで (両端を含む) に退避したタスクを、1ページ分取得します。
+
+        :param archived_from: 退避日の範囲の始め
+        :param archived_to: 退避日の範囲の終わり
+        :param cursor: 前回のページが返した続きの位置 (None の場合は先頭から)
+        :param limit: 取得する最大件数
+        :return: (タスク, 続きの位置。最後のページの場合は None)
+        :raises InvalidParameterError: cursor が不正な場合
+        """
+
+    @abstractmethod
+    def get_archived_task(self, task_id: str) -> Task:
+        """
+        退避済みのタスクを取得します。
+
+        :raises DataNotFoundError: 指定されたタスクが退避されていない場合
+        """
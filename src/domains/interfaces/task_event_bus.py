@@ -0,0 +1,43 @@
+from abc import ABC, abstractmethod
+from typing import Optional
+
+from ..models.task_event import TaskEvent
+
+
+class ITaskEventSubscription(ABC):
+    # 取りこぼしがあり、まだクライアントに知らせていない場合 True (知らせた側が False に戻す)
+    lost: bool = False
+    # 受信が追いつかずに購読が打ち切られた場合 True
+    overflowed: bool = False
+    # ここまでのイベントを受け取り終えたことを表す位置 (再接続時の Last-Event-ID)。まだ無い場合は None
+    position: Optional[str] = None
+
+    @abstractmethod
+    async def next_event(self, timeout: float) -> Optional[TaskEvent]:
+        pass
+
+    @abstractmethod
+    def close(self) -> None:
+        pass
+
+
+class ITaskEventBus(ABC):
+    @abstractmethod
+    def publish(self, event: TaskEvent) -> TaskEvent:
+        pass
+
+    @abstractmethod
+    def publish_position(self, position: str) -> None:
+        """
+        イベントを伴わずに発行元の位置が進んだことを購読者に知らせる
+
+        :param position: 発行元の現在の位置 (購読の position になる)
+        """
+
+    @abstractmethod
+    def mark_lost(self) -> None:
+        """発行元がイベントを取りこぼした可能性があることを、開いている全ての購読に知らせる"""
+
+    @abstractmethod
+    def subscribe(self, last_event_id: Optional[str] = None) -> ITaskEventSubscription:
+        pass
@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import List
+from typing import Iterator, List, Optional, Tuple
 from uuid import UUID
 
 from ..models.task import Task
@@ -14,6 +14,29 @@ class ITaskRepository(ABC):
     def create_task(self, task: Task) -> None:
         pass
 
+    def batch_create_tasks(self, tasks: List[Task]) -> None:
+        """
+        複数のタスクをまとめて作成します。
+
+        既定では create_task を順に呼び出します。一括書き込みを持つストアでは上書きしてください。
+        """
+        for task in tasks:
+            self.create_task(task)
+
+    def scan_segment(self, segment: int, total_segments: int) -> Iterator[List[Task]]:
+        """
+        タスク全体を total_segments 個に分けたうちの1つを、ページごとに読み出します。
+
+        すべての segment を (並列に) 読むと、削除済みを除く全タスクを1回ずつ得られます。
+        既定では segment 0 が list_tasks の結果をまとめて返します。並列スキャンを持つストアでは上書きしてください。
+
+        :param segment: 読み出す区分 (0 から total_segments - 1)
+        :param total_segments: 区分の数
+        :return: タスクのページのイテレータ
+        """
+        if segment == 0:
+            yield self.list_tasks()
+
     @abstractmethod
     def get_task(self, task_id: str) -> Task:
         pass
@@ -25,3 +48,23 @@ class ITaskRepository(ABC):
     @abstractmethod
     def delete_task(self, task_id: str) -> None:
         pass
+
+    @abstractmethod
+    def list_changes(self, since: Optional[str], limit: int) -> Tuple[List[Task], Optional[str], bool]:
+        """
+        since より後に作成・更新・削除されたタスクを変更順に取得します。
+
+        変更を返し終えた場合は、変更が無くても次の位置を進めます (使われ続けるトークンを失効させないため)。
+
+        :param since: 前回取得した変更位置 (None の場合は最初から)
+        :param limit: 取得する最大件数
+        :return: (削除済みの墓標を含むタスク, 次回の since に指定する変更位置, さらに変更があるか)
+        """
+
+    @abstractmethod
+    def write_tombstones(self, tasks: List[Task]) -> None:
+        """
+        テーブルの外で削除されたタスク (アーカイブへの退避など) を墓標として記録します。
+
+        :param tasks: 墓標にするタスク
+        """
@@ -0,0 +1,27 @@
+from datetime import datetime, timezone
+from typing import Optional
+
+from pydantic import BaseModel
+
+from .task import Task, TaskStatus
+
+SECONDS_PER_DAY = 24 * 60 * 60
+
+
+class ArchivePolicy(BaseModel):
+    """完了したタスクをホットなテーブルから退避させるまでの保持期間"""
+
+    retention_days: int = 30
+
+    def expires_at(self, task: Task, completed_at: Optional[datetime] = None) -> Optional[int]:
+        """
+        タスクを退避させる時刻 (DynamoDB TTL 用のエポック秒) を求めます。
+
+        :param task: 対象のタスク
+        :param completed_at: 完了日時 (省略時は現在時刻)
+        :return: 完了済みのタスクなら退避時刻、それ以外は None
+        """
+        if task.status != TaskStatus.DONE:
+            return None
+        completed_at = completed_at or datetime.now(timezone.utc)
+        return int(completed_at.timestamp()) + self.retention_days * SECONDS_PER_DAY
@@ -1,4 +1,4 @@
-from datetime import datetime
+from datetime import datetime, timezone
 from enum import Enum
 from typing import Optional
 from uuid import UUID, uuid4
@@ -34,6 +34,10 @@ class Task(BaseModel):
     due_date: Optional[str] = None
     status: TaskStatus = TaskStatus.TODO
     priority: TaskPriority
+    # 最後に書き込まれた日時 (サーバー側で設定する)
+    updated_at: Optional[datetime] = None
+    # 削除済みを表す墓標。差分同期のクライアントに削除を伝えるため一定期間残す
+    deleted: bool = False
 
     @classmethod
     def create(cls, title: str, description: str, due_date: str, priority: str) -> "Task":
@@ -44,6 +48,7 @@ class Task(BaseModel):
             due_date=due_date,
             status=TaskStatus.TODO,
             priority=PRIORITY_DICT[priority],
+            updated_at=datetime.now(timezone.utc),
         )
 
     def update(self, updated_task: "Task") -> "Task":
@@ -0,0 +1,27 @@
+from datetime import datetime, timezone
+from enum import Enum
+from typing import Optional
+
+from pydantic import BaseModel, Field
+
+from .task import Task
+
+
+class TaskEventType(str, Enum):
+    CREATED = "created"
+    UPDATED = "updated"
+    DELETED = "deleted"
+
+
+class TaskEvent(BaseModel):
+    # 再接続時に続きから受け取るための位置 (SSE の id / Last-Event-ID に使う)
+    # プロセス内の発行では発行時に採番する連番、DynamoDB Streams からの発行ではストリームの位置
+    id: str = ""
+    type: TaskEventType
+    task_id: str
+    # 削除イベントでは None
+    task: Optional[Task] = None
+    occurred_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    # DynamoDB Streams から発行した場合のシャードとシーケンス番号 (重複の除去に使い、クライアントには送らない)
+    shard_id: Optional[str] = Field(default=None, exclude=True)
+    sequence_number: Optional[str] = Field(default=None, exclude=True)
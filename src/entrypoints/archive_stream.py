@@ -0,0 +1,113 @@
+"""
+DynamoDB Streams から TTL で期限切れになったタスクを受け取り、アーカイブに書き出す Lambda
+
+TTL による削除は userIdentity が DynamoDB サービス自身のレコードとして届くため、
+利用者による削除 (DELETE /tasks/{id}) はアーカイブしません。
+再試行で同じバッチが届いても同じファイルを上書きするよう、ファイル名と日付はバッチのレコードから決めます。
+退避したタスクは墓標としてテーブルに書き戻し、差分同期のクライアントに削除として伝えます。
+"""
+
+import base64
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Iterable, List, Optional
+
+from aws_lambda_powertools.utilities.data_classes import DynamoDBStreamEvent, event_source
+from aws_lambda_powertools.utilities.data_classes.dynamo_db_stream_event import (
+    DynamoDBRecord,
+    DynamoDBRecordEventName,
+)
+from pydantic import ValidationError
+
+from ..core.logger import get_logger, refresh_sampling
+from ..core.metrics import metrics
+from ..di.container import build_task_archive, injector
+from ..domains.interfaces.task_archive import ITaskArchive
+from ..domains.interfaces.task_repository import ITaskRepository
+from ..domains.models.task import Task
+from ..infrastructure.repositories.task_item_codec import decode_task_item
+
+logger = get_logger(__name__)
+
+TTL_PRINCIPAL = "dynamodb.amazonaws.com"
+
+
+def is_ttl_expiry(record: DynamoDBRecord) -> bool:
+    identity = record.user_identity
+    return (
+        record.event_name == DynamoDBRecordEventName.REMOVE
+        and identity.get("type") == "Service"
+        and identity.get("principalId") == TTL_PRINCIPAL
+    )
+
+
+def old_image(record: DynamoDBRecord) -> dict:
+    # Lambda のイベントではバイナリ (B) が base64 文字列のまま渡されるため、圧縮された属性をバイト列に戻す
+    if record.dynamodb is None:
+        return {}
+    image = record.dynamodb.old_image
+    for name, value in record.raw_event["dynamodb"].get("OldImage", {}).items():
+        if "B" in value:
+            image[name] = base64.b64decode(value["B"])
+    return image
+
+
+def expired_tasks(records: Iterable[DynamoDBRecord]) -> List[Task]:
+    tasks = []
+    for record in records:
+        if not is_ttl_expiry(record) or record.dynamodb is None:
+            continue
+        image = old_image(record)
+        if image.get("deleted"):
+            # 保持期間を過ぎた墓標の消去
+            continue
+        try:
+            tasks.append(decode_task_item(image))
+        except ValidationError:
+            logger.exception("Skipping expired item that is not a valid task: %s", record.dynamodb.keys)
+    return tasks
+
+
+def batch_id(records: List[DynamoDBRecord]) -> Optional[str]:
+    """バッチの最初と最後のレコードのシーケンス番号から、再試行しても変わらない識別子を作る"""
+    sequences = [record.dynamodb.sequence_number for record in records if record.dynamodb is not None]
+    sequences = [sequence for sequence in sequences if sequence]
+    if not sequences:
+        return None
+    return f"{sequences[0]}-{sequences[-1]}"
+
+
+def batch_time(records: List[DynamoDBRecord]) -> datetime:
+    """バッチの最初のレコードが作られた時刻 (無ければ現在時刻)"""
+    for record in records:
+        if record.dynamodb is not None and record.dynamodb.approximate_creation_date_time is not None:
+            return datetime.fromtimestamp(record.dynamodb.approximate_creation_date_time, timezone.utc)
+    return datetime.now(timezone.utc)
+
+
+@lru_cache
+def get_archive() -> ITaskArchive:
+    archive = build_task_archive()
+    if archive is None:
+        raise RuntimeError("ARCHIVE_BUCKET or ARCHIVE_DIR must be set")
+    return archive
+
+
+def get_repository() -> ITaskRepository:
+    return injector.get(ITaskRepository)
+
+
+@event_source(data_class=DynamoDBStreamEvent)
+def handler(event: DynamoDBStreamEvent, context) -> dict:
+    refresh_sampling()
+    try:
+        archive = get_archive()
+        records = list(event.records)
+        tasks = expired_tasks(records)
+        archive.archive_tasks(tasks, archived_at=batch_time(records), batch_id=batch_id(records))
+        if tasks:
+            get_repository().write_tombstones(tasks)
+        metrics.count("archive.archived_tasks", len(tasks))
+        return {"archived": len(tasks)}
+    finally:
+        metrics.flush()
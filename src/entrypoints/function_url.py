@@ -0,0 +1,386 @@
+"""
+Lambda Web Adapter を介さずに、Function URL のイベントを FastAPI (ASGI) アプリへ直接渡すエントリーポイント
+
+Web Adapter の構成では、拡張機能がランタイム API から受け取ったイベントを HTTP リクエストに組み立て直し、
+コンテナ内の uvicorn へ localhost 経由で転送します。ここではイベントから ASGI の scope を直接作り、
+同じ app を同じプロセスで呼び出します (HTTP への変換と uvicorn の起動を省きます)。
+
+- main: ランタイム API を直接呼び出すランタイムループ。応答は Function URL の RESPONSE_STREAM 形式で
+  本文のチャンクごとに送るため、GET /tasks/events の SSE もそのまま流れます (Docker イメージの direct ターゲット)。
+  app の読み込みや初期化に失敗した場合は、ランタイム API の init/error に知らせて終了します。
+- handler: 標準の Lambda ランタイム (awslambdaric) 用のハンドラ。応答をまとめて返すため、
+  Function URL の InvokeMode は BUFFERED で使います (SSE は接続を閉じるまで返りません)。
+
+使い方:
+    python -m src.entrypoints.function_url
+"""
+
+import asyncio
+import base64
+import http.client
+import json
+import os
+import sys
+import time
+import traceback
+from abc import ABC, abstractmethod
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import unquote
+
+from ..core.logger import get_logger
+
+logger = get_logger(__name__)
+
+RUNTIME_API_VERSION = "2018-06-01"
+
+# ストリーミング応答の先頭に送る、ステータスとヘッダー (prelude) の Content-Type と本文との区切り
+HTTP_INTEGRATION_CONTENT_TYPE = "application/vnd.awslambda.http-integration-response"
+PRELUDE_DELIMITER = b"\x00" * 8
+
+# バッファリングした応答の本文をテキストのまま返す Content-Type (それ以外は base64 で返す)
+_TEXT_MEDIA_TYPES = ("application/json", "application/javascript", "application/xml", "application/x-ndjson")
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+class InvocationContext:
+    """ランタイム API の応答ヘッダーから作る、LambdaContext 相当の呼び出し情報"""
+
+    def __init__(self, aws_request_id: str, deadline_ms: int, invoked_function_arn: str = ""):
+        self.aws_request_id = aws_request_id
+        self.deadline_ms = deadline_ms
+        self.invoked_function_arn = invoked_function_arn
+        self.function_name = os.getenv("AWS_LAMBDA_FUNCTION_NAME", "")
+        self.function_version = os.getenv("AWS_LAMBDA_FUNCTION_VERSION", "")
+        self.memory_limit_in_mb = os.getenv("AWS_LAMBDA_FUNCTION_MEMORY_SIZE", "")
+
+    def get_remaining_time_in_millis(self) -> int:
+        return max(self.deadline_ms - int(time.time() * 1000), 0)
+
+
+def build_request(event: dict, context=None) -> Tuple[dict, bytes]:
+    """
+    Function URL のイベント (ペイロード形式 2.0) を ASGI の HTTP scope と本文にする
+
+    :param event: Function URL のイベント
+    :param context: Lambda のコンテキスト (scope の "aws.context" として渡す)
+    :return: (scope, 本文)
+    """
+    request_context = event["requestContext"]
+    http_context = request_context["http"]
+    # Function URL は同じ名前のヘッダーをカンマ区切りで、Cookie だけは cookies として別に渡す
+    headers = [(name.lower().encode(), value.encode()) for name, value in (event.get("headers") or {}).items()]
+    if event.get("cookies"):
+        headers.append((b"cookie", "; ".join(event["cookies"]).encode()))
+
+    raw_path = event.get("rawPath") or "/"
+    body = event.get("body") or ""
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0", "spec_version": "2.3"},
+        "http_version": http_context.get("protocol", "HTTP/1.1").removeprefix("HTTP/") or "1.1",
+        "method": http_context["method"].upper(),
+        "scheme": "https",
+        "path": unquote(raw_path),
+        "raw_path": raw_path.encode(),
+        "query_string": (event.get("rawQueryString") or "").encode(),
+        "root_path": "",
+        "headers": headers,
+        "server": (request_context.get("domainName", "localhost"), 443),
+        "client": (http_context.get("sourceIp", ""), 0),
+        "aws.event": event,
+        "aws.context": context,
+    }
+    return scope, base64.b64decode(body) if event.get("isBase64Encoded") else body.encode()
+
+
+def response_prelude(status: int, headers: List[Tuple[bytes, bytes]]) -> dict:
+    """
+    ASGI の応答ヘッダーを Function URL の statusCode / headers / cookies にする
+
+    同じ名前のヘッダーはカンマで連結し、Set-Cookie は cookies に分けます。
+    """
+    merged: Dict[str, str] = {}
+    cookies = []
+    for raw_name, raw_value in headers:
+        name, value = raw_name.decode("latin-1").lower(), raw_value.decode("latin-1")
+        if name == "set-cookie":
+            cookies.append(value)
+        elif name in merged:
+            merged[name] = f"{merged[name]}, {value}"
+        else:
+            merged[name] = value
+    return {"statusCode": status, "headers": merged, "cookies": cookies}
+
+
+class ResponseWriter(ABC):
+    """ASGI アプリの応答の送り先"""
+
+    def __init__(self):
+        self.status = 500
+        self.headers: List[Tuple[bytes, bytes]] = []
+        self.started = False
+        self.finished = False
+
+    def start(self, status: int, headers: List[Tuple[bytes, bytes]]) -> None:
+        self.status = status
+        self.headers = list(headers)
+        self.started = True
+
+    @abstractmethod
+    def write(self, chunk: bytes) -> None:
+        pass
+
+    def finish(self, error: Optional[BaseException] = None) -> None:
+        """
+        応答を終える
+
+        :param error: 本文の途中でアプリが失敗した場合の例外
+        """
+        self.finished = True
+
+
+class BufferedResponseWriter(ResponseWriter):
+    """応答全体をメモリに溜め、Function URL (BUFFERED) の戻り値にする"""
+
+    def __init__(self):
+        super().__init__()
+        self._chunks: List[bytes] = []
+
+    def write(self, chunk: bytes) -> None:
+        self._chunks.append(chunk)
+
+    def finish(self, error: Optional[BaseException] = None) -> None:
+        if error is not None:
+            # まだ何も返していないため、途中までの本文ではなく 500 を返す
+            self.start(500, [(b"content-type", b"text/plain; charset=utf-8")])
+            self._chunks = [b"Internal Server Error"]
+        super().finish(error)
+
+    def result(self) -> dict:
+        result = response_prelude(self.status, self.headers)
+        body = b"".join(self._chunks)
+        media_type = result["headers"].get("content-type", "").split(";")[0].strip().lower()
+        if media_type.startswith("text/") or media_type in _TEXT_MEDIA_TYPES or media_type.endswith("+json"):
+            try:
+                return dict(result, body=body.decode("utf-8"), isBase64Encoded=False)
+            except UnicodeDecodeError:
+                pass
+        return dict(result, body=base64.b64encode(body).decode("ascii"), isBase64Encoded=True)
+
+
+class RuntimeStreamWriter(ResponseWriter):
+    """
+    応答をランタイム API へチャンク転送で送る (Function URL の RESPONSE_STREAM)
+
+    最初のチャンクとして prelude (ステータスとヘッダーの JSON) と区切りの NUL 8 バイトを送り、続けて本文を送ります。
+    本文の途中でアプリが失敗した場合は、エラーをトレーラーで知らせます。
+    """
+
+    def __init__(self, connection: http.client.HTTPConnection, request_id: str):
+        super().__init__()
+        self._connection = connection
+        self._path = f"/{RUNTIME_API_VERSION}/runtime/invocation/{request_id}/response"
+        self._opened = False
+
+    def write(self, chunk: bytes) -> None:
+        if not self._opened:
+            self._open()
+        if chunk:
+            self._send_chunk(chunk)
+
+    def finish(self, error: Optional[BaseException] = None) -> None:
+        if not self._opened:
+            self._open()
+        trailers = b""
+        if error is not None:
+            trailers = (
+                b"Lambda-Runtime-Function-Error-Type: Unhandled\r\n"
+                b"Lambda-Runtime-Function-Error-Body: " + base64.b64encode(error_payload(error)) + b"\r\n"
+            )
+        self._connection.send(b"0\r\n" + trailers + b"\r\n")
+        response = self._connection.getresponse()
+        response.read()
+        if response.status >= 300:
+            logger.warning("Runtime API rejected the response: %d", response.status)
+        super().finish(error)
+
+    def _open(self) -> None:
+        connection = self._connection
+        connection.putrequest("POST", self._path, skip_accept_encoding=True)
+        connection.putheader("Content-Type", HTTP_INTEGRATION_CONTENT_TYPE)
+        connection.putheader("Lambda-Runtime-Function-Response-Mode", "streaming")
+        connection.putheader("Transfer-Encoding", "chunked")
+        connection.putheader("Trailer", "Lambda-Runtime-Function-Error-Type, Lambda-Runtime-Function-Error-Body")
+        connection.endheaders()
+        self._opened = True
+        prelude = json.dumps(response_prelude(self.status, self.headers)).encode()
+        self._send_chunk(prelude + PRELUDE_DELIMITER)
+
+    def _send_chunk(self, chunk: bytes) -> None:
+        self._connection.send(b"%x\r\n%b\r\n" % (len(chunk), chunk))
+
+
+def error_payload(error: BaseException) -> bytes:
+    return json.dumps(
+        {
+            "errorMessage": str(error),
+            "errorType": type(error).__name__,
+            "stackTrace": traceback.format_tb(error.__traceback__),
+        }
+    ).encode()
+
+
+async def call_app(asgi_app, scope: dict, body: bytes, response: ResponseWriter) -> None:
+    """
+    ASGI アプリを1リクエスト分呼び出し、応答を response に書き込む
+
+    応答を始める前にアプリが失敗した場合は 500 を返します (uvicorn と同じ)。
+
+    :param asgi_app: ASGI アプリ
+    :param scope: build_request で作った scope
+    :param body: リクエストの本文
+    :param response: 応答の送り先
+    """
+    request_sent = False
+    response_done = asyncio.Event()
+
+    async def receive() -> dict:
+        nonlocal request_sent
+        if not request_sent:
+            request_sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        # 本文は一度で渡し終えているため、応答を返し終えるまで待ってから切断を知らせる
+        await response_done.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message: dict) -> None:
+        if message["type"] == "http.response.start":
+            response.start(message["status"], message.get("headers", []))
+        elif message["type"] == "http.response.body" and not response.finished:
+            response.write(message.get("body", b""))
+            if not message.get("more_body", False):
+                response.finish()
+                response_done.set()
+
+    try:
+        await asgi_app(scope, receive, send)
+    except Exception as e:
+        logger.exception("Exception in ASGI application.")
+        if not response.started:
+            response.start(500, [(b"content-type", b"text/plain; charset=utf-8")])
+            response.write(b"Internal Server Error")
+            response.finish()
+        elif not response.finished:
+            response.finish(error=e)
+    finally:
+        if not response.finished:
+            response.finish()
+        response_done.set()
+
+
+@lru_cache
+def load_app():
+    """
+    FastAPI アプリを読み込む
+
+    設定や依存関係の初期化に失敗した場合に main がランタイム API へ知らせられるよう、
+    このモジュールの読み込み時ではなく最初に必要になった時点で読み込みます。
+    """
+    from ..main import app
+
+    return app
+
+
+def _event_loop() -> asyncio.AbstractEventLoop:
+    # 実行環境は呼び出しをまたいで再利用されるため、イベントループも使い回す
+    global _loop
+    if _loop is None or _loop.is_closed():
+        _loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(_loop)
+    return _loop
+
+
+def handler(event: dict, context) -> dict:
+    scope, body = build_request(event, context)
+    response = BufferedResponseWriter()
+    _event_loop().run_until_complete(call_app(load_app(), scope, body, response))
+    return response.result()
+
+
+class LambdaRuntimeClient:
+    def __init__(self, api: str):
+        """
+        LambdaRuntimeClient の初期化
+
+        :param api: ランタイム API のホストとポート (AWS_LAMBDA_RUNTIME_API)
+        """
+        self.connection = http.client.HTTPConnection(api)
+
+    def next_invocation(self) -> Tuple[dict, InvocationContext]:
+        """次の呼び出しを待ち、(イベント, コンテキスト) を返す"""
+        self.connection.request("GET", f"/{RUNTIME_API_VERSION}/runtime/invocation/next")
+        response = self.connection.getresponse()
+        event = json.loads(response.read())
+        trace_id = response.getheader("Lambda-Runtime-Trace-Id")
+        if trace_id:
+            os.environ["_X_AMZN_TRACE_ID"] = trace_id
+        else:
+            os.environ.pop("_X_AMZN_TRACE_ID", None)
+        context = InvocationContext(
+            aws_request_id=response.getheader("Lambda-Runtime-Aws-Request-Id", ""),
+            deadline_ms=int(response.getheader("Lambda-Runtime-Deadline-Ms", "0")),
+            invoked_function_arn=response.getheader("Lambda-Runtime-Invoked-Function-Arn", ""),
+        )
+        return event, context
+
+    def stream_response(self, request_id: str) -> RuntimeStreamWriter:
+        return RuntimeStreamWriter(self.connection, request_id)
+
+    def post_error(self, request_id: str, error: BaseException) -> None:
+        self.connection.request(
+            "POST",
+            f"/{RUNTIME_API_VERSION}/runtime/invocation/{request_id}/error",
+            body=error_payload(error),
+            headers={"Lambda-Runtime-Function-Error-Type": "Unhandled"},
+        )
+        self.connection.getresponse().read()
+
+    def post_init_error(self, error: BaseException) -> None:
+        self.connection.request(
+            "POST",
+            f"/{RUNTIME_API_VERSION}/runtime/init/error",
+            body=error_payload(error),
+            headers={"Lambda-Runtime-Function-Error-Type": "Unhandled"},
+        )
+        self.connection.getresponse().read()
+
+
+def handle_next_invocation(runtime: LambdaRuntimeClient, asgi_app) -> None:
+    event, context = runtime.next_invocation()
+    try:
+        scope, body = build_request(event, context)
+    except (KeyError, TypeError, ValueError) as e:
+        # Function URL 以外から呼び出された
+        logger.exception("Unsupported event.")
+        runtime.post_error(context.aws_request_id, e)
+        return
+    _event_loop().run_until_complete(call_app(asgi_app, scope, body, runtime.stream_response(context.aws_request_id)))
+
+
+def main() -> int:
+    runtime = LambdaRuntimeClient(os.environ["AWS_LAMBDA_RUNTIME_API"])
+    try:
+        asgi_app = load_app()
+    except Exception as e:
+        # 知らせずに終了すると、ランタイム API には原因の分からない異常終了としてしか伝わらない
+        logger.exception("Failed to initialize the application.")
+        runtime.post_init_error(e)
+        return 1
+    while True:
+        handle_next_invocation(runtime, asgi_app)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
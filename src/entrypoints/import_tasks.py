@@ -0,0 +1,66 @@
+"""
+NDJSON / CSV ファイルからタスクを一括で取り込むCLI
+
+使い方:
+    python -m src.entrypoints.import_tasks tasks.ndjson --table tasks
+    cat tasks.csv | python -m src.entrypoints.import_tasks - --format csv
+"""
+
+import argparse
+import io
+import sys
+from typing import Optional, Sequence
+
+from ..core.metrics import metrics
+from ..infrastructure.repositories.task_repository import TaskDynamoDBRepository
+from ..routers.dto.task import TaskImportReport
+from ..usecase.task_importer import ImportFormat, TaskImporter
+
+
+def _detect_format(path: str) -> ImportFormat:
+    return "csv" if path.lower().endswith(".csv") else "ndjson"
+
+
+def _print_progress(report: TaskImportReport) -> None:
+    print(
+        f"\rprocessed={report.processed} imported={report.imported} failed={report.failed}",
+        end="",
+        file=sys.stderr,
+        flush=True,
+    )
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Import tasks from an NDJSON or CSV file.")
+    parser.add_argument("path", help="input file path ('-' for stdin)")
+    parser.add_argument("--format", choices=["ndjson", "csv"], help="input format (default: by file extension)")
+    parser.add_argument("--table", default="tasks", help="DynamoDB table name")
+    parser.add_argument("--workers", type=int, default=4, help="number of parallel writers")
+    parser.add_argument("--batch-size", type=int, default=100, help="tasks per batch write")
+    parser.add_argument("--max-errors", type=int, default=100, help="row errors kept in the report")
+    args = parser.parse_args(argv)
+
+    fmt: ImportFormat = args.format or _detect_format(args.path)
+    # 標準出力はレポート用のため EMF は出力しない
+    metrics.enabled = False
+    importer = TaskImporter(
+        TaskDynamoDBRepository(table_name=args.table),
+        workers=args.workers,
+        batch_size=args.batch_size,
+        max_errors=args.max_errors,
+    )
+
+    if args.path == "-":
+        stream = io.TextIOWrapper(sys.stdin.buffer, encoding="utf-8", newline="")
+        report = importer.import_stream(stream, fmt, progress=_print_progress)
+    else:
+        with open(args.path, encoding="utf-8", newline="") as stream:
+            report = importer.import_stream(stream, fmt, progress=_print_progress)
+
+    print(file=sys.stderr)
+    print(report.model_dump_json(indent=2))
+    return 0 if report.failed == 0 and not report.aborted else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,65 @@
+"""
+保存済みのタスクアイテムに移行 (src/infrastructure/migrations/task_migrations.py) を適用する CLI
+
+使い方:
+    python -m src.entrypoints.migrate_tasks --table tasks --dry-run
+    python -m src.entrypoints.migrate_tasks --table tasks --segments 8 --max-wcu 50 --checkpoint migrate.json
+
+Ctrl+C で中断すると、処理中のページを終えてからチェックポイントを保存して終了します。
+同じ --checkpoint を指定して再実行すると続きから再開します。
+"""
+
+import argparse
+import signal
+import sys
+import threading
+from typing import Optional, Sequence
+
+from ..core.metrics import metrics
+from ..infrastructure.migrations.runner import MigrationRunner
+from ..infrastructure.migrations.task_migrations import MIGRATIONS
+from ..infrastructure.repositories.task_repository import TaskDynamoDBRepository
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Apply versioned migrations to stored task items.")
+    parser.add_argument("--table", default="tasks", help="DynamoDB table name")
+    parser.add_argument("--segments", type=int, default=4, help="parallel scan segments")
+    parser.add_argument("--max-wcu", type=float, default=25.0, help="write capacity units per second")
+    parser.add_argument("--max-rcu", type=float, help="read capacity units per second (default: unlimited)")
+    parser.add_argument("--page-size", type=int, default=100, help="items per scan request")
+    parser.add_argument("--checkpoint", help="file to save progress to and resume from")
+    parser.add_argument("--target-version", type=int, help="last migration version to apply (default: latest)")
+    parser.add_argument("--dry-run", action="store_true", help="only report what would change")
+    args = parser.parse_args(argv)
+
+    # 標準出力はレポート用のため EMF は出力しない
+    metrics.enabled = False
+    runner = MigrationRunner(
+        TaskDynamoDBRepository(table_name=args.table),
+        MIGRATIONS,
+        segments=args.segments,
+        max_wcu=args.max_wcu,
+        max_rcu=args.max_rcu,
+        page_size=args.page_size,
+        checkpoint_path=args.checkpoint,
+        dry_run=args.dry_run,
+        target_version=args.target_version,
+    )
+
+    def interrupt(signum, frame):
+        print("Stopping after the current page...", file=sys.stderr)
+        runner.stop()
+
+    if threading.current_thread() is threading.main_thread():
+        signal.signal(signal.SIGINT, interrupt)
+        signal.signal(signal.SIGTERM, interrupt)
+    report = runner.run()
+    print(report.model_dump_json(indent=2))
+    if report.failed or len(report.completed_segments) < args.segments:
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -44,3 +44,18 @@ class ServiceUnavailableError(BaseAppError):
     def __init__(self, service_name: str, message: str = "Service unavailable"):
         super().__init__(f"{message}: {service_name}")
         self.service_name = service_name
+
+
+class SyncTokenExpiredError(BaseAppError):
+    """差分同期のトークンが古すぎて、その後の削除を伝えられない場合の例外"""
+
+    def __init__(self, message: str = "Sync token expired, full resync required"):
+        super().__init__(message)
+
+
+class DataConflictError(BaseAppError):
+    """書き込み対象のデータが読み取り後に変更されていた場合の例外"""
+
+    def __init__(self, resource_name: str, message: str = "Data was modified concurrently"):
+        super().__init__(f"{message}: {resource_name}")
+        self.resource_name = resource_name
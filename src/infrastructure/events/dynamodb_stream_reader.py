@@ -0,0 +1,373 @@
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+import boto3
+from boto3.dynamodb.types import TypeDeserializer
+from botocore.exceptions import BotoCoreError, ClientError
+from pydantic import ValidationError
+
+from ...core.logger import get_logger
+from ...domains.interfaces.task_event_bus import ITaskEventBus
+from ...domains.models.task_event import TaskEvent, TaskEventType
+from ..repositories.task_item_codec import decode_task_item
+
+logger = get_logger(__name__)
+
+_deserializer = TypeDeserializer()
+
+# 書き込みがストリームに現れるまでの遅れの上限。位置を持たないシャードは、この分だけ前から読み直す
+STREAM_DELAY_MARGIN_MS = 5000
+
+
+def _deserialize(image: dict) -> dict:
+    return {key: _deserializer.deserialize(value) for key, value in image.items()}
+
+
+def _now_ms() -> int:
+    return int(time.time() * 1000)
+
+
+def _created_ms(record: dict) -> int:
+    created_at = record.get("dynamodb", {}).get("ApproximateCreationDateTime")
+    if isinstance(created_at, datetime):
+        return int(created_at.timestamp() * 1000)
+    return int(float(created_at) * 1000) if created_at is not None else _now_ms()
+
+
+def encode_stream_position(as_of_ms: int, sequences: Dict[str, str]) -> str:
+    """
+    ストリームの位置を SSE の id にする
+
+    "<as_of のミリ秒>/<シャードID>:<シーケンス番号>,..." の形式です。シャードごとに読み終えた最後のシーケンス番号と、
+    シーケンス番号を持たない (まだレコードを読んでいない) シャードを as_of の時刻まで読み終えていることを表します。
+    """
+    return f"{as_of_ms}/" + ",".join(f"{shard_id}:{sequence}" for shard_id, sequence in sorted(sequences.items()))
+
+
+def decode_stream_position(position: str) -> Optional[Tuple[int, Dict[str, str]]]:
+    """
+    encode_stream_position の逆変換
+
+    :return: (as_of のミリ秒, シャードごとのシーケンス番号)。ストリームの位置ではない場合は None
+    """
+    as_of, separator, rest = position.partition("/")
+    if not separator or not as_of.isdigit():
+        return None
+    sequences = {}
+    for item in filter(None, rest.split(",")):
+        shard_id, _, sequence = item.partition(":")
+        if not shard_id or not sequence.isdigit():
+            return None
+        sequences[shard_id] = sequence
+    return int(as_of), sequences
+
+
+def stream_record_to_event(record: dict, shard_id: Optional[str] = None) -> Optional[TaskEvent]:
+    """
+    DynamoDB Streams のレコードをタスクイベントに変換する
+
+    :param record: GetRecords の Records の1要素
+    :param shard_id: レコードを読んだシャード
+    :return: タスクイベント。タスクとして解釈できない場合は None
+    """
+    data = record.get("dynamodb", {})
+    task_id = str(_deserialize(data.get("Keys", {})).get("id", ""))
+    occurred_at = data.get("ApproximateCreationDateTime") or datetime.now(timezone.utc)
+    origin = {"shard_id": shard_id, "sequence_number": data.get("SequenceNumber")}
+    if record.get("eventName") == "REMOVE":
+        if _deserialize(data.get("OldImage", {})).get("deleted"):
+            # 保持期間を過ぎた墓標の消去。削除は墓標を書いた時点で通知済み
+            return None
+        return TaskEvent(type=TaskEventType.DELETED, task_id=task_id, occurred_at=occurred_at, **origin)
+    image = _deserialize(data.get("NewImage", {}))
+    if image.get("deleted"):
+        # DELETE /tasks/{id} は墓標への更新として届く
+        return TaskEvent(type=TaskEventType.DELETED, task_id=task_id, occurred_at=occurred_at, **origin)
+    try:
+        task = decode_task_item(image)
+    except ValidationError:
+        logger.warning("Skipping stream record that is not a valid task: %s", task_id)
+        return None
+    event_type = TaskEventType.CREATED if record.get("eventName") == "INSERT" else TaskEventType.UPDATED
+    return TaskEvent(type=event_type, task_id=task_id, task=task, occurred_at=occurred_at, **origin)
+
+
+class DynamoDBStreamTaskEventReader:
+    """
+    テーブルの DynamoDB Streams をポーリングし、変更をイベントバスに発行する
+
+    Lambda の実行環境は1度に1つのリクエストしか処理しないため、SSE を配信している実行環境には
+    別の実行環境で行われた書き込みがプロセス内のバス経由では届きません。このリーダーを使うと、
+    どの実行環境で書き込まれた変更もストリーム経由で受け取れます。
+
+    イベントの id はストリームの位置 (encode_stream_position) で、どの実行環境でも同じ意味を持ちます。
+    別の実行環境の id で再接続された場合は、replay がシャードごとに AFTER_SEQUENCE_NUMBER から読み直します。
+
+    起動時点で開いているシャードは LATEST から、その後に見つかったシャード (分割による子シャード) は
+    TRIM_HORIZON から読み始めます。イテレーターの期限切れ (実行環境の凍結中など) の後は読み終えた位置から
+    読み直し、読み直せないシャードがある場合はバスの購読に取りこぼしを知らせます。
+    GetRecords はシャードあたり毎秒5回までのため、poll_interval は同時に動くリーダーの数に合わせて調整してください。
+    シャードの一覧 (DescribeStream) は shard_refresh_interval ごと、またはシャードを読み終えた時だけ取り直します。
+    """
+
+    def __init__(
+        self,
+        table_name: str,
+        bus: ITaskEventBus,
+        poll_interval: float = 1.0,
+        max_replay_requests: int = 50,
+        shard_refresh_interval: float = 60.0,
+    ):
+        """
+        DynamoDBStreamTaskEventReader の初期化
+
+        :param table_name: テーブル名
+        :param bus: 変更を発行するイベントバス
+        :param poll_interval: ポーリングの間隔 (秒)
+        :param max_replay_requests: 1回の replay で呼び出す GetRecords の上限 (超える場合は読み直さない)
+        :param shard_refresh_interval: シャードの一覧を取り直す間隔 (秒)
+        """
+        self.dynamodb = boto3.client("dynamodb")
+        self.streams = boto3.client("dynamodbstreams")
+        self.table_name = table_name
+        self.bus = bus
+        self.poll_interval = poll_interval
+        self.max_replay_requests = max_replay_requests
+        self.shard_refresh_interval = shard_refresh_interval
+        self._stream_arn: Optional[str] = None
+        self._shards: List[dict] = []
+        self._iterators: Dict[str, Optional[str]] = {}
+        # シャードごとの読み終えた最後のシーケンス番号
+        self._sequences: Dict[str, str] = {}
+        # シーケンス番号を持たないシャードを読み直す場合に、既に配信済みとして飛ばすレコードの作成時刻 (ミリ秒)
+        self._skip_before: Dict[str, int] = {}
+        self._as_of_ms = _now_ms() - STREAM_DELAY_MARGIN_MS
+        self._initialized = False
+        # 最後にシャードの一覧を取得した時刻 (time.monotonic)。None の場合は次の読み取りで取り直す
+        self._shards_refreshed_at: Optional[float] = None
+        # True の場合、次の読み取りの前に状態を捨てて最新から読み直す (停止後の start)
+        self._restart = False
+        # ポーリングのスレッドと replay の呼び出し元の間でシャードの状態を守る
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """
+        ポーリングを開始する。停止していた間の変更は配信せず、最新から読み始めます
+
+        イベントバスのロックを取得した状態から呼ばれるため、ここではリーダーのロックを取得しません。
+        """
+        if self._thread is not None and not self._stop.is_set():
+            return
+        self._restart = self._thread is not None
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, args=(self._stop,), name="task-stream-reader", daemon=True)
+        self._thread.start()
+
+    def stop(self, wait: bool = True) -> None:
+        """
+        ポーリングを停止する
+
+        :param wait: True の場合、スレッドの終了を待つ
+        """
+        self._stop.set()
+        if wait and self._thread is not None:
+            self._thread.join()
+
+    def position(self) -> str:
+        """ここまで読み終えたストリームの位置"""
+        return encode_stream_position(self._as_of_ms, self._sequences)
+
+    def poll_once(self) -> int:
+        """
+        全シャードを1回ずつ読み、取得した変更を発行する
+
+        :return: 発行したイベント数
+        """
+        published = 0
+        with self._lock:
+            started_ms = _now_ms()
+            self._refresh_shards()
+            for shard_id, iterator in list(self._iterators.items()):
+                if iterator is None:
+                    continue
+                response = self.streams.get_records(ShardIterator=iterator, Limit=1000)
+                for record in response.get("Records", []):
+                    self._sequences[shard_id] = record["dynamodb"]["SequenceNumber"]
+                    if _created_ms(record) < self._skip_before.get(shard_id, 0):
+                        continue
+                    event = stream_record_to_event(record, shard_id)
+                    if event is not None:
+                        self.bus.publish(event.model_copy(update={"id": self.position()}))
+                        published += 1
+                # 閉じたシャードを読み終えると NextShardIterator は返らない
+                self._iterators[shard_id] = response.get("NextShardIterator")
+                if self._iterators[shard_id] is None:
+                    # 分割で作られた子シャードを次の読み取りで見つける
+                    self._shards_refreshed_at = None
+            self._as_of_ms = started_ms - STREAM_DELAY_MARGIN_MS
+            position = self.position()
+        self.bus.publish_position(position)
+        return published
+
+    def replay(self, position: str) -> Optional[Tuple[List[TaskEvent], str]]:
+        """
+        position (別の実行環境が発行したイベントの id) より後の変更を、ストリームから読み直す
+
+        :param position: ストリームの位置
+        :return: (イベント, 読み終えた位置)。ストリームの位置ではない場合や、保持期間を過ぎた、
+            読み直す量が max_replay_requests を超えるなどで読み直せない場合は None
+        """
+        decoded = decode_stream_position(position)
+        if decoded is None:
+            return None
+        as_of_ms, sequences = decoded
+        with self._lock:
+            # 先にライブの読み取りを開始しておき、読み直しとの間に隙間を作らない
+            self._refresh_shards()
+            shards = list(self._shards)
+        started_ms = _now_ms()
+        events: List[TaskEvent] = []
+        requests = 0
+        try:
+            for shard in shards:
+                shard_id = shard["ShardId"]
+                ending_sequence = shard.get("SequenceNumberRange", {}).get("EndingSequenceNumber")
+                if shard_id in sequences and sequences[shard_id] == ending_sequence:
+                    # 最後まで読み終えた閉じたシャード
+                    continue
+                if shard_id in sequences:
+                    iterator = self._get_iterator(shard_id, "AFTER_SEQUENCE_NUMBER", sequences[shard_id])
+                    skip_before = 0
+                else:
+                    # as_of までの変更は読み終えているため、それより後に作られたレコードだけを返す
+                    iterator = self._get_iterator(shard_id, "TRIM_HORIZON")
+                    skip_before = as_of_ms
+                while iterator is not None:
+                    if requests >= self.max_replay_requests:
+                        logger.warning("Too many stream records to replay from %s.", position)
+                        return None
+                    response = self.streams.get_records(ShardIterator=iterator, Limit=1000)
+                    requests += 1
+                    records = response.get("Records", [])
+                    for record in records:
+                        sequences[shard_id] = record["dynamodb"]["SequenceNumber"]
+                        if _created_ms(record) < skip_before:
+                            continue
+                        event = stream_record_to_event(record, shard_id)
+                        if event is not None:
+                            events.append(event.model_copy(update={"id": encode_stream_position(as_of_ms, sequences)}))
+                    iterator = response.get("NextShardIterator")
+                    if not records and ending_sequence is None:
+                        # 開いているシャードの最新まで読んだ
+                        break
+        except (ClientError, BotoCoreError):
+            logger.warning("Failed to replay task stream from %s.", position, exc_info=True)
+            return None
+        known = {shard["ShardId"] for shard in shards}
+        sequences = {shard_id: sequence for shard_id, sequence in sequences.items() if shard_id in known}
+        return events, encode_stream_position(started_ms - STREAM_DELAY_MARGIN_MS, sequences)
+
+    def _run(self, stop: threading.Event) -> None:
+        while not stop.is_set():
+            try:
+                self.poll_once()
+            except ClientError:
+                logger.exception("Failed to read task stream of %s.", self.table_name)
+                self._reopen_shards()
+            except Exception:
+                # 通信の失敗 (BotoCoreError) などでもスレッドを止めない。読み終えた位置は進めていないため次の読み取りで
+                # 読み直すが、購読には取りこぼしの可能性を知らせる
+                logger.exception("Unexpected error while reading task stream of %s.", self.table_name)
+                self.bus.mark_lost()
+            stop.wait(self.poll_interval)
+
+    def _reopen_shards(self) -> None:
+        # 凍結中に期限切れになったイテレーターなどは、読み終えた位置から開き直す
+        with self._lock:
+            try:
+                for shard_id, iterator in list(self._iterators.items()):
+                    if iterator is None:
+                        continue
+                    sequence = self._sequences.get(shard_id)
+                    if sequence is not None:
+                        self._iterators[shard_id] = self._get_iterator(shard_id, "AFTER_SEQUENCE_NUMBER", sequence)
+                    else:
+                        self._skip_before[shard_id] = self._as_of_ms
+                        self._iterators[shard_id] = self._get_iterator(shard_id, "TRIM_HORIZON")
+                return
+            except ClientError:
+                logger.exception("Failed to resume task stream of %s; restarting from the latest.", self.table_name)
+                self._reset()
+        # 最新から読み直すため、その間の変更は配信できない
+        self.bus.mark_lost()
+
+    def _get_iterator(self, shard_id: str, iterator_type: str, sequence: Optional[str] = None) -> str:
+        params = {"StreamArn": self._stream_arn, "ShardId": shard_id, "ShardIteratorType": iterator_type}
+        if sequence is not None:
+            params["SequenceNumber"] = sequence
+        return self.streams.get_shard_iterator(**params)["ShardIterator"]
+
+    def _reset(self) -> None:
+        # self._lock を取得した状態で呼び出す
+        self._stream_arn = None
+        self._shards = []
+        self._iterators.clear()
+        self._sequences.clear()
+        self._skip_before.clear()
+        self._as_of_ms = _now_ms() - STREAM_DELAY_MARGIN_MS
+        self._initialized = False
+        self._shards_refreshed_at = None
+        self._restart = False
+
+    def _refresh_shards(self) -> None:
+        # self._lock を取得した状態で呼び出す
+        if self._restart:
+            self._reset()
+        if (
+            self._shards_refreshed_at is not None
+            and time.monotonic() - self._shards_refreshed_at < self.shard_refresh_interval
+        ):
+            return
+        if self._stream_arn is None:
+            table = self.dynamodb.describe_table(TableName=self.table_name)["Table"]
+            self._stream_arn = table["LatestStreamArn"]
+
+        shards = []
+        params = {"StreamArn": self._stream_arn}
+        while True:
+            description = self.streams.describe_stream(**params)["StreamDescription"]
+            shards.extend(description.get("Shards", []))
+            last_shard_id = description.get("LastEvaluatedShardId")
+            if not last_shard_id:
+                break
+            params["ExclusiveStartShardId"] = last_shard_id
+        self._shards = shards
+
+        for shard in shards:
+            shard_id = shard["ShardId"]
+            ending_sequence = shard.get("SequenceNumberRange", {}).get("EndingSequenceNumber")
+            if shard_id in self._iterators:
+                if self._iterators[shard_id] is None and ending_sequence and shard_id not in self._sequences:
+                    # レコードを読まずに閉じたシャードは、最後まで読み終えたものとして位置に含める
+                    self._sequences[shard_id] = ending_sequence
+                continue
+            if not self._initialized and ending_sequence:
+                # 起動前に閉じたシャードの変更は配信しない
+                self._iterators[shard_id] = None
+                self._sequences[shard_id] = ending_sequence
+                continue
+            iterator_type = "LATEST" if not self._initialized else "TRIM_HORIZON"
+            self._iterators[shard_id] = self._get_iterator(shard_id, iterator_type)
+
+        # 保持期間を過ぎて消えたシャードは位置から除く
+        known = {shard["ShardId"] for shard in shards}
+        for shard_id in set(self._iterators) - known:
+            self._iterators.pop(shard_id, None)
+            self._sequences.pop(shard_id, None)
+            self._skip_before.pop(shard_id, None)
+        self._initialized = True
+        self._shards_refreshed_at = time.monotonic()
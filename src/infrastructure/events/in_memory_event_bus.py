@@ -0,0 +1,262 @@
+import asyncio
+import threading
+from collections import deque
+from typing import Callable, Deque, Dict, List, Optional, Set, Tuple, Union
+
+from ...core.logger import get_logger
+from ...domains.interfaces.task_event_bus import ITaskEventBus, ITaskEventSubscription
+from ...domains.models.task_event import TaskEvent
+
+logger = get_logger(__name__)
+
+# 履歴に無い位置から再開するための読み直し。位置より後のイベントと読み終えた位置を返し、読み直せない場合は None
+ReplaySource = Callable[[str], Optional[Tuple[List[TaskEvent], str]]]
+
+
+class _Lost:
+    pass
+
+
+# 購読のキューに入れる、取りこぼしを知らせる目印
+_LOST = _Lost()
+
+
+class _ReplayEnd:
+    """読み直したイベントの後に置く目印。これより後に届くライブのイベントから、読み直し済みの変更を除く"""
+
+    def __init__(self, position: str, sequences: Dict[str, int]):
+        self.position = position
+        self.sequences = sequences
+
+
+# キューの要素: イベント、位置 (str)、取りこぼしの目印、読み直しの終わり
+_QueueItem = Union[TaskEvent, str, _Lost, _ReplayEnd]
+
+
+class InMemoryTaskEventSubscription(ITaskEventSubscription):
+    def __init__(
+        self,
+        bus: "InMemoryTaskEventBus",
+        loop: asyncio.AbstractEventLoop,
+        max_pending: int,
+        position: Optional[str] = None,
+    ):
+        self._bus = bus
+        self._loop = loop
+        self._queue: "asyncio.Queue[_QueueItem]" = asyncio.Queue()
+        self._max_pending = max_pending
+        self.lost = False
+        self.overflowed = False
+        self.position = position
+        # 最初の next_event で、この位置からの変更を発行元から読み直す
+        self._replay_from: Optional[str] = None
+        # 読み直しで受け取ったシャードごとの最後のシーケンス番号 (後から届く同じ変更を除く)
+        self._replayed: Dict[str, int] = {}
+
+    async def next_event(self, timeout: float) -> Optional[TaskEvent]:
+        """
+        次のイベントを待つ
+
+        :param timeout: 待機する最大秒数
+        :return: イベント。timeout までに届かなかった場合、購読が打ち切られた場合、取りこぼしが分かった場合は None
+        """
+        if self.overflowed:
+            return None
+        if self._replay_from is not None:
+            await self._replay()
+            if self.lost:
+                return None
+        deadline = self._loop.time() + timeout
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except asyncio.QueueEmpty:
+                remaining = deadline - self._loop.time()
+                if remaining <= 0:
+                    return None
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), remaining)
+                except asyncio.TimeoutError:
+                    return None
+            if isinstance(item, _Lost):
+                self.lost = True
+                return None
+            if isinstance(item, str):
+                self.position = item
+                continue
+            if isinstance(item, _ReplayEnd):
+                self.position = item.position
+                self._replayed = item.sequences
+                continue
+            if self._is_replayed(item):
+                continue
+            if item.id:
+                self.position = item.id
+            return item
+
+    def close(self) -> None:
+        self._bus._unsubscribe(self)
+
+    def _enqueue(self, item: _QueueItem) -> None:
+        self._queue.put_nowait(item)
+
+    def _deliver(self, item: _QueueItem) -> None:
+        # 購読側のイベントループ上で実行される
+        if self.overflowed:
+            return
+        if self._queue.qsize() >= self._max_pending:
+            # 遅い購読者のためにメモリを使い続けないよう打ち切る。クライアントは Last-Event-ID で再接続する
+            self.overflowed = True
+            self._bus._unsubscribe(self)
+            return
+        self._queue.put_nowait(item)
+
+    async def _replay(self) -> None:
+        position, self._replay_from = self._replay_from, None
+        replay_source = self._bus._replay_source
+        # _replay_from は発行元がある場合だけ設定される
+        assert position is not None and replay_source is not None
+        result = await asyncio.to_thread(replay_source, position)
+        if result is None:
+            self.lost = True
+            self.position = self._bus._position
+            return
+        events, replayed_position = result
+        # 購読の登録後に届いたライブのイベントは、読み直したイベントの後に回す
+        live = []
+        while not self._queue.empty():
+            live.append(self._queue.get_nowait())
+        sequences: Dict[str, int] = {}
+        for event in events:
+            self._queue.put_nowait(event)
+            if event.shard_id is not None and event.sequence_number is not None:
+                sequences[event.shard_id] = int(event.sequence_number)
+        self._queue.put_nowait(_ReplayEnd(replayed_position, sequences))
+        for item in live:
+            self._queue.put_nowait(item)
+        logger.info("Replayed %d task events from %s.", len(events), position)
+
+    def _is_replayed(self, event: TaskEvent) -> bool:
+        if not self._replayed or event.shard_id is None or event.sequence_number is None:
+            return False
+        return int(event.sequence_number) <= self._replayed.get(event.shard_id, -1)
+
+
+class InMemoryTaskEventBus(ITaskEventBus):
+    """
+    同じプロセス内の購読者にイベントを配信するイベントバス
+
+    発行は任意のスレッドから、購読は asyncio のイベントループ上から行います。
+    直近 history_size 件のイベントを保持し、再接続時に Last-Event-ID 以降を再送します。
+    履歴に無い Last-Event-ID は、set_replay_source で設定した発行元 (DynamoDB Streams) から読み直します。
+    set_activity_hooks で設定した関数は、最初の購読が始まった時と最後の購読が終わった時に呼び出します。
+    """
+
+    def __init__(self, history_size: int = 1000, max_pending: int = 1000):
+        self._lock = threading.Lock()
+        self._history: Deque[TaskEvent] = deque(maxlen=history_size)
+        self._subscribers: Set[InMemoryTaskEventSubscription] = set()
+        self._next_id = 1
+        self._max_pending = max_pending
+        # 発行元の最新の位置 (新しい購読の position の初期値)
+        self._position: Optional[str] = None
+        self._replay_source: Optional[ReplaySource] = None
+        self._on_active: Optional[Callable[[], None]] = None
+        self._on_idle: Optional[Callable[[], None]] = None
+
+    def set_replay_source(self, replay_source: ReplaySource) -> None:
+        self._replay_source = replay_source
+
+    def set_activity_hooks(self, on_active: Callable[[], None], on_idle: Callable[[], None]) -> None:
+        """
+        購読の有無に合わせて発行元を動かす関数を設定する
+
+        どちらもバスのロックを取得した状態で呼び出すため、ブロックしたりバスを呼び出したりしないでください。
+
+        :param on_active: 購読が無い状態から最初の購読が始まった時に呼び出す
+        :param on_idle: 最後の購読が終わった時に呼び出す
+        """
+        self._on_active = on_active
+        self._on_idle = on_idle
+
+    def publish(self, event: TaskEvent) -> TaskEvent:
+        with self._lock:
+            if not event.id:
+                event = event.model_copy(update={"id": str(self._next_id)})
+                self._next_id += 1
+            self._history.append(event)
+            self._position = event.id
+            subscribers = list(self._subscribers)
+        self._broadcast(subscribers, event)
+        return event
+
+    def publish_position(self, position: str) -> None:
+        with self._lock:
+            if position == self._position:
+                return
+            self._position = position
+            subscribers = list(self._subscribers)
+        self._broadcast(subscribers, position)
+
+    def mark_lost(self) -> None:
+        with self._lock:
+            subscribers = list(self._subscribers)
+        self._broadcast(subscribers, _LOST)
+
+    def subscribe(self, last_event_id: Optional[str] = None) -> InMemoryTaskEventSubscription:
+        """
+        イベントを購読する (イベントループ上で呼び出すこと)
+
+        :param last_event_id: 受信済みの最後のイベントID。指定するとそれより後のイベントから再送する
+        :return: 購読
+        """
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if not self._subscribers and self._on_active is not None:
+                # 発行元が止まっていた間の変更は履歴に無いため、履歴からは再送せずに発行元から読み直す
+                self._history.clear()
+                self._on_active()
+            subscription = InMemoryTaskEventSubscription(self, loop, self._max_pending, position=self._position)
+            self._subscribers.add(subscription)
+            if last_event_id is not None:
+                self._resume(subscription, last_event_id)
+        return subscription
+
+    def _resume(self, subscription: InMemoryTaskEventSubscription, last_event_id: str) -> None:
+        # self._lock を取得した状態で呼び出す
+        ids = [event.id for event in self._history]
+        if last_event_id in ids:
+            subscription.position = last_event_id
+            for event in list(self._history)[ids.index(last_event_id) + 1 :]:
+                subscription._enqueue(event)
+        elif self._replay_source is not None:
+            # 別の実行環境が発行した位置。購読を登録した後に読み直すため、その間の変更も取りこぼさない
+            subscription.position = last_event_id
+            subscription._replay_from = last_event_id
+        elif last_event_id.isdigit() and int(last_event_id) < self._next_id:
+            oldest = int(self._history[0].id) if self._history else self._next_id
+            subscription.position = last_event_id
+            subscription.lost = int(last_event_id) + 1 < oldest
+            for event in self._history:
+                if int(event.id) > int(last_event_id):
+                    subscription._enqueue(event)
+        else:
+            # 再起動などで採番がやり直されている
+            subscription.lost = True
+
+    def _broadcast(self, subscribers: List[InMemoryTaskEventSubscription], item: _QueueItem) -> None:
+        for subscriber in subscribers:
+            try:
+                subscriber._loop.call_soon_threadsafe(subscriber._deliver, item)
+            except RuntimeError:
+                # 購読側のイベントループが既に終了している
+                logger.debug("Dropping subscriber whose event loop is closed.")
+                self._unsubscribe(subscriber)
+
+    def _unsubscribe(self, subscription: InMemoryTaskEventSubscription) -> None:
+        with self._lock:
+            if subscription not in self._subscribers:
+                return
+            self._subscribers.discard(subscription)
+            if not self._subscribers and self._on_idle is not None:
+                self._on_idle()
@@ -0,0 +1,273 @@
+import math
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from pydantic import BaseModel
+
+from ...core.logger import get_logger
+from ...exceptions.errors import DataConflictError, InvalidParameterError
+from ..repositories.task_item_codec import item_size
+from ..repositories.task_repository import SCHEMA_VERSION_ATTRIBUTE, TaskDynamoDBRepository
+from .task_migrations import TaskMigration
+
+logger = get_logger(__name__)
+
+WRITE_UNIT_BYTES = 1024
+
+
+class CapacityBudget:
+    """
+    1秒あたりのキャパシティユニットを上限とするトークンバケット
+
+    消費量が事前に分からない読み取りのために、残高がマイナスになる消費を許し、
+    マイナス分を返すまで次の呼び出し元を待たせます。複数スレッドから同時に使えます。
+    """
+
+    def __init__(
+        self,
+        units_per_second: float,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.units_per_second = units_per_second
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._tokens = units_per_second
+        self._updated_at = clock()
+
+    def acquire(self, units: float) -> None:
+        """units を消費し、上限を超えている間は待つ"""
+        with self._lock:
+            now = self._clock()
+            # 1秒分を超えて貯めない (長い待機の後に一気に書き込まないため)
+            self._tokens = min(self.units_per_second, self._tokens + (now - self._updated_at) * self.units_per_second)
+            self._updated_at = now
+            self._tokens -= units
+            wait = -self._tokens / self.units_per_second if self._tokens < 0 else 0.0
+        if wait > 0:
+            self._sleep(wait)
+
+    def refund(self, units: float) -> None:
+        """見積もりより実際の消費が少なかった分を戻す"""
+        with self._lock:
+            self._tokens = min(self.units_per_second, self._tokens + units)
+
+
+class MigrationReport(BaseModel):
+    dry_run: bool
+    target_version: int
+    scanned: int = 0
+    migrated: int = 0
+    # 既に target_version のアイテム
+    up_to_date: int = 0
+    # 移行しても内容が変わらないため書き込まなかったアイテム
+    unchanged: int = 0
+    conflicts: int = 0
+    failed: int = 0
+    # 移行の名前ごとの、内容を変更したアイテム数
+    changed_by_migration: Dict[str, int] = {}
+    bytes_before: int = 0
+    bytes_after: int = 0
+    consumed_rcu: float = 0.0
+    # dry_run の場合は書き込んだ場合の見積もり
+    consumed_wcu: float = 0.0
+    completed_segments: List[int] = []
+
+
+class _SegmentCheckpoint(BaseModel):
+    start_key: Optional[dict] = None
+    done: bool = False
+
+
+class MigrationCheckpoint(BaseModel):
+    total_segments: int
+    target_version: int
+    segments: Dict[int, _SegmentCheckpoint] = {}
+    report: Optional[MigrationReport] = None
+
+
+class MigrationRunner:
+    def __init__(
+        self,
+        repository: TaskDynamoDBRepository,
+        migrations: List[TaskMigration],
+        segments: int = 4,
+        max_wcu: float = 25.0,
+        max_rcu: Optional[float] = None,
+        page_size: int = 100,
+        checkpoint_path: Optional[str] = None,
+        dry_run: bool = False,
+        target_version: Optional[int] = None,
+    ):
+        """
+        MigrationRunner の初期化
+
+        テーブルを segments 個に分けて並列にスキャンし、schema_version が target_version 未満のアイテムに
+        残りの移行を順に適用して、内容が変わったアイテムを読み取り後に変更されていない場合だけ書き戻します。
+        書き込みは全区分の合計で毎秒 max_wcu (読み取りは max_rcu) を超えないように待ちます。
+        checkpoint_path を指定すると、ページごとに進捗を保存し、次回はその続きから再開します
+        (全区分を読み終えるとチェックポイントは削除されます)。
+
+        :param repository: 移行するテーブルのリポジトリ
+        :param migrations: 移行の一覧 (バージョンの昇順)
+        :param segments: 並列スキャンの区分数
+        :param max_wcu: 1秒あたりの書き込みキャパシティの上限
+        :param max_rcu: 1秒あたりの読み取りキャパシティの上限 (None で制限しない)
+        :param page_size: 1回のスキャンで読むアイテム数
+        :param checkpoint_path: 進捗を保存するファイル
+        :param dry_run: True の場合は書き込まず、変更されるアイテム数と消費量の見積もりだけを集計する
+        :param target_version: 適用する最後のバージョン (None で全て)
+        """
+        versions = [migration.version for migration in migrations]
+        if versions != sorted(set(versions)) or (versions and versions[0] < 1):
+            raise InvalidParameterError(
+                "migrations", str(versions), "Migration versions must be unique, ascending and >= 1"
+            )
+        self.repository = repository
+        self.target_version = target_version if target_version is not None else (versions[-1] if versions else 0)
+        self.migrations = [migration for migration in migrations if migration.version <= self.target_version]
+        self.segments = segments
+        self.write_budget = CapacityBudget(max_wcu)
+        self.read_budget = CapacityBudget(max_rcu) if max_rcu else None
+        self.page_size = page_size
+        self.checkpoint_path = Path(checkpoint_path) if checkpoint_path else None
+        self.dry_run = dry_run
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+
+    def stop(self) -> None:
+        """実行中のページを終えたところで止める (チェックポイントから再開できる)"""
+        self._stop.set()
+
+    def run(self) -> MigrationReport:
+        """
+        移行を実行する
+
+        :return: 実行結果 (チェックポイントから再開した場合は前回までの分を含む)
+        """
+        self._checkpoint = self._load_checkpoint()
+        self._report = self._checkpoint.report or MigrationReport(
+            dry_run=self.dry_run, target_version=self.target_version
+        )
+        self._checkpoint.report = self._report
+        with ThreadPoolExecutor(max_workers=self.segments, thread_name_prefix="migration") as executor:
+            list(executor.map(self._run_segment, range(self.segments)))
+        if self.checkpoint_path is not None and len(self._report.completed_segments) == self.segments:
+            self.checkpoint_path.unlink(missing_ok=True)
+        return self._report.model_copy(deep=True)
+
+    def migrate_item(self, item: dict) -> tuple[dict, List[str]]:
+        """
+        アイテムに未適用の移行を適用する
+
+        :param item: アイテム
+        :return: (移行後のアイテム, 内容を変更した移行の名前)
+        """
+        version = int(item.get(SCHEMA_VERSION_ATTRIBUTE, 0))
+        changed = []
+        for migration in self.migrations:
+            if migration.version <= version:
+                continue
+            migrated = migration.transform(item)
+            if migrated != item:
+                changed.append(migration.name)
+            item = migrated
+        return dict(item, **{SCHEMA_VERSION_ATTRIBUTE: self.target_version}), changed
+
+    def _run_segment(self, segment: int) -> None:
+        try:
+            self._scan_segment(segment)
+        except BaseException:
+            # 他の区分も今のページで止め、チェックポイントから再開できるようにする
+            self._stop.set()
+            raise
+
+    def _scan_segment(self, segment: int) -> None:
+        with self._lock:
+            state = self._checkpoint.segments.setdefault(segment, _SegmentCheckpoint())
+        while not state.done and not self._stop.is_set():
+            items, next_key, consumed_rcu = self.repository.scan_items(
+                segment, self.segments, start_key=state.start_key, limit=self.page_size
+            )
+            if self.read_budget is not None:
+                self.read_budget.acquire(consumed_rcu)
+            with self._lock:
+                self._report.consumed_rcu += consumed_rcu
+            for item in items:
+                self._process_item(item)
+            with self._lock:
+                state.start_key = next_key
+                state.done = next_key is None
+                if state.done:
+                    self._report.completed_segments = sorted(self._report.completed_segments + [segment])
+                self._save_checkpoint()
+
+    def _process_item(self, item: dict) -> None:
+        if int(item.get(SCHEMA_VERSION_ATTRIBUTE, 0)) >= self.target_version:
+            with self._lock:
+                self._report.scanned += 1
+                self._report.up_to_date += 1
+            return
+
+        migrated, changed = self.migrate_item(item)
+        if not changed:
+            with self._lock:
+                self._report.scanned += 1
+                self._report.unchanged += 1
+            return
+
+        size_before, size_after = item_size(item), item_size(migrated)
+        estimated_wcu = float(math.ceil(max(size_before, size_after) / WRITE_UNIT_BYTES))
+        consumed_wcu = estimated_wcu
+        outcome = "migrated"
+        if not self.dry_run:
+            self.write_budget.acquire(estimated_wcu)
+            try:
+                consumed_wcu = self.repository.replace_item(migrated, item) or estimated_wcu
+                self.write_budget.refund(estimated_wcu - consumed_wcu)
+            except DataConflictError:
+                # 移行中にアプリケーションが書き換えた。次回の実行で改めて移行する
+                outcome = "conflicts"
+            except Exception:
+                logger.exception("Failed to migrate item %s.", item.get("id"))
+                outcome = "failed"
+
+        with self._lock:
+            report = self._report
+            report.scanned += 1
+            setattr(report, outcome, getattr(report, outcome) + 1)
+            report.consumed_wcu += consumed_wcu
+            if outcome == "migrated":
+                report.bytes_before += size_before
+                report.bytes_after += size_after
+                for name in changed:
+                    report.changed_by_migration[name] = report.changed_by_migration.get(name, 0) + 1
+
+    def _load_checkpoint(self) -> MigrationCheckpoint:
+        fresh = MigrationCheckpoint(total_segments=self.segments, target_version=self.target_version)
+        if self.checkpoint_path is None or not self.checkpoint_path.exists():
+            return fresh
+        checkpoint = MigrationCheckpoint.model_validate_json(self.checkpoint_path.read_text(encoding="utf-8"))
+        if checkpoint.total_segments != self.segments or checkpoint.target_version != self.target_version:
+            raise InvalidParameterError(
+                "checkpoint",
+                str(self.checkpoint_path),
+                "Checkpoint was created with different segments or target version",
+            )
+        if checkpoint.report is not None and checkpoint.report.dry_run != self.dry_run:
+            raise InvalidParameterError("checkpoint", str(self.checkpoint_path), "Checkpoint dry-run mode differs")
+        logger.info("Resuming migration from %s.", self.checkpoint_path)
+        return checkpoint
+
+    def _save_checkpoint(self) -> None:
+        # self._lock を取得した状態で呼び出す
+        if self.checkpoint_path is None:
+            return
+        tmp_path = self.checkpoint_path.with_name(self.checkpoint_path.name + ".tmp")
+        tmp_path.write_text(self._checkpoint.model_dump_json(), encoding="utf-8")
+        os.replace(tmp_path, self.checkpoint_path)
@@ -0,0 +1,105 @@
+"""
+タスクアイテムの移行 (保存済みアイテムの書き換え) の定義
+
+移行はバージョン順に適用され、適用後のアイテムには schema_version として最後のバージョンが記録されます。
+移行は同じアイテムに2回適用しても結果が変わらないように書くこと (中断からの再開や、移行の導入前の
+コードで書かれたアイテムに再び適用されることがあるため)。追加のみ行い、公開済みのバージョンは変更しないこと。
+タスクの内容を変える移行は touch_item で updated_at / sync_key / sync_shard も更新すること
+(更新しないと差分同期のクライアントに変更が届かない)。エンコーディングだけを変える移行は更新しない。
+"""
+
+import re
+from datetime import date, datetime, timezone
+from typing import Callable, List
+
+from pydantic import BaseModel
+
+from ...domains.models.task import TaskPriority, TaskStatus
+from ..repositories.task_item_codec import (
+    DEFAULT_COMPRESS_THRESHOLD,
+    PRIORITY_CODES,
+    STATUS_CODES,
+    TEXT_ATTRIBUTES,
+    decode_text,
+    encode_text,
+)
+from ..repositories.task_repository import sync_key, sync_shard
+
+
+class TaskMigration(BaseModel):
+    version: int
+    name: str
+    # アイテムを受け取り、書き換えたアイテムを返す (変更が無ければ同じ内容を返す)
+    transform: Callable[[dict], dict]
+
+
+def touch_item(item: dict, **changes) -> dict:
+    """
+    内容を変更したアイテムを、差分同期で変更として返るよう現在時刻で更新したことにする
+
+    :param item: アイテム
+    :param changes: 変更する属性
+    :return: 変更と updated_at / sync_key / sync_shard を反映したアイテム
+    """
+    updated_at = datetime.now(timezone.utc)
+    return dict(
+        item,
+        **changes,
+        updated_at=updated_at.isoformat(),
+        sync_key=sync_key(updated_at, item["id"]),
+        sync_shard=sync_shard(item["id"]),
+    )
+
+
+def backfill_sync_attributes(item: dict) -> dict:
+    """差分同期の導入前に書かれたアイテムに updated_at / sync_key / sync_shard を設定する"""
+    if "sync_key" in item:
+        return item
+    updated_at = item.get("updated_at") or datetime.now(timezone.utc).isoformat()
+    return dict(
+        item,
+        updated_at=updated_at,
+        sync_key=sync_key(datetime.fromisoformat(updated_at), item["id"]),
+        sync_shard=sync_shard(item["id"]),
+    )
+
+
+def compact_encoding(item: dict) -> dict:
+    """列挙値の名前で保存された status / priority をコードにし、長いテキストを圧縮する"""
+    migrated = dict(item)
+    if isinstance(item.get("status"), str):
+        migrated["status"] = STATUS_CODES[TaskStatus(item["status"])]
+    if isinstance(item.get("priority"), str):
+        migrated["priority"] = PRIORITY_CODES[TaskPriority(item["priority"])]
+    for name in TEXT_ATTRIBUTES:
+        if isinstance(item.get(name), str):
+            migrated[name] = encode_text(decode_text(item[name]), DEFAULT_COMPRESS_THRESHOLD)
+    return migrated
+
+
+_DATE_PATTERN = re.compile(r"^\s*(\d{4})[-/.年]\s*(\d{1,2})[-/.月]\s*(\d{1,2})日?\s*$")
+
+
+def normalize_due_date(item: dict) -> dict:
+    """2025/1/5 や 2025年1月5日 のような due_date を 2025-01-05 にそろえる (解釈できない値はそのまま)"""
+    due_date = item.get("due_date")
+    if not isinstance(due_date, str):
+        return item
+    match = _DATE_PATTERN.match(due_date)
+    if match is None:
+        return item
+    year, month, day = match.groups()
+    try:
+        normalized = date(int(year), int(month), int(day)).isoformat()
+    except ValueError:
+        return item
+    if normalized == due_date:
+        return item
+    return touch_item(item, due_date=normalized)
+
+
+MIGRATIONS: List[TaskMigration] = [
+    TaskMigration(version=1, name="backfill_sync_attributes", transform=backfill_sync_attributes),
+    TaskMigration(version=2, name="compact_encoding", transform=compact_encoding),
+    TaskMigration(version=3, name="normalize_due_date", transform=normalize_due_date),
+]
@@ -0,0 +1,130 @@
+import asyncio
+import threading
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Generic, Hashable, Optional, TypeVar
+
+from ...core.metrics import metrics
+
+T = TypeVar("T")
+
+# 相乗りによって省略できた呼び出し1回ごとに 1 を記録するメトリクス
+COALESCING_SAVED_METRIC = "coalescing.saved"
+
+
+@dataclass(frozen=True)
+class SingleFlightStats:
+    """コアレッシングの統計情報のスナップショット"""
+
+    calls: int = 0
+    executions: int = 0
+
+    @property
+    def saved(self) -> int:
+        """相乗りによって省略できた呼び出し回数"""
+        return self.calls - self.executions
+
+
+class _Call(Generic[T]):
+    __slots__ = ("done", "result", "error")
+
+    # fn が値を返した場合だけ設定する (例外の場合は error)
+    result: T
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """
+    同一キーに対する同時実行中の呼び出しを1回にまとめる (スレッド用)
+
+    先に到着した呼び出しだけが関数を実行し、実行中に到着した同じキーの呼び出しは
+    その結果 (または例外) を共有します。完了後の呼び出しは再度実行されるため、
+    キャッシュとしては振る舞いません。
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call[Any]] = {}
+        self._total = 0
+        self._executions = 0
+
+    def do(self, key: Hashable, fn: Callable[[], T]) -> T:
+        """
+        キーごとに fn を1回だけ実行し、その結果を待機中の全呼び出しに返す
+
+        :param key: 呼び出しを識別するキー
+        :param fn: 実行する関数
+        :return: fn の戻り値
+        """
+        with self._lock:
+            self._total += 1
+            call = self._calls.get(key)
+            leader = call is None
+            if call is None:
+                call = _Call()
+                self._calls[key] = call
+                self._executions += 1
+
+        if not leader:
+            metrics.count(COALESCING_SAVED_METRIC)
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+    def stats(self) -> SingleFlightStats:
+        with self._lock:
+            return SingleFlightStats(calls=self._total, executions=self._executions)
+
+
+class AsyncSingleFlight:
+    """
+    同一キーに対する同時実行中のコルーチンを1回にまとめる (asyncio用)
+
+    実行はタスクとして切り離されるため、待機側の1つがキャンセルされても
+    他の待機側の結果には影響しません。
+    """
+
+    def __init__(self):
+        self._futures: Dict[Hashable, "asyncio.Future"] = {}
+        self._total = 0
+        self._executions = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        """
+        キーごとに fn を1回だけ実行し、その結果を待機中の全呼び出しに返す
+
+        :param key: 呼び出しを識別するキー
+        :param fn: コルーチンを返す関数
+        :return: コルーチンの結果
+        """
+        self._total += 1
+        future = self._futures.get(key)
+        if future is None:
+            future = asyncio.ensure_future(fn())
+            self._futures[key] = future
+            self._executions += 1
+            future.add_done_callback(lambda f: self._forget(key, f))
+        else:
+            metrics.count(COALESCING_SAVED_METRIC)
+        return await asyncio.shield(future)
+
+    def _forget(self, key: Hashable, future: "asyncio.Future") -> None:
+        if self._futures.get(key) is future:
+            del self._futures[key]
+
+    def stats(self) -> SingleFlightStats:
+        return SingleFlightStats(calls=self._total, executions=self._executions)
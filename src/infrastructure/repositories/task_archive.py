@@ -0,0 +1,166 @@
+import gzip
+import os
+from abc import abstractmethod
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple
+from uuid import UUID, uuid4
+
+import boto3
+from botocore.exceptions import ClientError
+
+from ...core.logger import get_logger
+from ...domains.interfaces.task_archive import ITaskArchive
+from ...domains.models.task import Task
+from ...exceptions.errors import DataAccessError, DataNotFoundError, InvalidParameterError
+
+logger = get_logger(__name__)
+
+ARCHIVE_SUFFIX = ".jsonl.gz"
+# タスクIDから、そのタスクを含むファイルのキーを引く索引 ("index/<タスクID>" に本体のキーを保存する)
+INDEX_PREFIX = "index/"
+
+
+class PartitionedTaskArchive(ITaskArchive):
+    """
+    退避したタスクを日付で区切った gzip 圧縮の NDJSON ファイルとして保存するアーカイブ
+
+    キーは "dt=YYYY-MM-DD/<時刻>-<batch_id>.jsonl.gz" の形式で、書き込み1回につき1ファイルです。
+    batch_id を省略した場合はランダムな値を使います。
+    タスクごとに索引を書き込むため、get_archived_task は索引が指す1ファイルだけを読みます。
+    """
+
+    def archive_tasks(self, tasks: List[Task], archived_at: datetime, batch_id: Optional[str] = None) -> None:
+        if not tasks:
+            return
+        key = f"dt={archived_at:%Y-%m-%d}/{archived_at:%H%M%S}-{batch_id or uuid4().hex}{ARCHIVE_SUFFIX}"
+        body = gzip.compress("".join(task.model_dump_json() + "\n" for task in tasks).encode("utf-8"))
+        self._put(key, body)
+        # 本体を書いた後に索引を書く。途中で失敗しても再試行で同じキーに書き直される
+        for task in tasks:
+            self._put(f"{INDEX_PREFIX}{task.id}", key.encode("utf-8"))
+
+    def list_archived_tasks(
+        self, archived_from: date, archived_to: date, cursor: Optional[str] = None, limit: int = 100
+    ) -> Tuple[List[Task], Optional[str]]:
+        # 続きの位置は "<ファイルのキー>:<ファイル内の位置>" (そのファイルの何件目から返すか)
+        start_key, start_index = "", 0
+        if cursor is not None:
+            start_key, _, index = cursor.rpartition(":")
+            try:
+                if not start_key.startswith("dt="):
+                    raise ValueError(cursor)
+                start_index = int(index)
+                archived_from = max(archived_from, date.fromisoformat(start_key[3:13]))
+            except ValueError:
+                raise InvalidParameterError("cursor", cursor, "Invalid cursor") from None
+
+        tasks: List[Task] = []
+        day = archived_from
+        while day <= archived_to:
+            # 範囲内の日付のパーティションだけを一覧する
+            for key in sorted(self._list_keys(f"dt={day:%Y-%m-%d}/")):
+                if key < start_key:
+                    continue
+                skip = start_index if key == start_key else 0
+                for index, task in enumerate(self._read_tasks(key)):
+                    if index < skip:
+                        continue
+                    if len(tasks) == limit:
+                        return tasks, f"{key}:{index}"
+                    tasks.append(task)
+            day += timedelta(days=1)
+        return tasks, None
+
+    def get_archived_task(self, task_id: str) -> Task:
+        try:
+            UUID(task_id)
+        except ValueError:
+            raise DataNotFoundError(resource_name="Task") from None
+        key = self._get(f"{INDEX_PREFIX}{task_id}")
+        if key is not None:
+            for task in self._read_tasks(key.decode("utf-8")):
+                if str(task.id) == task_id:
+                    return task
+        raise DataNotFoundError(resource_name="Task")
+
+    def _read_tasks(self, key: str) -> Iterator[Task]:
+        body = self._get(key)
+        if body is None:
+            return
+        for line in gzip.decompress(body).decode("utf-8").splitlines():
+            if line:
+                yield Task.model_validate_json(line)
+
+    @abstractmethod
+    def _put(self, key: str, body: bytes) -> None:
+        pass
+
+    @abstractmethod
+    def _list_keys(self, partition: str) -> Iterator[str]:
+        """パーティション ("dt=YYYY-MM-DD/") に含まれるファイルのキーを返します"""
+
+    @abstractmethod
+    def _get(self, key: str) -> Optional[bytes]:
+        """キーの内容を返します。存在しない場合は None"""
+
+
+class LocalTaskArchive(PartitionedTaskArchive):
+    """ローカルディレクトリを保存先とするアーカイブ (テストやローカル実行用)"""
+
+    def __init__(self, root: str):
+        self.root = Path(root)
+
+    def _put(self, key: str, body: bytes) -> None:
+        path = self.root / key
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(path.name + ".tmp")
+        tmp_path.write_bytes(body)
+        os.replace(tmp_path, path)
+
+    def _list_keys(self, partition: str) -> Iterator[str]:
+        directory = self.root / partition
+        if not directory.exists():
+            return
+        for path in directory.glob(f"*{ARCHIVE_SUFFIX}"):
+            yield path.relative_to(self.root).as_posix()
+
+    def _get(self, key: str) -> Optional[bytes]:
+        try:
+            return (self.root / key).read_bytes()
+        except FileNotFoundError:
+            return None
+
+
+class S3TaskArchive(PartitionedTaskArchive):
+    def __init__(self, bucket: str, prefix: str = "tasks/"):
+        self.s3 = boto3.client("s3")
+        self.bucket = bucket
+        self.prefix = prefix
+
+    def _put(self, key: str, body: bytes) -> None:
+        try:
+            self.s3.put_object(Bucket=self.bucket, Key=self.prefix + key, Body=body)
+        except ClientError as e:
+            logger.exception("Failed to write archive %s", key)
+            raise DataAccessError(f"Failed to write archive {key}: {e}") from e
+
+    def _list_keys(self, partition: str) -> Iterator[str]:
+        try:
+            paginator = self.s3.get_paginator("list_objects_v2")
+            for page in paginator.paginate(Bucket=self.bucket, Prefix=self.prefix + partition):
+                for obj in page.get("Contents", []):
+                    if obj["Key"].endswith(ARCHIVE_SUFFIX):
+                        yield obj["Key"][len(self.prefix) :]
+        except ClientError as e:
+            logger.exception("Failed to list archives")
+            raise DataAccessError(f"Failed to list archives: {e}") from e
+
+    def _get(self, key: str) -> Optional[bytes]:
+        try:
+            return self.s3.get_object(Bucket=self.bucket, Key=self.prefix + key)["Body"].read()
+        except ClientError as e:
+            if e.response["Error"]["Code"] == "NoSuchKey":
+                return None
+            logger.exception("Failed to read archive %s", key)
+            raise DataAccessError(f"Failed to read archive {key}: {e}") from e
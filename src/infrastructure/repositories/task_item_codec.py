@@ -0,0 +1,186 @@
+"""
+タスクと DynamoDB アイテムの相互変換
+
+アイテムの読み書きの容量 (RCU/WCU) はアイテムのサイズで決まるため、次のように詰めて保存します。
+
+- status / priority は列挙値の名前ではなく小さな整数コード (N) で保存する
+- title / description は UTF-8 で compress_threshold バイト以上あり、圧縮して小さくなる場合のみ
+  zlib で圧縮したバイナリ (B) で保存する
+
+読み取り時は値の型で判別するため、この形式を導入する前に書かれたアイテム (文字列のまま) もそのまま読めます。
+コードは保存済みのデータの意味を決めるため、既存の値を変えないこと (追加のみ可)。
+
+decode_task_attribute_values は低レベルクライアントの応答 ({"S": ...} 形式) を直接読む高速版です。
+Task の属性だけを型ごとの汎用変換 (数値の Decimal 化など) なしで取り出し、検証は1回の model_validate に任せます。
+pydantic v2 では検証が Rust で行われるため、Python で属性を設定する model_construct より速くなります。
+"""
+
+import math
+import zlib
+from decimal import Decimal
+from typing import Any, Optional, Union
+
+from boto3.dynamodb.types import Binary, TypeDeserializer
+
+from ...domains.models.task import Task, TaskPriority, TaskStatus
+
+STATUS_CODES = {
+    TaskStatus.TODO: 0,
+    TaskStatus.IN_PROGRESS: 1,
+    TaskStatus.DONE: 2,
+}
+PRIORITY_CODES = {
+    TaskPriority.LOW: 0,
+    TaskPriority.MEDIUM: 1,
+    TaskPriority.HIGH: 2,
+    TaskPriority.URGENT: 3,
+}
+_STATUS_BY_CODE = {code: status for status, code in STATUS_CODES.items()}
+_PRIORITY_BY_CODE = {code: priority for priority, code in PRIORITY_CODES.items()}
+
+# 圧縮の対象にする属性
+TEXT_ATTRIBUTES = ("title", "description")
+
+# これ未満のテキストは圧縮しない (zlib のヘッダー分で逆に大きくなりやすく、CPU も使うため)
+DEFAULT_COMPRESS_THRESHOLD = 512
+
+
+def encode_text(value: Optional[str], compress_threshold: int = DEFAULT_COMPRESS_THRESHOLD) -> Union[str, bytes, None]:
+    if value is None:
+        return None
+    raw = value.encode("utf-8")
+    if len(raw) < compress_threshold:
+        return value
+    compressed = zlib.compress(raw)
+    return compressed if len(compressed) < len(raw) else value
+
+
+def decode_text(value) -> Optional[str]:
+    if isinstance(value, Binary):
+        value = value.value
+    if isinstance(value, (bytes, bytearray)):
+        return zlib.decompress(value).decode("utf-8")
+    return value
+
+
+def _decode_enum(value, by_code: dict):
+    if isinstance(value, str):
+        # 形式の導入前に書かれたアイテム
+        return value
+    # 未知のコードはそのまま渡し、Task の検証エラーにする
+    return by_code.get(int(value), value)
+
+
+def item_size(item: dict) -> int:
+    """
+    DynamoDB の計算方法 (属性名 + 値のバイト数) でアイテムのサイズを見積もります。
+
+    :param item: アイテム (boto3 の resource で扱う形式)
+    :return: バイト数
+    """
+    return sum(len(name.encode("utf-8")) + _value_size(value) for name, value in item.items())
+
+
+def _value_size(value) -> int:
+    if value is None or isinstance(value, bool):
+        return 1
+    if isinstance(value, str):
+        return len(value.encode("utf-8"))
+    if isinstance(value, Binary):
+        return len(value.value)
+    if isinstance(value, (bytes, bytearray)):
+        return len(value)
+    if isinstance(value, (int, Decimal)):
+        digits = len(str(abs(value)).replace(".", "").strip("0")) or 1
+        return math.ceil(digits / 2) + 1
+    if isinstance(value, dict):
+        return 3 + sum(len(k.encode("utf-8")) + 1 + _value_size(v) for k, v in value.items())
+    if isinstance(value, (list, set)):
+        return 3 + sum(1 + _value_size(v) for v in value)
+    raise TypeError(f"Unsupported attribute value: {type(value)}")
+
+
+def encode_task_attributes(task: Task, compress_threshold: int = DEFAULT_COMPRESS_THRESHOLD) -> dict:
+    """
+    タスクの属性のうち、保存形式が Python の値と異なるものを変換します。
+
+    :param task: タスク
+    :param compress_threshold: 圧縮するテキストの最小バイト数
+    :return: 属性名と保存する値の辞書 (TEXT_ATTRIBUTES と status / priority)
+    """
+    attributes: dict[str, Any] = {
+        name: encode_text(getattr(task, name), compress_threshold) for name in TEXT_ATTRIBUTES
+    }
+    attributes["status"] = STATUS_CODES[task.status]
+    attributes["priority"] = PRIORITY_CODES[task.priority]
+    return attributes
+
+
+def decode_task_item(item: dict) -> Task:
+    """
+    DynamoDB から読み取ったアイテムをタスクに変換します。
+
+    :param item: アイテム (boto3 の resource / TypeDeserializer で変換したもの)
+    :return: タスク
+    :raises pydantic.ValidationError: タスクとして解釈できない場合
+    """
+    decoded = dict(item)
+    for name in TEXT_ATTRIBUTES:
+        if name in decoded:
+            decoded[name] = decode_text(decoded[name])
+    if "status" in decoded:
+        decoded["status"] = _decode_enum(decoded["status"], _STATUS_BY_CODE)
+    if "priority" in decoded:
+        decoded["priority"] = _decode_enum(decoded["priority"], _PRIORITY_BY_CODE)
+    return Task(**decoded)
+
+
+_deserializer = TypeDeserializer()
+
+
+def _fast_text(value: dict) -> Optional[str]:
+    if "S" in value:
+        return value["S"]
+    if "B" in value:
+        return zlib.decompress(value["B"]).decode("utf-8")
+    if value.get("NULL"):
+        return None
+    raise KeyError(value)
+
+
+def _fast_enum(by_code: dict):
+    def decode(value: dict):
+        if "N" in value:
+            return by_code.get(int(value["N"]), value["N"])
+        return value["S"]
+
+    return decode
+
+
+# Task の属性ごとの変換。sync_key や ttl など Task に無い属性は読まない
+_FAST_DECODERS = {
+    "id": lambda value: value["S"],
+    "title": _fast_text,
+    "description": _fast_text,
+    "due_date": _fast_text,
+    "status": _fast_enum(_STATUS_BY_CODE),
+    "priority": _fast_enum(_PRIORITY_BY_CODE),
+    "updated_at": lambda value: value["S"],
+    "deleted": lambda value: value["BOOL"],
+}
+
+
+def decode_task_attribute_values(item: dict) -> Task:
+    """
+    低レベルクライアントが返すアイテムを、汎用の TypeDeserializer を通さずにタスクにします。
+
+    :param item: アイテム (属性名と {"S": ...} 形式の値の辞書)
+    :return: タスク
+    :raises pydantic.ValidationError: タスクとして解釈できない場合
+    """
+    try:
+        fields = {name: decode(item[name]) for name, decode in _FAST_DECODERS.items() if name in item}
+    except (KeyError, ValueError, zlib.error):
+        # 想定外の型の属性は通常の変換で検証し、ValidationError などの詳しいエラーにする
+        return decode_task_item({name: _deserializer.deserialize(value) for name, value in item.items()})
+    return Task.model_validate(fields)
@@ -1,29 +1,110 @@
-import logging
+import asyncio
+import time
+import zlib
+from datetime import datetime, timezone
+from typing import Any, Iterator, Optional
 
 import boto3
+from boto3.dynamodb.conditions import Attr, Key
 from botocore.exceptions import ClientError, EndpointConnectionError
 
+from ...core.logger import get_logger
+from ...core.metrics import instrument_boto3_client, instrumented
 from ...domains.interfaces.task_repository import ITaskRepository
+from ...domains.models.archive import SECONDS_PER_DAY, ArchivePolicy
 from ...domains.models.task import Task
-from ...exceptions.errors import DataAccessError, DataNotFoundError, InvalidParameterError
+from ...exceptions.errors import (
+    DataAccessError,
+    DataConflictError,
+    DataNotFoundError,
+    InvalidParameterError,
+    SyncTokenExpiredError,
+)
+from .single_flight import AsyncSingleFlight, SingleFlight, SingleFlightStats
+from .task_item_codec import (
+    DEFAULT_COMPRESS_THRESHOLD,
+    decode_task_attribute_values,
+    decode_task_item,
+    encode_task_attributes,
+)
 
-logger = logging.getLogger(__name__)
-logger.setLevel(logging.ERROR)
+logger = get_logger(__name__)
+
+# DynamoDB の TTL に設定している属性名
+TTL_ATTRIBUTE = "ttl"
+
+# アイテムに適用済みの移行のバージョン (src/infrastructure/migrations を参照)。無い場合は 0
+SCHEMA_VERSION_ATTRIBUTE = "schema_version"
+
+# 差分同期用の GSI。パーティションキー sync_shard (N)、ソートキー sync_key (S)
+SYNC_INDEX = "sync-index"
+# 書き込みを分散させるパーティション数。既存データの sync_shard が変わるため、運用開始後は変更しないこと
+SYNC_SHARDS = 4
+
+
+def sync_shard(task_id: str) -> int:
+    return zlib.crc32(task_id.encode("utf-8")) % SYNC_SHARDS
+
+
+def sync_key(updated_at: datetime, task_id: str) -> str:
+    """変更順に並ぶ一意なソートキー (更新時刻のミリ秒 + ID)"""
+    return f"{int(updated_at.timestamp() * 1000):013d}#{task_id}"
 
 
 class TaskDynamoDBRepository(ITaskRepository):
-    def __init__(self, table_name: str):
+    def __init__(
+        self,
+        table_name: str,
+        archive_policy: Optional[ArchivePolicy] = None,
+        tombstone_retention_days: int = 30,
+        compress_threshold: int = DEFAULT_COMPRESS_THRESHOLD,
+        fast_reads: bool = False,
+        sync_safety_window_seconds: float = 5.0,
+    ):
         self.dynamodb = boto3.resource("dynamodb")
         self.table = self.dynamodb.Table(table_name)
+        instrument_boto3_client(self.table.meta.client)
+        # resource の meta.client には属性を変換するフックが登録されるため、低レベル経路には別のクライアントを使う
+        self.client = boto3.client("dynamodb")
+        instrument_boto3_client(self.client)
+        # True の場合、一覧取得は低レベルクライアントの応答から直接タスクを組み立てる
+        self.fast_reads = fast_reads
+        # 指定された場合、完了したタスクに TTL を設定してテーブルから退避させる
+        self.archive_policy = archive_policy
+        # 削除の墓標を残す日数。これより古い同期位置からの差分は返せない
+        self.tombstone_retention_days = tombstone_retention_days
+        # 書き込み時刻の時計のずれと GSI の反映遅れの上限。同期位置はこの秒数より前までしか進めない
+        self.sync_safety_window_seconds = sync_safety_window_seconds
+        # これ以上のバイト数の title / description は圧縮して保存する (task_item_codec を参照)
+        self.compress_threshold = compress_threshold
+        # 同一キー・同一ページへの同時読み取りを1回のDynamoDB呼び出しにまとめる
+        self._flight = SingleFlight()
+        self._async_flight = AsyncSingleFlight()
 
+    def coalescing_stats(self) -> dict[str, SingleFlightStats]:
+        """
+        読み取りコアレッシングの統計情報を取得します。
+
+        :return: スレッド経路 ("sync") と asyncio 経路 ("async") ごとの統計情報
+        """
+        return {"sync": self._flight.stats(), "async": self._async_flight.stats()}
+
+    @instrumented("list_tasks")
     def list_tasks(self) -> list[Task]:
+        return self._list_tasks(coalesce=True)
+
+    def _list_tasks(self, coalesce: bool) -> list[Task]:
         tasks = []
+        if self.fast_reads:
+            scan_page, decode = self._scan_page_fast, decode_task_attribute_values
+        else:
+            scan_page, decode = self._scan_page, decode_task_item
         try:
-            response = self.table.scan()
-            tasks.extend([Task(**item) for item in response.get("Items", [])])
+            response = scan_page(None, coalesce)
+            tasks.extend([decode(item) for item in response.get("Items", [])])
             while "LastEvaluatedKey" in response:
-                response = self.table.scan(ExclusiveStartKey=response["LastEvaluatedKey"])
-                tasks.extend([Task(**item) for item in response.get("Items", [])])
+                response = scan_page(response["LastEvaluatedKey"], coalesce)
+                tasks.extend([decode(item) for item in response.get("Items", [])])
             return tasks
         except EndpointConnectionError as e:
             logger.exception("Failed to connect to DynamoDB endpoint.")
@@ -33,23 +114,170 @@ class TaskDynamoDBRepository(ITaskRepository):
             if error_code == "ProvisionedThroughputExceededException":
                 logger.exception("DynamoDB throughput limit exceeded.")
                 raise DataAccessError("DynamoDB throughput limit exceeded.") from e
-            logger.exception(f"Failed to list tasks: {e}")
+            logger.exception("Failed to list tasks.")
             raise DataAccessError(f"Failed to list tasks: {e}") from e
 
+    def scan_segment(self, segment: int, total_segments: int) -> Iterator[list[Task]]:
+        """
+        並列スキャンの1区分を低レベルクライアントでページごとに読み出します (スナップショットの書き出し用)。
+
+        :param segment: 読み出す区分 (0 から total_segments - 1)
+        :param total_segments: 区分の数
+        :return: 削除済みを除くタスクのページのイテレータ
+        :raises DataAccessError: DynamoDBへのアクセスに失敗した場合
+        """
+        params = {
+            "TableName": self.table.name,
+            "Segment": segment,
+            "TotalSegments": total_segments,
+            "FilterExpression": "attribute_not_exists(#deleted)",
+            "ExpressionAttributeNames": {"#deleted": "deleted"},
+        }
+        try:
+            while True:
+                response = self.client.scan(**params)
+                yield [decode_task_attribute_values(item) for item in response.get("Items", [])]
+                if "LastEvaluatedKey" not in response:
+                    return
+                params["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+        except ClientError as e:
+            logger.exception("Failed to scan segment %d/%d.", segment, total_segments)
+            raise DataAccessError(f"Failed to scan tasks: {e}") from e
+
+    @instrumented("create_task")
     def create_task(self, task: Task):
         if not task.id:  # 例: パーティションキーが必須の場合
             logger.error("Task ID is required.")
             raise InvalidParameterError("Task ID", task.id, "Task ID is required.")
         try:
-            inp = task.model_dump()
-            inp["id"] = str(task.id)
-            inp["status"] = task.status.value
-            inp["priority"] = task.priority.value
-            self.table.put_item(Item=inp)
+            self.table.put_item(Item=self._to_item(task))
         except ClientError as e:
-            logger.exception(f"Failed to create task: {e}")
+            logger.exception("Failed to create task %s.", task.id)
             raise DataAccessError(f"Failed to create task: {e}") from e
 
+    @instrumented("batch_create_tasks")
+    def batch_create_tasks(self, tasks: list[Task]) -> None:
+        """
+        BatchWriteItem で複数のタスクをまとめて作成します。
+
+        未処理アイテムの再送は batch_writer が行います。スレッドごとに独立した
+        batch_writer を使うため、複数スレッドから同時に呼び出せます。
+
+        :param tasks: 作成するタスクのリスト
+        :raises InvalidParameterError: タスクIDが無効な場合
+        :raises DataAccessError: DynamoDBへのアクセスに失敗した場合
+        """
+        for task in tasks:
+            if not task.id:
+                logger.error("Task ID is required.")
+                raise InvalidParameterError("Task ID", task.id, "Task ID is required.")
+        try:
+            with self.table.batch_writer() as batch:
+                for task in tasks:
+                    batch.put_item(Item=self._to_item(task))
+        except ClientError as e:
+            logger.exception("Failed to create %d tasks in batch.", len(tasks))
+            raise DataAccessError(f"Failed to create tasks in batch: {e}") from e
+
+    @instrumented("write_tombstones")
+    def write_tombstones(self, tasks: list[Task]) -> None:
+        """
+        テーブルから退避されたタスクの墓標を書き込み、差分同期のクライアントに削除として伝えます。
+
+        :param tasks: 墓標にするタスク
+        :raises DataAccessError: DynamoDBへのアクセスに失敗した場合
+        """
+        now = datetime.now(timezone.utc)
+        try:
+            with self.table.batch_writer() as batch:
+                for task in tasks:
+                    batch.put_item(Item=self._to_item(task.model_copy(update={"deleted": True, "updated_at": now})))
+        except ClientError as e:
+            logger.exception("Failed to write %d tombstones.", len(tasks))
+            raise DataAccessError(f"Failed to write tombstones: {e}") from e
+
+    def scan_items(
+        self, segment: int, total_segments: int, start_key: Optional[dict] = None, limit: Optional[int] = None
+    ) -> tuple[list[dict], Optional[dict], float]:
+        """
+        並列スキャンの1区分から、保存形式のままのアイテム (墓標を含む) を1ページ読み出します (移行用)。
+
+        :param segment: 読み出す区分 (0 から total_segments - 1)
+        :param total_segments: 区分の数
+        :param start_key: 前のページの LastEvaluatedKey
+        :param limit: 1ページで読むアイテム数の上限
+        :return: (アイテム, 次のページの開始キー (最後のページでは None), 消費した RCU)
+        :raises DataAccessError: DynamoDBへのアクセスに失敗した場合
+        """
+        params = {"Segment": segment, "TotalSegments": total_segments, "ReturnConsumedCapacity": "TOTAL"}
+        if start_key is not None:
+            params["ExclusiveStartKey"] = start_key
+        if limit is not None:
+            params["Limit"] = limit
+        try:
+            response = self.table.scan(**params)
+        except ClientError as e:
+            logger.exception("Failed to scan segment %d/%d.", segment, total_segments)
+            raise DataAccessError(f"Failed to scan items: {e}") from e
+        consumed = response.get("ConsumedCapacity", {}).get("CapacityUnits", 0.0)
+        return response.get("Items", []), response.get("LastEvaluatedKey"), float(consumed)
+
+    def replace_item(self, item: dict, original: dict) -> float:
+        """
+        読み取った時点から変更されていない場合だけ、アイテムを置き換えます (移行用)。
+
+        変更の有無は schema_version と updated_at で判定します。アプリケーションからの書き込みは
+        必ず updated_at を更新するため、移行中に更新・削除されたアイテムを上書きしません。
+
+        :param item: 置き換え後のアイテム
+        :param original: scan_items で読み取ったアイテム
+        :return: 消費した WCU
+        :raises DataConflictError: アイテムが読み取り後に変更または削除されていた場合
+        :raises DataAccessError: DynamoDBへのアクセスに失敗した場合
+        """
+        condition = Attr("id").exists()
+        for name in (SCHEMA_VERSION_ATTRIBUTE, "updated_at"):
+            condition &= Attr(name).eq(original[name]) if name in original else Attr(name).not_exists()
+        try:
+            response = self.table.put_item(Item=item, ConditionExpression=condition, ReturnConsumedCapacity="TOTAL")
+        except ClientError as e:
+            if e.response["Error"]["Code"] == "ConditionalCheckFailedException":
+                raise DataConflictError(f"Task with ID {item['id']}") from e
+            logger.exception("Failed to replace item %s.", item["id"])
+            raise DataAccessError(f"Failed to replace item: {e}") from e
+        return float(response.get("ConsumedCapacity", {}).get("CapacityUnits", 0.0))
+
+    def _to_item(self, task: Task) -> dict:
+        item = task.model_dump(exclude={"updated_at", "deleted"})
+        item["id"] = str(task.id)
+        item.update(encode_task_attributes(task, self.compress_threshold))
+        item.update(self._sync_attributes(item["id"], task.updated_at or datetime.now(timezone.utc)))
+        if task.deleted:
+            item["deleted"] = True
+            item[TTL_ATTRIBUTE] = self._tombstone_expires_at()
+        else:
+            expires_at = self._expires_at(task)
+            if expires_at is not None:
+                item[TTL_ATTRIBUTE] = expires_at
+        return item
+
+    @staticmethod
+    def _sync_attributes(task_id: str, updated_at: datetime) -> dict:
+        return {
+            "updated_at": updated_at.isoformat(),
+            "sync_key": sync_key(updated_at, task_id),
+            "sync_shard": sync_shard(task_id),
+        }
+
+    def _tombstone_expires_at(self) -> int:
+        return int(datetime.now(timezone.utc).timestamp()) + self.tombstone_retention_days * SECONDS_PER_DAY
+
+    def _expires_at(self, task: Task) -> Optional[int]:
+        if self.archive_policy is None:
+            return None
+        return self.archive_policy.expires_at(task)
+
+    @instrumented("get_task")
     def get_task(self, task_id: str) -> Task:
         """
         指定されたタスクIDのタスクを取得します。
@@ -60,20 +288,169 @@ class TaskDynamoDBRepository(ITaskRepository):
         :raises DataNotFoundError: 指定されたタスクが存在しない場合
         :raises DataAccessError: DynamoDBへのアクセスに失敗した場合
         """
+        self._check_task_id(task_id)
+        return self._flight.do(("get_task", task_id), lambda: self._fetch_task(task_id))
+
+    # 以下の asyncio 版は ITaskRepository には含まれない内部API です。ルート (TaskManager 経由の同期呼び出し) は
+    # 使っておらず、イベントループ上から直接このリポジトリを使う処理向けに用意しています。
+    # スレッド経路の SingleFlight は通らないため、まとめられた呼び出しは "async" の統計にだけ数えられます。
+
+    async def get_task_async(self, task_id: str) -> Task:
+        """
+        get_task の asyncio 版です。同時に要求された同じタスクの取得は1回にまとめられます。
+
+        :param task_id: 取得するタスクのID
+        :return: 取得したタスク
+        """
+        self._check_task_id(task_id)
+        return await self._async_flight.do(("get_task", task_id), lambda: asyncio.to_thread(self._fetch_task, task_id))
+
+    async def list_tasks_async(self) -> list[Task]:
+        """
+        list_tasks の asyncio 版です。同時に要求された一覧取得は1回にまとめられます。
+
+        :return: タスクのリスト
+        """
+        return await self._async_flight.do(("list_tasks",), lambda: asyncio.to_thread(self._list_tasks, False))
+
+    @staticmethod
+    def _check_task_id(task_id: str) -> None:
         if not task_id:
             logger.error("Task ID is required for retrieval.")
             raise InvalidParameterError("Task ID", task_id, "Task ID is required for retrieval.")
+
+    def _fetch_task(self, task_id: str) -> Task:
+        logger.debug("Fetching task %s.", task_id)
         try:
             response = self.table.get_item(Key={"id": task_id})
             item = response.get("Item")
-            if not item:
-                logger.error(f"Task with ID {task_id} not found.")
+            if not item or item.get("deleted"):
+                logger.error("Task with ID %s not found.", task_id)
                 raise DataNotFoundError(f"Task with ID {task_id} not found.")
-            return Task(**item)
+            return decode_task_item(item)
         except ClientError as e:
-            logger.exception(f"Failed to retrieve task with ID {task_id}: {e}")
+            logger.exception("Failed to retrieve task with ID %s.", task_id)
             raise DataAccessError(f"Failed to retrieve task with ID {task_id}: {e}") from e
 
+    def _scan_page(self, start_key: Optional[dict], coalesce: bool = True) -> dict:
+        # coalesce の場合、同じ開始キーのページは同時に1回だけ取得する
+        logger.debug("Scanning tasks from %s.", start_key)
+        # 削除済みの墓標は差分同期でのみ返す
+        params: dict[str, Any] = {"FilterExpression": Attr("deleted").not_exists()}
+        page_key = ("scan", None)
+        if start_key is not None:
+            page_key = ("scan", tuple(sorted(start_key.items())))
+            params["ExclusiveStartKey"] = start_key
+        if not coalesce:
+            return self.table.scan(**params)
+        return self._flight.do(page_key, lambda: self.table.scan(**params))
+
+    def _scan_page_fast(self, start_key: Optional[dict], coalesce: bool = True) -> dict:
+        # _scan_page と同じページを低レベルクライアントで取得する (アイテムは {"S": ...} 形式のまま)
+        logger.debug("Scanning tasks from %s.", start_key)
+        params = {
+            "TableName": self.table.name,
+            "FilterExpression": "attribute_not_exists(#deleted)",
+            "ExpressionAttributeNames": {"#deleted": "deleted"},
+        }
+        page_key = ("fast_scan", None)
+        if start_key is not None:
+            page_key = ("fast_scan", start_key["id"]["S"])
+            params["ExclusiveStartKey"] = start_key
+        if not coalesce:
+            return self.client.scan(**params)
+        return self._flight.do(page_key, lambda: self.client.scan(**params))
+
+    @instrumented("list_changes")
+    def list_changes(self, since: Optional[str], limit: int) -> tuple[list[Task], Optional[str], bool]:
+        """
+        since より後に作成・更新・削除されたタスクを、差分同期用の GSI から変更順に取得します。
+
+        各パーティションから最大 limit 件ずつ取得して併合するため、読み取り量は変更件数に比例します。
+        直近 sync_safety_window_seconds の変更は返しても位置を進めないため、次回も返されます。
+        変更を返し終えた場合は、変更が無くても位置をその手前まで進めます。
+
+        :param since: 前回返した位置 (None の場合は最初から)
+        :param limit: 取得する最大件数
+        :return: (削除済みの墓標を含むタスク, 次回の位置, さらに変更があるか)
+        :raises InvalidParameterError: since が不正な場合
+        :raises SyncTokenExpiredError: since が墓標の保持期間より古い場合
+        :raises DataAccessError: DynamoDBへのアクセスに失敗した場合
+        """
+        if since is not None:
+            self._check_sync_position(since)
+        return self._flight.do(("changes", since, limit), lambda: self._query_changes(since, limit))
+
+    def _check_sync_position(self, since: str) -> None:
+        try:
+            since_ms = int(since.split("#", 1)[0])
+        except ValueError as e:
+            raise InvalidParameterError("since", since, "Invalid sync position") from e
+        oldest_ms = (datetime.now(timezone.utc).timestamp() - self.tombstone_retention_days * SECONDS_PER_DAY) * 1000
+        if since_ms < oldest_ms:
+            raise SyncTokenExpiredError()
+
+    def _query_changes(self, since: Optional[str], limit: int) -> tuple[list[Task], Optional[str], bool]:
+        # sync_key の時刻は書き込んだサーバーの時計で決まり、GSI への反映も遅れるため、直近の変更は
+        # 既に返した位置より前に後から現れることがある。同期位置は sync_safety_window_seconds より前 (watermark)
+        # までしか進めず、それより新しい変更は次回も返す (クライアントは id と updated_at で重複を除く)
+        watermark = f"{int((time.time() - self.sync_safety_window_seconds) * 1000):013d}#"
+        start = min(since, watermark) if since is not None else None
+        settled, bound = self._query_sync_index(start, watermark, limit)
+        if bound is not None:
+            # 読み残したパーティションの続きは bound より後にしか無いため、bound までを確定した変更として返す
+            settled = [item for item in settled if item["sync_key"] <= bound]
+        page = settled[:limit]
+        has_more = bound is not None or len(settled) > limit
+        # 確定した変更を返し終えたら、変更が無くても位置を watermark まで進める
+        # (変更の無いテーブルを同期し続けるクライアントのトークンが、墓標の保持期間を過ぎて失効しないように)
+        if not has_more:
+            last = watermark
+        else:
+            last = str(page[-1]["sync_key"]) if page else start
+        if not has_more and len(page) < limit:
+            # 確定した変更を返し終えたら、窓の中の変更も返す (位置は進めない)
+            recent, _ = self._query_sync_index(watermark, None, limit - len(page))
+            page.extend(recent[: limit - len(page)])
+        return [decode_task_item(item) for item in page], last, has_more
+
+    def _query_sync_index(
+        self, after: Optional[str], until: Optional[str], limit: int
+    ) -> tuple[list[dict], Optional[str]]:
+        """
+        sync_key が after より後で until 以下の変更を、各パーティションから最大 limit 件ずつ取得して変更順に並べる
+
+        Query は limit 件に達する前に 1MB で打ち切られることもあるため、読み残したパーティションがある場合は
+        その最後に読んだ sync_key のうち最小のもの (bound) を返します。bound 以下のアイテムは漏れなく含まれます。
+
+        :return: (アイテム, bound。読み残したパーティションが無ければ None)
+        """
+        items = []
+        bound: Optional[str] = None
+        try:
+            for shard in range(SYNC_SHARDS):
+                condition = Key("sync_shard").eq(shard)
+                query_limit = limit
+                if after is not None and until is not None:
+                    # between は下限を含むため、after と同じキーの分を1件多く読む
+                    condition = condition & Key("sync_key").between(after, until)
+                    query_limit += 1
+                elif after is not None:
+                    condition = condition & Key("sync_key").gt(after)
+                elif until is not None:
+                    condition = condition & Key("sync_key").lte(until)
+                response = self.table.query(IndexName=SYNC_INDEX, KeyConditionExpression=condition, Limit=query_limit)
+                items.extend(item for item in response.get("Items", []) if item["sync_key"] != after)
+                if "LastEvaluatedKey" in response:
+                    last_read = str(response["LastEvaluatedKey"]["sync_key"])
+                    bound = last_read if bound is None else min(bound, last_read)
+        except ClientError as e:
+            logger.exception("Failed to list task changes after %s.", after)
+            raise DataAccessError(f"Failed to list task changes: {e}") from e
+        items.sort(key=lambda item: item["sync_key"])
+        return items, bound
+
+    @instrumented("update_task")
     def update_task(self, updated_task: Task):
         """
         タスクを更新します。
@@ -92,41 +469,69 @@ class TaskDynamoDBRepository(ITaskRepository):
             inp["id"] = str(updated_task.id)
             inp["status"] = updated_task.status.value
             inp["priority"] = updated_task.priority.value
+            encoded = encode_task_attributes(updated_task, self.compress_threshold)
+            sync_attributes = self._sync_attributes(
+                str(updated_task.id), updated_task.updated_at or datetime.now(timezone.utc)
+            )
+            update_expression = (
+                "SET #title = :title, #description = :description, "
+                "#due_date = :due_date, #status = :status, #priority = :priority, "
+                "#updated_at = :updated_at, #sync_key = :sync_key, #sync_shard = :sync_shard"
+            )
+            attribute_names = {
+                "#title": "title",
+                "#description": "description",
+                "#due_date": "due_date",
+                "#status": "status",
+                "#priority": "priority",
+                "#updated_at": "updated_at",
+                "#sync_key": "sync_key",
+                "#sync_shard": "sync_shard",
+                "#deleted": "deleted",
+            }
+            attribute_values = {
+                ":title": encoded["title"],
+                ":description": encoded["description"],
+                ":due_date": updated_task.due_date,
+                ":status": encoded["status"],
+                ":priority": encoded["priority"],
+                ":updated_at": sync_attributes["updated_at"],
+                ":sync_key": sync_attributes["sync_key"],
+                ":sync_shard": sync_attributes["sync_shard"],
+            }
+            if self.archive_policy is not None:
+                # 完了済みのまま更新された場合は最初に完了した時点の退避時刻を維持する
+                attribute_names["#ttl"] = TTL_ATTRIBUTE
+                expires_at = self._expires_at(updated_task)
+                if expires_at is not None:
+                    update_expression += ", #ttl = if_not_exists(#ttl, :ttl)"
+                    attribute_values[":ttl"] = expires_at
+                else:
+                    update_expression += " REMOVE #ttl"
             self.table.update_item(
                 Key={"id": str(updated_task.id)},
-                UpdateExpression=(
-                    "SET #title = :title, #description = :description, "
-                    "#due_date = :due_date, #status = :status, #priority = :priority"
-                ),
-                ExpressionAttributeNames={
-                    "#title": "title",
-                    "#description": "description",
-                    "#due_date": "due_date",
-                    "#status": "status",
-                    "#priority": "priority",
-                },
-                ExpressionAttributeValues={
-                    ":title": updated_task.title,
-                    ":description": updated_task.description,
-                    ":due_date": updated_task.due_date,
-                    ":status": updated_task.status.value,
-                    ":priority": updated_task.priority.value,
-                },
-                ConditionExpression="attribute_exists(id)",
+                UpdateExpression=update_expression,
+                ExpressionAttributeNames=attribute_names,
+                ExpressionAttributeValues=attribute_values,
+                ConditionExpression="attribute_exists(id) AND attribute_not_exists(#deleted)",
             )
             return updated_task
         except ClientError as e:
             if e.response["Error"]["Code"] == "ConditionalCheckFailedException":
-                logger.exception(f"Task with ID {updated_task.id} not found.")
+                logger.error("Task with ID %s not found.", updated_task.id)
                 raise DataNotFoundError(f"Task with ID {updated_task.id} not found.") from e
 
-            logger.exception(f"Failed to update task with ID {updated_task.id}: {e}")
+            logger.exception("Failed to update task with ID %s.", updated_task.id)
             raise DataAccessError(f"Failed to update task with ID {updated_task.id}: {e}") from e
 
+    @instrumented("delete_task")
     def delete_task(self, task_id: str) -> None:
         """
         指定されたタスクIDのタスクを削除します。
 
+        差分同期のクライアントに削除を伝えるため、アイテムは墓標 (deleted) として
+        tombstone_retention_days の間残り、その後 TTL で消えます。
+
         :param task_id: 削除するタスクのID
         :raises InvalidParameterError: タスクIDが無効な場合
         :raises DataNotFoundError: 指定されたタスクが存在しない場合
@@ -136,14 +541,33 @@ class TaskDynamoDBRepository(ITaskRepository):
             logger.error("Task ID is required for deletion.")
             raise InvalidParameterError("Task ID", task_id, "Task ID is required for deletion.")
         try:
-            self.table.delete_item(
+            sync_attributes = self._sync_attributes(task_id, datetime.now(timezone.utc))
+            self.table.update_item(
                 Key={"id": task_id},
-                ConditionExpression="attribute_exists(id)",
+                UpdateExpression=(
+                    "SET #deleted = :deleted, #updated_at = :updated_at, #sync_key = :sync_key, "
+                    "#sync_shard = :sync_shard, #ttl = :ttl"
+                ),
+                ExpressionAttributeNames={
+                    "#deleted": "deleted",
+                    "#updated_at": "updated_at",
+                    "#sync_key": "sync_key",
+                    "#sync_shard": "sync_shard",
+                    "#ttl": TTL_ATTRIBUTE,
+                },
+                ExpressionAttributeValues={
+                    ":deleted": True,
+                    ":updated_at": sync_attributes["updated_at"],
+                    ":sync_key": sync_attributes["sync_key"],
+                    ":sync_shard": sync_attributes["sync_shard"],
+                    ":ttl": self._tombstone_expires_at(),
+                },
+                ConditionExpression="attribute_exists(id) AND attribute_not_exists(#deleted)",
             )
         except ClientError as e:
             if e.response["Error"]["Code"] == "ConditionalCheckFailedException":
-                logger.exception(f"Task with ID {task_id} not found.")
+                logger.error("Task with ID %s not found.", task_id)
                 raise DataNotFoundError(f"Task with ID {task_id} not found.") from e
 
-            logger.exception(f"Failed to delete task with ID {task_id}: {e}")
+            logger.exception("Failed to delete task with ID %s.", task_id)
             raise DataAccessError(f"Failed to delete task with ID {task_id}: {e}") from e
@@ -1,8 +1,20 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 
+from .core.logger import refresh_sampling
+from .core.metrics import metrics
 from .routers import task
 
 app = FastAPI(title="Serverless FastAPI with Cognito")
 
 # app.include_router(user.router)
 app.include_router(task.router)
+
+
+@app.middleware("http")
+async def emit_metrics(request: Request, call_next):
+    # リクエストごとに DEBUG ログのサンプリングを抽選し、終了時にメトリクスを EMF で出力する
+    refresh_sampling()
+    try:
+        return await call_next(request)
+    finally:
+        metrics.flush()
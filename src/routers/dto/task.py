@@ -3,6 +3,8 @@ from uuid import UUID
 
 from pydantic import BaseModel
 
+from ...domains.models.task import Task
+
 
 class CreateTaskRequest(BaseModel):
     title: str
@@ -17,3 +19,34 @@ class UpdateTaskRequest(BaseModel):
     due_date: Optional[str] = None
     status: str
     priority: str
+
+
+class TaskImportRowError(BaseModel):
+    row: int
+    message: str
+
+
+class TaskImportReport(BaseModel):
+    processed: int = 0
+    imported: int = 0
+    failed: int = 0
+    errors: list[TaskImportRowError] = []
+    errors_truncated: bool = False
+    # 入力を最後まで読めずに途中で打ち切った場合 True。それまでに読んだ行は取り込み済み
+    aborted: bool = False
+    abort_reason: Optional[str] = None
+
+
+class TaskChangesResponse(BaseModel):
+    # 作成・更新されたタスクと、deleted=True の墓標を変更順に含む
+    # 直近の変更は次回も含まれるため、クライアントは id と updated_at で重複を除く
+    changes: list[Task] = []
+    # 次回の since に指定するトークン
+    next_token: Optional[str] = None
+    has_more: bool = False
+
+
+class ArchivedTasksResponse(BaseModel):
+    tasks: list[Task] = []
+    # 次のページを取得する場合に cursor に指定する値 (最後のページでは None)
+    next_cursor: Optional[str] = None
@@ -0,0 +1,27 @@
+from typing import Optional
+
+# Server-Sent Events のメッセージ組み立て
+
+
+def sse_message(data: str, event: Optional[str] = None, id: Optional[str] = None) -> str:
+    lines = []
+    if id is not None:
+        lines.append(f"id: {id}")
+    if event is not None:
+        lines.append(f"event: {event}")
+    lines.extend(f"data: {line}" for line in data.splitlines() or [""])
+    return "\n".join(lines) + "\n\n"
+
+
+def sse_comment(text: str) -> str:
+    # コメント行はクライアントに無視されるため、接続維持のハートビートに使う
+    return f": {text}\n\n"
+
+
+def sse_id(id: str) -> str:
+    # data の無いメッセージはイベントとして配信されないが、再接続時に送られる Last-Event-ID は更新される
+    return f"id: {id}\n\n"
+
+
+def sse_retry(milliseconds: int) -> str:
+    return f"retry: {milliseconds}\n\n"
@@ -1,10 +1,29 @@
-from dto.task import CreateTaskRequest, UpdateTaskRequest
-from fastapi import APIRouter, Depends, HTTPException
+import asyncio
+import io
+import tempfile
+from datetime import date, datetime, timezone
+from typing import AsyncIterator, Dict, Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 
 from ..core.auth import get_current_user
+from ..core.config import get_settings
 from ..di.container import injector
+from ..domains.interfaces.task_event_bus import ITaskEventSubscription
 from ..domains.models.task import Task
+from ..exceptions.errors import InvalidParameterError, ServiceUnavailableError, SyncTokenExpiredError
 from ..usecase.task_handler import TaskManager
+from ..usecase.task_importer import ImportFormat, TaskImporter
+from .dto.task import (
+    ArchivedTasksResponse,
+    CreateTaskRequest,
+    TaskChangesResponse,
+    TaskImportReport,
+    UpdateTaskRequest,
+)
+from .sse import sse_comment, sse_id, sse_message, sse_retry
 
 router = APIRouter(prefix="/tasks", tags=["Tasks"])
 
@@ -13,11 +32,71 @@ def get_task_service() -> TaskManager:
     return injector.get(TaskManager)
 
 
+def get_task_importer() -> TaskImporter:
+    return injector.get(TaskImporter)
+
+
+IMPORT_FORMATS: Dict[str, ImportFormat] = {
+    "application/x-ndjson": "ndjson",
+    "application/jsonl": "ndjson",
+    "text/csv": "csv",
+}
+
+# これを超える取り込みデータはメモリではなく一時ファイルに退避する
+IMPORT_SPOOL_MAX_BYTES = 1024 * 1024
+
+# 切断されたクライアントが再接続するまでの待ち時間 (ミリ秒)
+SSE_RETRY_MILLISECONDS = 3000
+
+
+async def task_event_stream(
+    subscription: ITaskEventSubscription, heartbeat_seconds: float, max_duration_seconds: float
+) -> AsyncIterator[str]:
+    """
+    タスクの変更イベントを SSE として送り出す
+
+    max_duration_seconds を過ぎるか購読が打ち切られると終了し、クライアントは Last-Event-ID を付けて再接続します。
+    イベントが無い間もハートビートで位置 (id) を更新するため、再接続先では最後のハートビートの後から読み直せます。
+    取りこぼしがある場合は "reset" イベントを送るため、クライアントは一覧を取り直してください。
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + max_duration_seconds
+    sent_position = subscription.position
+    try:
+        yield sse_retry(SSE_RETRY_MILLISECONDS)
+        while not subscription.overflowed:
+            if subscription.lost:
+                subscription.lost = False
+                sent_position = subscription.position
+                yield sse_message("{}", event="reset", id=sent_position)
+                continue
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            event = await subscription.next_event(timeout=min(heartbeat_seconds, remaining))
+            if event is None:
+                if subscription.lost:
+                    continue
+                yield sse_comment("heartbeat")
+                position = subscription.position
+                if position is not None and position != sent_position:
+                    sent_position = position
+                    yield sse_id(position)
+                continue
+            sent_position = event.id
+            yield sse_message(event.model_dump_json(), event=event.type.value, id=event.id)
+    finally:
+        subscription.close()
+
+
 # routing section ==========================================================
 
 
 @router.get("/", response_model=list[Task])
-def list_tasks(service: TaskManager = Depends(get_task_service), user: dict = Depends(get_current_user)):
+def list_tasks(
+    service: TaskManager = Depends(get_task_service),
+    user: dict = Depends(get_current_user),
+):
     return service.list_tasks()
 
 
@@ -30,13 +109,84 @@ def create_task(
     return service.create_task(request)
 
 
+@router.post("/import", response_model=TaskImportReport)
+async def import_tasks(
+    request: Request,
+    importer: TaskImporter = Depends(get_task_importer),
+    user: dict = Depends(get_current_user),
+):
+    content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    fmt = IMPORT_FORMATS.get(content_type)
+    if fmt is None:
+        raise HTTPException(status_code=415, detail="Content-Type must be application/x-ndjson or text/csv")
+
+    with tempfile.SpooledTemporaryFile(max_size=IMPORT_SPOOL_MAX_BYTES) as buffer:
+        async for chunk in request.stream():
+            buffer.write(chunk)
+        buffer.seek(0)
+        stream = io.TextIOWrapper(buffer, encoding="utf-8", newline="")
+        return await run_in_threadpool(importer.import_stream, stream, fmt)
+
+
+@router.get("/changes", response_model=TaskChangesResponse)
+def list_task_changes(
+    since: Optional[str] = None,
+    limit: int = Query(default=100, ge=1, le=1000),
+    service: TaskManager = Depends(get_task_service),
+    user: dict = Depends(get_current_user),
+):
+    try:
+        return service.list_changes(since, limit)
+    except InvalidParameterError as e:
+        raise HTTPException(status_code=400, detail=e.message) from e
+    except SyncTokenExpiredError as e:
+        # クライアントは GET /tasks/ で全件を取り直し、since なしで同期をやり直す
+        raise HTTPException(status_code=410, detail=e.message) from e
+
+
+@router.get("/archived", response_model=ArchivedTasksResponse)
+def list_archived_tasks(
+    archived_from: Optional[date] = Query(default=None, alias="from"),
+    archived_to: Optional[date] = Query(default=None, alias="to"),
+    cursor: Optional[str] = None,
+    limit: int = Query(default=100, ge=1, le=1000),
+    service: TaskManager = Depends(get_task_service),
+    user: dict = Depends(get_current_user),
+):
+    # 省略時は当日 (UTC) に退避したタスク
+    archived_to = archived_to or datetime.now(timezone.utc).date()
+    archived_from = archived_from or archived_to
+    try:
+        return service.list_archived_tasks(archived_from, archived_to, cursor, limit)
+    except InvalidParameterError as e:
+        raise HTTPException(status_code=400, detail=e.message) from e
+    except ServiceUnavailableError as e:
+        raise HTTPException(status_code=503, detail=e.message) from e
+
+
+@router.get("/events", response_class=StreamingResponse)
+async def task_events(
+    last_event_id: Optional[str] = Header(default=None),
+    service: TaskManager = Depends(get_task_service),
+    user: dict = Depends(get_current_user),
+):
+    settings = get_settings()
+    subscription = service.subscribe_events(last_event_id or None)
+    return StreamingResponse(
+        task_event_stream(subscription, settings.sse_heartbeat_seconds, settings.sse_max_duration_seconds),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.get("/{task_id}", response_model=Task)
 def get_task(
     task_id: str,
+    include_archived: bool = False,
     service: TaskManager = Depends(get_task_service),
     user: dict = Depends(get_current_user),
 ):
-    return service.get_task(task_id)
+    return service.get_task(task_id, include_archived=include_archived)
 
 
 @router.put("/{task_id}", response_model=Task)
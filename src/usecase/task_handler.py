@@ -1,20 +1,65 @@
-from typing import List
+import base64
+import binascii
+import json
+from datetime import date, datetime, timezone
+from typing import List, Optional
 from uuid import UUID
 
+from ..domains.interfaces.task_archive import ITaskArchive
+from ..domains.interfaces.task_event_bus import ITaskEventBus, ITaskEventSubscription
 from ..domains.interfaces.task_repository import ITaskRepository
 from ..domains.models.task import Task, TaskPriority, TaskStatus
-from ..exceptions.errors import DataNotFoundError, InvalidParameterError
-from ..routers.dto.task import CreateTaskRequest, UpdateTaskRequest
+from ..domains.models.task_event import TaskEvent, TaskEventType
+from ..exceptions.errors import DataNotFoundError, InvalidParameterError, ServiceUnavailableError
+from ..routers.dto.task import ArchivedTasksResponse, CreateTaskRequest, TaskChangesResponse, UpdateTaskRequest
+
+SYNC_TOKEN_VERSION = 1
+
+# 1回のアーカイブ一覧で指定できる退避日の範囲 (日数)
+ARCHIVE_MAX_RANGE_DAYS = 31
+
+
+def encode_sync_token(position: str) -> str:
+    """リポジトリの変更位置を、クライアントに渡す不透明なトークンにする"""
+    payload = json.dumps({"v": SYNC_TOKEN_VERSION, "k": position}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_sync_token(token: str) -> str:
+    """
+    トークンからリポジトリの変更位置を取り出す
+
+    :raises InvalidParameterError: トークンが不正な場合
+    """
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)))
+        if payload["v"] != SYNC_TOKEN_VERSION or not isinstance(payload["k"], str):
+            raise ValueError(payload)
+        return payload["k"]
+    except (binascii.Error, ValueError, KeyError, TypeError) as e:
+        raise InvalidParameterError("since", token, "Invalid sync token") from e
 
 
 class TaskManager:
-    def __init__(self, repository: ITaskRepository):
+    def __init__(
+        self,
+        repository: ITaskRepository,
+        archive: Optional[ITaskArchive] = None,
+        event_bus: Optional[ITaskEventBus] = None,
+        publish_events: bool = True,
+    ):
         """
         TaskManager の初期化
 
         :param repository: データ操作を行うリポジトリインターフェース
+        :param archive: 退避済みタスクのアーカイブ (退避済みタスクの読み取りに使用)
+        :param event_bus: タスクの変更を配信するイベントバス
+        :param publish_events: False の場合は書き込み時にイベントを発行しない (DynamoDB Streams から発行する場合)
         """
         self.repository = repository
+        self.archive = archive
+        self.event_bus = event_bus
+        self.publish_events = publish_events
 
     def list_tasks(self) -> List[Task]:
         """
@@ -24,6 +69,30 @@ class TaskManager:
         """
         return self.repository.list_tasks()
 
+    def list_archived_tasks(
+        self, archived_from: date, archived_to: date, cursor: Optional[str] = None, limit: int = 100
+    ) -> ArchivedTasksResponse:
+        """
+        指定した期間に退避したタスクを1ページ分取得する
+
+        :param archived_from: 退避日の範囲の始め
+        :param archived_to: 退避日の範囲の終わり (この日を含む)
+        :param cursor: 前回のレスポンスの next_cursor
+        :param limit: 取得する最大件数
+        :raises InvalidParameterError: 期間や cursor が不正な場合
+        :raises ServiceUnavailableError: アーカイブが設定されていない場合
+        """
+        if self.archive is None:
+            raise ServiceUnavailableError("TaskArchive")
+        if archived_to < archived_from:
+            raise InvalidParameterError("to", archived_to.isoformat(), "'to' must not be before 'from'")
+        if (archived_to - archived_from).days >= ARCHIVE_MAX_RANGE_DAYS:
+            raise InvalidParameterError(
+                "to", archived_to.isoformat(), f"The range must be at most {ARCHIVE_MAX_RANGE_DAYS} days"
+            )
+        tasks, next_cursor = self.archive.list_archived_tasks(archived_from, archived_to, cursor, limit)
+        return ArchivedTasksResponse(tasks=tasks, next_cursor=next_cursor)
+
     def create_task(self, request: CreateTaskRequest):
         """
         新しいタスクを作成する
@@ -41,17 +110,24 @@ class TaskManager:
             priority=request.priority,
         )
         self.repository.create_task(new_task)
+        self._publish(TaskEventType.CREATED, str(new_task.id), new_task)
         return new_task
 
-    def get_task(self, task_id: str) -> Task:
+    def get_task(self, task_id: str, include_archived: bool = False) -> Task:
         """
         指定された ID のタスクを取得する
 
         :param task_id: タスクの ID
+        :param include_archived: True の場合、テーブルに無ければアーカイブからも探す
         :return: タスク
         :raises DataNotFoundError: タスクが見つからない場合
         """
-        return self.repository.get_task(task_id)
+        try:
+            return self.repository.get_task(task_id)
+        except DataNotFoundError:
+            if not include_archived or self.archive is None:
+                raise
+            return self.archive.get_archived_task(task_id)
 
     def update_task(self, task_id: str, request: UpdateTaskRequest) -> Task:
         """
@@ -70,8 +146,10 @@ class TaskManager:
             due_date=request.due_date or existing_task.due_date,
             status=TaskStatus(request.status) if request.status else existing_task.status,
             priority=TaskPriority(request.priority) if request.priority else existing_task.priority,
+            updated_at=datetime.now(timezone.utc),
         )
         self.repository.update_task(updated)
+        self._publish(TaskEventType.UPDATED, str(updated.id), updated)
         return updated
 
     def delete_task(self, task_id: str) -> None:
@@ -82,3 +160,39 @@ class TaskManager:
         :raises DataNotFoundError: タスクが見つからない場合
         """
         self.repository.delete_task(task_id)
+        self._publish(TaskEventType.DELETED, str(task_id))
+
+    def list_changes(self, since: Optional[str] = None, limit: int = 100) -> TaskChangesResponse:
+        """
+        前回の同期以降に作成・更新・削除されたタスクを取得する
+
+        :param since: 前回のレスポンスの next_token (None の場合は最初から)
+        :param limit: 取得する最大件数
+        :return: 変更されたタスクと次回のトークン
+        :raises InvalidParameterError: トークンが不正な場合
+        :raises SyncTokenExpiredError: トークンが古く、全件を取り直す必要がある場合
+        """
+        position = decode_sync_token(since) if since else None
+        changes, last_position, has_more = self.repository.list_changes(position, limit)
+        return TaskChangesResponse(
+            changes=changes,
+            next_token=encode_sync_token(last_position) if last_position else None,
+            has_more=has_more,
+        )
+
+    def subscribe_events(self, last_event_id: Optional[str] = None) -> ITaskEventSubscription:
+        """
+        タスクの変更イベントを購読する
+
+        :param last_event_id: 受信済みの最後のイベントID。指定するとそれより後のイベントから受け取る
+        :return: 購読
+        :raises ServiceUnavailableError: イベントバスが設定されていない場合
+        """
+        if self.event_bus is None:
+            raise ServiceUnavailableError("task events")
+        return self.event_bus.subscribe(last_event_id)
+
+    def _publish(self, event_type: TaskEventType, task_id: str, task: Optional[Task] = None) -> None:
+        if self.event_bus is None or not self.publish_events:
+            return
+        self.event_bus.publish(TaskEvent(type=event_type, task_id=task_id, task=task))
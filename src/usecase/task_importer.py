@@ -0,0 +1,228 @@
+import csv
+import threading
+from queue import Queue
+from typing import Callable, Iterable, Iterator, List, Literal, Optional, TextIO, Tuple, Union
+
+from pydantic import ValidationError
+
+from ..core.logger import get_logger
+from ..domains.interfaces.task_repository import ITaskRepository
+from ..domains.models.task import PRIORITY_DICT, Task
+from ..exceptions.errors import BaseAppError, InvalidParameterError
+from ..routers.dto.task import CreateTaskRequest, TaskImportReport, TaskImportRowError
+
+logger = get_logger(__name__)
+
+ImportFormat = Literal["ndjson", "csv"]
+
+# (行番号, NDJSONの1行 または CSVの1行を辞書化したもの)
+ImportRow = Tuple[int, Union[str, dict]]
+
+# CSV の1フィールドの上限 (文字数)。DynamoDB の1項目の上限 (400KB) に合わせる
+CSV_FIELD_SIZE_LIMIT = 400 * 1024
+
+
+def iter_ndjson_rows(stream: Iterable[str]) -> Iterator[ImportRow]:
+    """
+    NDJSON を1行ずつ読み出します。JSONの解析は検証時にまとめて行います。
+
+    :param stream: テキストストリーム
+    :return: (行番号, 行文字列) のイテレータ。空行は読み飛ばします。
+    """
+    for number, line in enumerate(stream, start=1):
+        if line.strip():
+            yield number, line
+
+
+def iter_csv_rows(stream: Iterable[str]) -> Iterator[ImportRow]:
+    """
+    ヘッダー付きCSVを1行ずつ読み出します。空欄は未指定として扱います。
+
+    :param stream: テキストストリーム (newline="" で開いたもの)
+    :return: (行番号, 列名をキーとする辞書) のイテレータ。行番号はヘッダーを1行目として数えます。
+    """
+    if csv.field_size_limit() < CSV_FIELD_SIZE_LIMIT:
+        csv.field_size_limit(CSV_FIELD_SIZE_LIMIT)
+    reader = csv.DictReader(stream)
+    for row in reader:
+        yield reader.line_num, {key: value for key, value in row.items() if key and value not in (None, "")}
+
+
+def iter_rows(stream: TextIO, fmt: ImportFormat) -> Iterator[ImportRow]:
+    if fmt == "ndjson":
+        return iter_ndjson_rows(stream)
+    if fmt == "csv":
+        return iter_csv_rows(stream)
+    raise InvalidParameterError("format", fmt, "Unsupported import format")
+
+
+class TaskImporter:
+    def __init__(
+        self,
+        repository: ITaskRepository,
+        workers: int = 4,
+        batch_size: int = 100,
+        max_pending_batches: int = 8,
+        max_errors: int = 100,
+    ):
+        """
+        TaskImporter の初期化
+
+        読み込みと検証は呼び出し元スレッドで行い、書き込みは workers 個のスレッドが
+        batch_size 件ずつ並列に行います。書き込み待ちのバッチが max_pending_batches を
+        超えると読み込みを止めるため、メモリ使用量はファイルサイズに依存しません。
+
+        :param repository: データ操作を行うリポジトリインターフェース
+        :param workers: 書き込みスレッド数
+        :param batch_size: 1回の一括書き込みに含めるタスク数
+        :param max_pending_batches: 書き込み待ちで保持するバッチ数の上限
+        :param max_errors: レポートに保持する行エラーの上限
+        """
+        self.repository = repository
+        self.workers = workers
+        self.batch_size = batch_size
+        self.max_pending_batches = max_pending_batches
+        self.max_errors = max_errors
+
+    def import_stream(
+        self,
+        stream: TextIO,
+        fmt: ImportFormat,
+        progress: Optional[Callable[[TaskImportReport], None]] = None,
+    ) -> TaskImportReport:
+        """
+        NDJSON または CSV のストリームからタスクを取り込む
+
+        :param stream: テキストストリーム
+        :param fmt: "ndjson" または "csv"
+        :param progress: バッチの書き込みが終わるたびに途中経過を受け取るコールバック
+        :return: 取り込み結果
+        """
+        return self.import_rows(iter_rows(stream, fmt), progress)
+
+    def import_rows(
+        self,
+        rows: Iterable[ImportRow],
+        progress: Optional[Callable[[TaskImportReport], None]] = None,
+    ) -> TaskImportReport:
+        """
+        行を検証し、検証に通ったタスクを並列に一括書き込みする
+
+        入力が UTF-8 として読めない場合や CSV として解析できない場合は、それまでに読んだ行を
+        書き込んだうえで読み込みを打ち切り、aborted を True にした結果を返します。
+
+        :param rows: (行番号, 行データ) のイテラブル
+        :param progress: バッチの書き込みが終わるたびに途中経過を受け取るコールバック
+        :return: 取り込み結果
+        """
+        run = _ImportRun(self.max_errors, progress)
+        queue: "Queue[Optional[List[Tuple[int, Task]]]]" = Queue(maxsize=self.max_pending_batches)
+        threads = [
+            threading.Thread(target=self._write_batches, args=(queue, run), daemon=True) for _ in range(self.workers)
+        ]
+        for thread in threads:
+            thread.start()
+
+        try:
+            batch: List[Tuple[int, Task]] = []
+            number = 0
+            try:
+                for number, raw in rows:
+                    run.row_read()
+                    try:
+                        batch.append((number, self._build_task(raw)))
+                    except (ValidationError, BaseAppError) as e:
+                        run.rows_failed([number], _error_message(e))
+                        continue
+                    if len(batch) >= self.batch_size:
+                        queue.put(batch)  # 書き込みが追いつくまでここで待つ
+                        batch = []
+            except (UnicodeDecodeError, csv.Error) as e:
+                # 以降の行の区切りが分からないため、行エラーにせず読み込みを打ち切る
+                logger.warning("Aborted import after row %d: %s", number, e)
+                run.abort(f"Stopped reading after row {number}: {e}")
+            if batch:
+                queue.put(batch)
+        finally:
+            for _ in threads:
+                queue.put(None)
+            for thread in threads:
+                thread.join()
+
+        return run.snapshot()
+
+    def _write_batches(self, queue: "Queue[Optional[List[Tuple[int, Task]]]]", run: "_ImportRun") -> None:
+        while True:
+            batch = queue.get()
+            if batch is None:
+                return
+            try:
+                self.repository.batch_create_tasks([task for _, task in batch])
+                run.rows_imported(len(batch))
+            except Exception as e:
+                logger.exception("Failed to write import batch starting at row %d", batch[0][0])
+                run.rows_failed([number for number, _ in batch], _error_message(e))
+
+    @staticmethod
+    def _build_task(raw: Union[str, dict]) -> Task:
+        if isinstance(raw, str):
+            request = CreateTaskRequest.model_validate_json(raw)
+        else:
+            request = CreateTaskRequest.model_validate(raw)
+        if not request.title:
+            raise InvalidParameterError("title", request.title or "", "Title is required for creating a task.")
+        if request.priority not in PRIORITY_DICT:
+            raise InvalidParameterError("priority", request.priority, "Unknown priority")
+        return Task.create(
+            title=request.title,
+            description=request.description or "",
+            due_date=request.due_date or "",
+            priority=request.priority,
+        )
+
+
+class _ImportRun:
+    """1回の取り込みの集計。書き込みスレッドから同時に更新されます。"""
+
+    def __init__(self, max_errors: int, progress: Optional[Callable[[TaskImportReport], None]]):
+        self._lock = threading.Lock()
+        self._report = TaskImportReport()
+        self._max_errors = max_errors
+        self._progress = progress
+
+    def row_read(self) -> None:
+        with self._lock:
+            self._report.processed += 1
+
+    def rows_imported(self, count: int) -> None:
+        with self._lock:
+            self._report.imported += count
+            self._notify()
+
+    def rows_failed(self, numbers: List[int], message: str) -> None:
+        with self._lock:
+            self._report.failed += len(numbers)
+            for number in numbers:
+                if len(self._report.errors) >= self._max_errors:
+                    self._report.errors_truncated = True
+                    break
+                self._report.errors.append(TaskImportRowError(row=number, message=message))
+
+    def abort(self, reason: str) -> None:
+        with self._lock:
+            self._report.aborted = True
+            self._report.abort_reason = reason
+
+    def snapshot(self) -> TaskImportReport:
+        with self._lock:
+            return self._report.model_copy(deep=True)
+
+    def _notify(self) -> None:
+        if self._progress is not None:
+            self._progress(self._report.model_copy(deep=True))
+
+
+def _error_message(error: Exception) -> str:
+    if isinstance(error, ValidationError):
+        return "; ".join(f"{'.'.join(str(loc) for loc in e['loc']) or 'row'}: {e['msg']}" for e in error.errors())
+    return str(error)
@@ -0,0 +1,180 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import List, Literal, Optional
+
+from pydantic import BaseModel
+
+from ..core.logger import get_logger
+from ..domains.interfaces.task_repository import ITaskRepository
+from ..domains.models.task import Task, TaskPriority, TaskStatus
+
+logger = get_logger(__name__)
+
+SnapshotFormat = Literal["parquet", "arrow"]
+
+SNAPSHOT_SUFFIXES = {"parquet": ".parquet", "arrow": ".arrow"}
+
+# 辞書の並び (= インデックス) はファイル間で共通にする
+_STATUS_INDEX = {status: index for index, status in enumerate(TaskStatus)}
+_PRIORITY_INDEX = {priority: index for index, priority in enumerate(TaskPriority)}
+
+
+def _load_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.ipc
+        import pyarrow.parquet
+    except ImportError as e:
+        raise RuntimeError("pyarrow is required for snapshot export (install the 'analytics' extra)") from e
+    return pyarrow
+
+
+def snapshot_schema():
+    """スナップショットのスキーマ。status / priority は列挙値を辞書とする辞書エンコード列です。"""
+    pa = _load_pyarrow()
+    return pa.schema(
+        [
+            pa.field("id", pa.string(), nullable=False),
+            pa.field("title", pa.string(), nullable=False),
+            pa.field("description", pa.string()),
+            pa.field("due_date", pa.string()),
+            pa.field("status", pa.dictionary(pa.int8(), pa.string()), nullable=False),
+            pa.field("priority", pa.dictionary(pa.int8(), pa.string()), nullable=False),
+            pa.field("updated_at", pa.timestamp("ms", tz="UTC")),
+        ]
+    )
+
+
+def tasks_to_record_batch(tasks: List[Task]):
+    """タスクのリストを snapshot_schema の RecordBatch にします。"""
+    pa = _load_pyarrow()
+    schema = snapshot_schema()
+    status_dictionary = pa.array([status.value for status in TaskStatus])
+    priority_dictionary = pa.array([priority.value for priority in TaskPriority])
+    return pa.RecordBatch.from_arrays(
+        [
+            pa.array([str(task.id) for task in tasks], pa.string()),
+            pa.array([task.title for task in tasks], pa.string()),
+            pa.array([task.description for task in tasks], pa.string()),
+            pa.array([task.due_date for task in tasks], pa.string()),
+            pa.DictionaryArray.from_arrays(
+                pa.array([_STATUS_INDEX[task.status] for task in tasks], pa.int8()), status_dictionary
+            ),
+            pa.DictionaryArray.from_arrays(
+                pa.array([_PRIORITY_INDEX[task.priority] for task in tasks], pa.int8()), priority_dictionary
+            ),
+            pa.array([task.updated_at for task in tasks], pa.timestamp("ms", tz="UTC")),
+        ],
+        schema=schema,
+    )
+
+
+class TaskSnapshotReport(BaseModel):
+    format: str
+    rows: int = 0
+    files: list[str] = []
+    started_at: datetime
+    finished_at: Optional[datetime] = None
+
+
+class TaskSnapshotExporter:
+    def __init__(
+        self,
+        repository: ITaskRepository,
+        segments: int = 4,
+        row_group_size: int = 65_536,
+        fmt: SnapshotFormat = "parquet",
+        compression: Optional[str] = "zstd",
+    ):
+        """
+        TaskSnapshotExporter の初期化
+
+        テーブルを segments 個に分けて並列に読み、区分ごとに1ファイルへ row_group_size 行ずつ書き出します。
+        メモリに保持するのは区分ごとに最大 row_group_size 行 (+ 1ページ) だけです。
+
+        :param repository: データ操作を行うリポジトリインターフェース
+        :param segments: 並列スキャンの区分数 (= 書き出すファイルの最大数)
+        :param row_group_size: Parquet の行グループ / Arrow のレコードバッチの行数
+        :param fmt: "parquet" または "arrow" (Arrow IPC ファイル形式)
+        :param compression: 圧縮方式 ("zstd", "lz4" など。None で無圧縮。Arrow をメモリマップで読む場合は None)
+        """
+        self.repository = repository
+        self.segments = segments
+        self.row_group_size = row_group_size
+        self.fmt = fmt
+        self.compression = compression
+
+    def export(self, output_dir: str) -> TaskSnapshotReport:
+        """
+        削除済みを除く全タスクを output_dir に書き出す
+
+        ファイル名は part-<区分>.parquet (または .arrow) です。タスクの無い区分のファイルは作りません。
+
+        :param output_dir: 出力先ディレクトリ (無ければ作成)
+        :return: 書き出し結果
+        """
+        _load_pyarrow()
+        report = TaskSnapshotReport(format=self.fmt, started_at=datetime.now(timezone.utc))
+        directory = Path(output_dir)
+        directory.mkdir(parents=True, exist_ok=True)
+        with ThreadPoolExecutor(max_workers=self.segments, thread_name_prefix="snapshot") as executor:
+            results = list(executor.map(lambda segment: self._export_segment(directory, segment), range(self.segments)))
+
+        for path, rows in results:
+            if path is not None:
+                report.files.append(str(path))
+                report.rows += rows
+        report.finished_at = datetime.now(timezone.utc)
+        return report
+
+    def _export_segment(self, directory: Path, segment: int) -> tuple[Optional[Path], int]:
+        path = directory / f"part-{segment:04d}{SNAPSHOT_SUFFIXES[self.fmt]}"
+        tmp_path = path.with_name(path.name + ".tmp")
+        writer = None
+        rows = 0
+        pending: List[Task] = []
+        try:
+            for page in self.repository.scan_segment(segment, self.segments):
+                pending.extend(page)
+                while len(pending) >= self.row_group_size:
+                    writer = writer or self._open_writer(tmp_path)
+                    self._write(writer, pending[: self.row_group_size])
+                    rows += self.row_group_size
+                    pending = pending[self.row_group_size :]
+            if pending:
+                writer = writer or self._open_writer(tmp_path)
+                self._write(writer, pending)
+                rows += len(pending)
+        except BaseException:
+            if writer is not None:
+                writer.close()
+                tmp_path.unlink(missing_ok=True)
+            raise
+        if writer is None:
+            return None, 0
+        writer.close()
+        os.replace(tmp_path, path)
+        logger.info("Wrote %d tasks of segment %d to %s.", rows, segment, path)
+        return path, rows
+
+    def _open_writer(self, path: Path):
+        pa = _load_pyarrow()
+        if self.fmt == "parquet":
+            return pa.parquet.ParquetWriter(
+                path,
+                snapshot_schema(),
+                compression=self.compression or "none",
+                # pyarrow は列名のリストも受け付けるが、型スタブは bool だけを宣言している
+                use_dictionary=["status", "priority"],  # type: ignore[arg-type]
+            )
+        options = pa.ipc.IpcWriteOptions(compression=self.compression)
+        return pa.ipc.new_file(str(path), snapshot_schema(), options=options)
+
+    def _write(self, writer, tasks: List[Task]) -> None:
+        batch = tasks_to_record_batch(tasks)
+        if self.fmt == "parquet":
+            writer.write_batch(batch, row_group_size=len(tasks))
+        else:
+            writer.write_batch(batch)
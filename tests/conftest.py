@@ -0,0 +1,138 @@
+import threading
+
+import boto3
+import pytest
+from moto import mock_aws
+
+from src.domains.interfaces.task_event_bus import ITaskEventBus
+from src.domains.interfaces.task_repository import ITaskRepository
+from src.exceptions.errors import DataAccessError, DataNotFoundError
+from src.infrastructure.repositories.task_repository import SYNC_INDEX, TaskDynamoDBRepository
+
+
+class InMemoryTaskRepository(ITaskRepository):
+    """
+    タスクを辞書 (キーは文字列のタスクID) に保持するリポジトリ
+
+    作成・更新・削除は changes に順に記録し、list_changes はそれまでの変更の件数を位置として返します。
+    batch_create_tasks は、fail_titles に含まれるタイトルのタスクを含むバッチを DataAccessError にします。
+    """
+
+    def __init__(self):
+        self.tasks = {}
+        self.changes = []
+        self.batches = []
+        self.fail_titles = set()
+        # scan_segment が1ページに返す件数
+        self.page_size = 100
+        self._lock = threading.Lock()
+
+    def list_tasks(self):
+        return list(self.tasks.values())
+
+    def create_task(self, task):
+        with self._lock:
+            self.tasks[str(task.id)] = task
+            self.changes.append(task)
+
+    def batch_create_tasks(self, tasks):
+        if any(task.title in self.fail_titles for task in tasks):
+            raise DataAccessError("Failed to create tasks in batch")
+        with self._lock:
+            self.batches.append(len(tasks))
+        for task in tasks:
+            self.create_task(task)
+
+    def scan_segment(self, segment, total_segments):
+        tasks = [task for i, task in enumerate(self.tasks.values()) if i % total_segments == segment]
+        for start in range(0, len(tasks), self.page_size):
+            yield tasks[start : start + self.page_size]
+
+    def get_task(self, task_id):
+        if str(task_id) not in self.tasks:
+            raise DataNotFoundError(resource_name="Task")
+        return self.tasks[str(task_id)]
+
+    def update_task(self, updated_task):
+        self.get_task(updated_task.id)
+        self.create_task(updated_task)
+
+    def delete_task(self, task_id):
+        task = self.get_task(task_id)
+        with self._lock:
+            del self.tasks[str(task_id)]
+            self.changes.append(task.model_copy(update={"deleted": True}))
+
+    def list_changes(self, since, limit):
+        start = int(since or 0)
+        page = self.changes[start : start + limit]
+        position = start + len(page)
+        return page, str(position), position < len(self.changes)
+
+    def write_tombstones(self, tasks):
+        with self._lock:
+            self.changes.extend(task.model_copy(update={"deleted": True}) for task in tasks)
+
+
+class RecordingTaskEventBus(ITaskEventBus):
+    """発行されたイベントと位置、取りこぼしの通知を記録するイベントバス"""
+
+    def __init__(self):
+        self.events = []
+        self.position = None
+        self.lost = False
+
+    def publish(self, event):
+        self.events.append(event)
+        return event
+
+    def publish_position(self, position):
+        self.position = position
+
+    def mark_lost(self):
+        self.lost = True
+
+    def subscribe(self, last_event_id=None):
+        raise NotImplementedError
+
+
+@pytest.fixture
+def fake_repository():
+    return InMemoryTaskRepository()
+
+
+@pytest.fixture
+def recording_bus():
+    return RecordingTaskEventBus()
+
+
+@pytest.fixture
+def tasks_table():
+    """本番と同じキー・差分同期用のインデックス・ストリームを持つ moto のテーブル"""
+    with mock_aws():
+        yield boto3.resource("dynamodb").create_table(
+            TableName="Tasks",
+            KeySchema=[{"AttributeName": "id", "KeyType": "HASH"}],
+            AttributeDefinitions=[
+                {"AttributeName": "id", "AttributeType": "S"},
+                {"AttributeName": "sync_shard", "AttributeType": "N"},
+                {"AttributeName": "sync_key", "AttributeType": "S"},
+            ],
+            GlobalSecondaryIndexes=[
+                {
+                    "IndexName": SYNC_INDEX,
+                    "KeySchema": [
+                        {"AttributeName": "sync_shard", "KeyType": "HASH"},
+                        {"AttributeName": "sync_key", "KeyType": "RANGE"},
+                    ],
+                    "Projection": {"ProjectionType": "ALL"},
+                }
+            ],
+            BillingMode="PAY_PER_REQUEST",
+            StreamSpecification={"StreamEnabled": True, "StreamViewType": "NEW_AND_OLD_IMAGES"},
+        )
+
+
+@pytest.fixture
+def repository(tasks_table):
+    return TaskDynamoDBRepository(tasks_table.name)
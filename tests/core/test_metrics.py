@@ -0,0 +1,87 @@
+import json
+
+import pytest
+
+from src.core.metrics import MAX_VALUES_PER_METRIC, MetricsRecorder, instrumented, metrics
+from src.domains.models.task import Task
+from src.exceptions.errors import DataNotFoundError
+
+
+@pytest.fixture(autouse=True)
+def clear_metrics():
+    metrics._values.clear()
+    yield
+    metrics._values.clear()
+
+
+def emf_lines(capsys):
+    return [json.loads(line) for line in capsys.readouterr().out.splitlines() if line.startswith("{")]
+
+
+def test_flush_emits_emf_with_all_values(capsys):
+    recorder = MetricsRecorder(namespace="Test", service="svc")
+    recorder.latency("get_task.latency", 1.5)
+    recorder.latency("get_task.latency", 2.5)
+    recorder.count("errors.DataNotFoundError")
+
+    recorder.flush()
+
+    [blob] = emf_lines(capsys)
+    assert blob["_aws"]["CloudWatchMetrics"][0]["Namespace"] == "Test"
+    assert blob["get_task.latency"] == [1.5, 2.5]
+    assert blob["errors.DataNotFoundError"] == [1.0]
+    assert recorder.snapshot() == {}
+
+    recorder.flush()
+    assert emf_lines(capsys) == []
+
+
+def test_flushes_before_exceeding_values_per_metric(capsys):
+    recorder = MetricsRecorder(namespace="Test", service="svc")
+
+    for i in range(MAX_VALUES_PER_METRIC + 1):
+        recorder.latency("op.latency", i)
+
+    [blob] = emf_lines(capsys)
+    assert len(blob["op.latency"]) == MAX_VALUES_PER_METRIC
+    assert recorder.snapshot() == {"op.latency": [float(MAX_VALUES_PER_METRIC)]}
+
+
+def test_disabled_recorder_records_nothing():
+    recorder = MetricsRecorder(namespace="Test", service="svc", enabled=False)
+
+    recorder.count("anything")
+
+    assert recorder.snapshot() == {}
+
+
+def test_instrumented_records_latency_and_errors_by_class():
+    @instrumented("lookup")
+    def lookup(found):
+        if not found:
+            raise DataNotFoundError(resource_name="Task")
+        return "ok"
+
+    assert lookup(True) == "ok"
+    with pytest.raises(DataNotFoundError):
+        lookup(False)
+
+    recorded = metrics.snapshot()
+    assert len(recorded["lookup.latency"]) == 2
+    assert recorded["errors.DataNotFoundError"] == [1]
+
+
+def test_repository_records_dynamodb_calls(repository):
+    metrics._values.clear()
+    task = Task.create(title="t", description="d", due_date="2025-01-01", priority="LOW")
+
+    repository.create_task(task)
+    repository.get_task(str(task.id))
+    with pytest.raises(DataNotFoundError):
+        repository.get_task("missing")
+
+    recorded = metrics.snapshot()
+    assert recorded["dynamodb.PutItem"] == [1]
+    assert recorded["dynamodb.GetItem"] == [1, 1]
+    assert len(recorded["get_task.latency"]) == 2
+    assert recorded["errors.DataNotFoundError"] == [1]
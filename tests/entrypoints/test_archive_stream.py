@@ -0,0 +1,125 @@
+import base64
+import zlib
+from datetime import date, datetime, timezone
+
+import pytest
+
+from src.entrypoints import archive_stream
+from src.infrastructure.repositories.task_archive import LocalTaskArchive
+
+TASK_ID = "550e8400-e29b-41d4-a716-446655440001"
+
+OLD_IMAGE = {
+    "id": {"S": TASK_ID},
+    "title": {"S": "Task 1"},
+    "description": {"S": "Description 1"},
+    "due_date": {"S": "2025-12-31"},
+    "status": {"S": "DONE"},
+    "priority": {"S": "HIGH"},
+    "ttl": {"N": "1735689600"},
+}
+
+
+def record(event_name, user_identity=None, old_image=OLD_IMAGE, sequence_number=None):
+    rec = {
+        "eventName": event_name,
+        "eventSource": "aws:dynamodb",
+        "dynamodb": {"Keys": {"id": {"S": TASK_ID}}, "OldImage": old_image},
+    }
+    if sequence_number:
+        rec["dynamodb"]["SequenceNumber"] = sequence_number
+        rec["dynamodb"]["ApproximateCreationDateTime"] = 1735689600
+    if user_identity:
+        rec["userIdentity"] = user_identity
+    return rec
+
+
+TTL_IDENTITY = {"type": "Service", "principalId": "dynamodb.amazonaws.com"}
+
+
+def archived_tasks(archive_dir, day=None):
+    # ApproximateCreationDateTime の無いレコードは処理した日のパーティションに書かれる
+    day = day or datetime.now(timezone.utc).date()
+    tasks, _ = LocalTaskArchive(str(archive_dir)).list_archived_tasks(day, day)
+    return tasks
+
+
+class TombstoneRecorder:
+    def __init__(self):
+        self.tasks = []
+
+    def write_tombstones(self, tasks):
+        self.tasks.extend(tasks)
+
+
+@pytest.fixture
+def tombstones(monkeypatch):
+    recorder = TombstoneRecorder()
+    monkeypatch.setattr(archive_stream, "get_repository", lambda: recorder)
+    return recorder
+
+
+@pytest.fixture
+def archive_dir(tmp_path, monkeypatch, tombstones):
+    monkeypatch.setattr(archive_stream, "get_archive", lambda: LocalTaskArchive(str(tmp_path)))
+    return tmp_path
+
+
+def test_handler_archives_only_ttl_expiries(archive_dir):
+    event = {
+        "Records": [
+            record("REMOVE", TTL_IDENTITY),
+            record("REMOVE"),  # 利用者による削除
+            record("MODIFY", TTL_IDENTITY),
+            record("REMOVE", TTL_IDENTITY, old_image={"id": {"S": "broken"}}),
+        ]
+    }
+
+    result = archive_stream.handler(event, None)
+
+    assert result == {"archived": 1}
+    archived = archived_tasks(archive_dir)
+    assert [str(task.id) for task in archived] == [TASK_ID]
+    assert archived[0].title == "Task 1"
+
+
+def test_handler_writes_tombstones_and_skips_expired_tombstones(archive_dir, tombstones):
+    tombstone_image = dict(OLD_IMAGE, deleted={"BOOL": True})
+    event = {"Records": [record("REMOVE", TTL_IDENTITY), record("REMOVE", TTL_IDENTITY, old_image=tombstone_image)]}
+
+    result = archive_stream.handler(event, None)
+
+    assert result == {"archived": 1}
+    assert [str(task.id) for task in tombstones.tasks] == [TASK_ID]
+
+
+def test_handler_decodes_compact_items(archive_dir):
+    description = "long description " * 100
+    compact_image = dict(
+        OLD_IMAGE,
+        description={"B": base64.b64encode(zlib.compress(description.encode("utf-8"))).decode("ascii")},
+        status={"N": "2"},
+        priority={"N": "2"},
+    )
+
+    archive_stream.handler({"Records": [record("REMOVE", TTL_IDENTITY, old_image=compact_image)]}, None)
+
+    (archived,) = archived_tasks(archive_dir)
+    assert archived.description == description
+    assert (archived.status.value, archived.priority.value) == ("DONE", "HIGH")
+
+
+def test_retried_batch_overwrites_the_same_archive(archive_dir):
+    event = {
+        "Records": [
+            record("REMOVE", TTL_IDENTITY, sequence_number="100"),
+            record("REMOVE", sequence_number="200"),
+        ]
+    }
+
+    archive_stream.handler(event, None)
+    archive_stream.handler(event, None)
+
+    (path,) = archive_dir.glob("dt=*/*.jsonl.gz")
+    assert path.relative_to(archive_dir).as_posix() == "dt=2025-01-01/000000-100-200.jsonl.gz"
+    assert len(archived_tasks(archive_dir, date(2025, 1, 1))) == 1
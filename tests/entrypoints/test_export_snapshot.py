@@ -0,0 +1,34 @@
+import boto3
+import pytest
+
+from src.core.config import get_settings
+from src.domains.models.task import Task
+from src.entrypoints import export_snapshot
+from src.infrastructure.repositories.task_repository import TaskDynamoDBRepository
+
+pytest.importorskip("pyarrow")
+
+BUCKET = "snapshots"
+
+
+@pytest.fixture
+def repository(tasks_table, monkeypatch):
+    boto3.client("s3").create_bucket(Bucket=BUCKET, CreateBucketConfiguration={"LocationConstraint": "ap-northeast-1"})
+    repository = TaskDynamoDBRepository(tasks_table.name)
+    monkeypatch.setattr(export_snapshot, "get_repository", lambda: repository)
+    monkeypatch.setattr(get_settings(), "snapshot_bucket", BUCKET)
+    monkeypatch.setattr(get_settings(), "snapshot_segments", 2)
+    return repository
+
+
+def test_handler_uploads_snapshot_files(repository):
+    tasks = [Task.create(title=f"t{i}", description="d", due_date="", priority="LOW") for i in range(10)]
+    repository.batch_create_tasks(tasks)
+    repository.delete_task(str(tasks[0].id))
+
+    result = export_snapshot.handler({}, None)
+
+    assert result["rows"] == 9
+    listed = boto3.client("s3").list_objects_v2(Bucket=BUCKET)["Contents"]
+    assert sorted(obj["Key"] for obj in listed) == sorted(result["keys"])
+    assert all(key.startswith("snapshots/dt=") and key.endswith(".parquet") for key in result["keys"])
@@ -0,0 +1,230 @@
+import asyncio
+import base64
+import json
+
+import pytest
+from fastapi import FastAPI, Request, Response
+from fastapi.responses import StreamingResponse
+
+from src.core.auth import get_current_user
+from src.entrypoints import function_url
+from src.entrypoints.function_url import (
+    PRELUDE_DELIMITER,
+    BufferedResponseWriter,
+    ResponseWriter,
+    RuntimeStreamWriter,
+    build_request,
+    call_app,
+)
+from src.main import app
+from src.routers.task import get_task_service
+from src.usecase.task_handler import TaskManager
+
+
+def make_event(method="GET", path="/", query="", body=None, headers=None, cookies=None, binary=False):
+    event = {
+        "version": "2.0",
+        "rawPath": path,
+        "rawQueryString": query,
+        "headers": {"host": "abc.lambda-url.ap-northeast-1.on.aws", **(headers or {})},
+        "requestContext": {
+            "domainName": "abc.lambda-url.ap-northeast-1.on.aws",
+            "http": {"method": method, "path": path, "protocol": "HTTP/1.1", "sourceIp": "203.0.113.1"},
+        },
+        "isBase64Encoded": binary,
+    }
+    if body is not None:
+        event["body"] = base64.b64encode(body).decode() if binary else body
+    if cookies:
+        event["cookies"] = cookies
+    return event
+
+
+@pytest.fixture
+def repository(fake_repository):
+    service = TaskManager(fake_repository)
+    app.dependency_overrides[get_task_service] = lambda: service
+    app.dependency_overrides[get_current_user] = lambda: {"username": "tester"}
+    yield fake_repository
+    app.dependency_overrides.clear()
+
+
+def test_handler_creates_and_lists_tasks(repository):
+    body = json.dumps({"title": "タスク", "priority": "HIGH"}).encode()
+    created = function_url.handler(
+        make_event("POST", "/tasks/", body=body, headers={"content-type": "application/json"}, binary=True), None
+    )
+
+    assert created["statusCode"] == 201
+    assert created["isBase64Encoded"] is False
+    assert json.loads(created["body"])["title"] == "タスク"
+
+    listed = function_url.handler(make_event("GET", "/tasks/", query="limit=10"), None)
+
+    assert listed["statusCode"] == 200
+    assert [task["title"] for task in json.loads(listed["body"])] == ["タスク"]
+    assert list(repository.tasks) == [json.loads(created["body"])["id"]]
+
+
+def test_build_request_maps_function_url_event():
+    scope, body = build_request(
+        make_event(
+            "PUT", "/files/a%20b", query="x=1&y=2", body="hello", headers={"X-Trace": "t"}, cookies=["a=1", "b=2"]
+        )
+    )
+
+    assert scope["method"] == "PUT"
+    assert scope["path"] == "/files/a b"
+    assert scope["raw_path"] == b"/files/a%20b"
+    assert scope["query_string"] == b"x=1&y=2"
+    assert (b"x-trace", b"t") in scope["headers"]
+    assert (b"cookie", b"a=1; b=2") in scope["headers"]
+    assert scope["client"] == ("203.0.113.1", 0)
+    assert body == b"hello"
+
+
+def test_buffered_response_splits_cookies_and_encodes_binary():
+    echo = FastAPI()
+
+    @echo.post("/echo")
+    async def echo_body(request: Request):
+        response = Response(await request.body(), media_type="application/octet-stream")
+        response.set_cookie("session", request.cookies["session"])
+        response.set_cookie("theme", "dark")
+        return response
+
+    scope, body = build_request(make_event("POST", "/echo", body=b"\x00\xff", cookies=["session=s1"], binary=True))
+    response = BufferedResponseWriter()
+    asyncio.run(call_app(echo, scope, body, response))
+    result = response.result()
+
+    assert result["statusCode"] == 200
+    assert result["isBase64Encoded"] is True
+    assert base64.b64decode(result["body"]) == b"\x00\xff"
+    assert [cookie.split(";")[0] for cookie in result["cookies"]] == ["session=s1", "theme=dark"]
+    assert "set-cookie" not in result["headers"]
+
+
+def test_exception_before_response_returns_500():
+    async def failing_app(scope, receive, send):
+        raise RuntimeError("boom")
+
+    scope, body = build_request(make_event())
+    response = BufferedResponseWriter()
+    asyncio.run(call_app(failing_app, scope, body, response))
+
+    assert response.result()["statusCode"] == 500
+
+
+class RecordingConnection:
+    def __init__(self):
+        self.request_line = None
+        self.headers = {}
+        self.sent = b""
+
+    def putrequest(self, method, url, skip_accept_encoding=False):
+        self.request_line = (method, url)
+
+    def putheader(self, name, value):
+        self.headers[name] = value
+
+    def endheaders(self):
+        pass
+
+    def send(self, data):
+        self.sent += data
+
+    def getresponse(self):
+        class Accepted:
+            status = 202
+
+            def read(self):
+                return b""
+
+        return Accepted()
+
+    def chunks(self):
+        chunks, rest = [], self.sent
+        while True:
+            size_line, rest = rest.split(b"\r\n", 1)
+            size = int(size_line, 16)
+            if size == 0:
+                return chunks, rest
+            chunks.append(rest[:size])
+            rest = rest[size + 2 :]
+
+
+def test_stream_writer_sends_prelude_then_each_chunk():
+    streaming = FastAPI()
+
+    @streaming.get("/events")
+    async def events():
+        async def generate():
+            yield "data: 1\n\n"
+            yield "data: 2\n\n"
+
+        return StreamingResponse(generate(), media_type="text/event-stream")
+
+    connection = RecordingConnection()
+    scope, body = build_request(make_event("GET", "/events"))
+    asyncio.run(call_app(streaming, scope, body, RuntimeStreamWriter(connection, "req-1")))
+
+    assert connection.request_line == ("POST", "/2018-06-01/runtime/invocation/req-1/response")
+    assert connection.headers["Lambda-Runtime-Function-Response-Mode"] == "streaming"
+    chunks, trailers = connection.chunks()
+    prelude, delimiter = chunks[0][: -len(PRELUDE_DELIMITER)], chunks[0][-len(PRELUDE_DELIMITER) :]
+    assert delimiter == PRELUDE_DELIMITER
+    assert json.loads(prelude)["statusCode"] == 200
+    assert json.loads(prelude)["headers"]["content-type"].startswith("text/event-stream")
+    assert chunks[1:] == [b"data: 1\n\n", b"data: 2\n\n"]
+    assert trailers == b"\r\n"
+
+
+def test_stream_writer_reports_error_in_trailers():
+    async def failing_stream(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"partial", "more_body": True})
+        raise RuntimeError("boom")
+
+    connection = RecordingConnection()
+    scope, body = build_request(make_event())
+    asyncio.run(call_app(failing_stream, scope, body, RuntimeStreamWriter(connection, "req-1")))
+
+    chunks, trailers = connection.chunks()
+    assert chunks[1:] == [b"partial"]
+    assert b"Lambda-Runtime-Function-Error-Type: Unhandled\r\n" in trailers
+    error_body = trailers.split(b"Lambda-Runtime-Function-Error-Body: ")[1].split(b"\r\n")[0]
+    assert json.loads(base64.b64decode(error_body))["errorMessage"] == "boom"
+
+
+def test_response_writer_requires_write():
+    with pytest.raises(TypeError):
+        ResponseWriter()
+
+
+class RecordingRequests:
+    def __init__(self):
+        self.requests = []
+
+    def request(self, method, url, body=None, headers=None):
+        self.requests.append((method, url, body, headers))
+
+    def getresponse(self):
+        return RecordingConnection().getresponse()
+
+
+def test_main_reports_init_errors_to_runtime_api(monkeypatch):
+    connection = RecordingRequests()
+    monkeypatch.setenv("AWS_LAMBDA_RUNTIME_API", "127.0.0.1:9001")
+    monkeypatch.setattr(function_url.http.client, "HTTPConnection", lambda api: connection)
+
+    def broken_app():
+        raise ImportError("No module named 'boto3'")
+
+    monkeypatch.setattr(function_url, "load_app", broken_app)
+
+    assert function_url.main() == 1
+    ((method, url, body, headers),) = connection.requests
+    assert (method, url) == ("POST", "/2018-06-01/runtime/init/error")
+    assert headers["Lambda-Runtime-Function-Error-Type"] == "Unhandled"
+    assert json.loads(body)["errorType"] == "ImportError"
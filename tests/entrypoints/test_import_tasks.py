@@ -0,0 +1,34 @@
+import json
+
+import pytest
+
+from src.core.metrics import metrics
+from src.entrypoints import import_tasks
+
+
+@pytest.fixture(autouse=True)
+def restore_metrics(monkeypatch):
+    # CLI は EMF の出力を止めるため、テスト後に戻す
+    monkeypatch.setattr(metrics, "enabled", metrics.enabled)
+
+
+def test_cli_detects_csv_by_extension(repository, tmp_path, capsys):
+    path = tmp_path / "tasks.CSV"
+    path.write_text("title,priority\nA,LOW\nB,HIGH\n", encoding="utf-8")
+
+    code = import_tasks.main([str(path), "--table", repository.table.name])
+
+    assert code == 0
+    assert json.loads(capsys.readouterr().out)["imported"] == 2
+    assert sorted(task.title for task in repository.list_tasks()) == ["A", "B"]
+
+
+def test_cli_fails_when_rows_fail(repository, tmp_path, capsys):
+    path = tmp_path / "tasks.txt"
+    path.write_text(json.dumps({"title": "A", "priority": "LOW"}) + "\nnot json\n", encoding="utf-8")
+
+    code = import_tasks.main([str(path), "--table", repository.table.name, "--format", "ndjson"])
+
+    report = json.loads(capsys.readouterr().out)
+    assert code == 1
+    assert (report["imported"], report["failed"]) == (1, 1)
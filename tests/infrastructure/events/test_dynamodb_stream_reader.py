@@ -0,0 +1,153 @@
+import threading
+from datetime import datetime, timezone
+
+import pytest
+from botocore.exceptions import ClientError, EndpointConnectionError
+
+from src.domains.models.task import Task
+from src.domains.models.task_event import TaskEventType
+from src.infrastructure.events.dynamodb_stream_reader import (
+    DynamoDBStreamTaskEventReader,
+    decode_stream_position,
+    encode_stream_position,
+)
+
+
+def test_reader_publishes_changes_after_start(repository, recording_bus):
+    before = Task.create(title="before", description="d", due_date="2025-01-01", priority="LOW")
+    repository.create_task(before)
+    reader = DynamoDBStreamTaskEventReader(repository.table.name, recording_bus)
+    reader.poll_once()
+
+    task = Task.create(title="t", description="d", due_date="2025-01-01", priority="LOW")
+    repository.create_task(task)
+    repository.update_task(task.model_copy(update={"title": "renamed"}))
+    repository.delete_task(str(task.id))
+    published = reader.poll_once()
+
+    assert published == 3
+    assert [e.type for e in recording_bus.events] == [
+        TaskEventType.CREATED,
+        TaskEventType.UPDATED,
+        TaskEventType.DELETED,
+    ]
+    assert {e.task_id for e in recording_bus.events} == {str(task.id)}
+    assert recording_bus.events[1].task.title == "renamed"
+    assert recording_bus.events[2].task is None
+
+
+def create(repository, title):
+    task = Task.create(title=title, description="d", due_date="2025-01-01", priority="LOW")
+    repository.create_task(task)
+    return task
+
+
+def test_event_ids_are_stream_positions_that_another_reader_can_resume_from(repository, recording_bus):
+    reader = DynamoDBStreamTaskEventReader(repository.table.name, recording_bus)
+    reader.poll_once()
+    tasks = [create(repository, f"t{i}") for i in range(3)]
+    reader.poll_once()
+    events = reader.bus.events
+
+    # 別の実行環境 (起動直後のリーダー) で、1件目の id から再開する
+    fresh = DynamoDBStreamTaskEventReader(repository.table.name, recording_bus)
+    replayed, position = fresh.replay(events[0].id)
+
+    assert [e.task_id for e in replayed] == [str(t.id) for t in tasks[1:]]
+    assert [e.id for e in replayed] == [e.id for e in events[1:]]
+    _, sequences = decode_stream_position(position)
+    assert sequences == {events[-1].shard_id: events[-1].sequence_number}
+    assert reader.bus.position == reader.position()
+
+
+def test_replay_reads_shards_without_position_from_as_of(repository, recording_bus):
+    before = datetime.now(timezone.utc)
+    task = create(repository, "t")
+    reader = DynamoDBStreamTaskEventReader(repository.table.name, recording_bus)
+
+    replayed, _ = reader.replay(encode_stream_position(int(before.timestamp() * 1000) - 1000, {}))
+    later, _ = reader.replay(encode_stream_position(int(datetime.now(timezone.utc).timestamp() * 1000) + 1000, {}))
+
+    assert [e.task_id for e in replayed] == [str(task.id)]
+    assert later == []
+    assert reader.replay("42") is None
+
+
+def test_expired_iterators_resume_after_the_last_sequence(repository, recording_bus):
+    reader = DynamoDBStreamTaskEventReader(repository.table.name, recording_bus)
+    reader.poll_once()
+    first = create(repository, "first")
+    reader.poll_once()
+    second = create(repository, "second")
+
+    reader._reopen_shards()
+    reader.poll_once()
+
+    assert [e.task_id for e in recording_bus.events] == [str(first.id), str(second.id)]
+    assert not recording_bus.lost
+
+
+def test_reader_marks_subscriptions_lost_when_it_cannot_resume(repository, monkeypatch, recording_bus):
+    reader = DynamoDBStreamTaskEventReader(repository.table.name, recording_bus)
+    reader.poll_once()
+    create(repository, "first")
+    reader.poll_once()
+
+    def expired(*args, **kwargs):
+        raise ClientError({"Error": {"Code": "TrimmedDataAccessException", "Message": "trimmed"}}, "GetShardIterator")
+
+    monkeypatch.setattr(reader, "_get_iterator", expired)
+    reader._reopen_shards()
+
+    assert recording_bus.lost
+    assert reader._sequences == {}
+
+
+def test_reader_caches_the_shard_list_between_polls(repository, monkeypatch, recording_bus):
+    reader = DynamoDBStreamTaskEventReader(repository.table.name, recording_bus)
+    calls = []
+    describe_stream = reader.streams.describe_stream
+    monkeypatch.setattr(reader.streams, "describe_stream", lambda **kw: calls.append(kw) or describe_stream(**kw))
+
+    reader.poll_once()
+    create(repository, "t")
+    reader.poll_once()
+    reader.poll_once()
+
+    assert len(calls) == 1
+    assert len(reader.bus.events) == 1
+
+
+def test_restarted_reader_starts_from_the_latest(repository, recording_bus):
+    reader = DynamoDBStreamTaskEventReader(repository.table.name, recording_bus, poll_interval=0.01)
+    reader.start()
+    reader.stop()
+    # 購読が無く止まっていた間の変更
+    create(repository, "while stopped")
+
+    reader.start()
+    reader.stop()
+    reader.poll_once()
+    task = create(repository, "after restart")
+    reader.poll_once()
+
+    assert [e.task_id for e in recording_bus.events] == [str(task.id)]
+
+
+def test_reader_keeps_polling_after_unexpected_errors(repository, monkeypatch, recording_bus):
+    reader = DynamoDBStreamTaskEventReader(repository.table.name, recording_bus, poll_interval=0)
+    stop = threading.Event()
+    calls = []
+
+    def poll_once():
+        calls.append(1)
+        if len(calls) == 1:
+            raise EndpointConnectionError(endpoint_url="https://streams.dynamodb")
+        stop.set()
+        return 0
+
+    monkeypatch.setattr(reader, "poll_once", poll_once)
+    reader._run(stop)
+
+    assert len(calls) == 2
+    assert recording_bus.lost
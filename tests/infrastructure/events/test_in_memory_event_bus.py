@@ -0,0 +1,148 @@
+import asyncio
+import threading
+
+from src.domains.models.task_event import TaskEvent, TaskEventType
+from src.infrastructure.events.in_memory_event_bus import InMemoryTaskEventBus
+
+
+def event(task_id="t1", type=TaskEventType.UPDATED):
+    return TaskEvent(type=type, task_id=task_id)
+
+
+def test_publish_assigns_sequential_ids():
+    bus = InMemoryTaskEventBus()
+
+    assert [bus.publish(event()).id for _ in range(3)] == ["1", "2", "3"]
+
+
+def test_subscriber_receives_events_published_from_other_threads():
+    bus = InMemoryTaskEventBus()
+
+    async def run():
+        subscription = bus.subscribe()
+        thread = threading.Thread(target=lambda: [bus.publish(event(f"t{i}")) for i in range(3)])
+        thread.start()
+        received = [await subscription.next_event(timeout=1) for _ in range(3)]
+        thread.join()
+        assert await subscription.next_event(timeout=0.01) is None
+        subscription.close()
+        return received
+
+    received = asyncio.run(run())
+
+    assert [e.task_id for e in received] == ["t0", "t1", "t2"]
+
+
+def test_resume_after_last_event_id():
+    bus = InMemoryTaskEventBus()
+    for i in range(5):
+        bus.publish(event(f"t{i}"))
+
+    async def run():
+        subscription = bus.subscribe(last_event_id="3")
+        bus.publish(event("t5"))
+        received = [await subscription.next_event(timeout=1) for _ in range(3)]
+        return subscription.lost, [e.id for e in received]
+
+    assert asyncio.run(run()) == (False, ["4", "5", "6"])
+
+
+def test_resume_reports_lost_events():
+    bus = InMemoryTaskEventBus(history_size=2)
+    for i in range(5):
+        bus.publish(event(f"t{i}"))
+
+    async def run():
+        subscription = bus.subscribe(last_event_id="1")
+        received = [await subscription.next_event(timeout=1) for _ in range(2)]
+        unknown = bus.subscribe(last_event_id="100")
+        return subscription.lost, [e.id for e in received], unknown.lost
+
+    assert asyncio.run(run()) == (True, ["4", "5"], True)
+
+
+def test_slow_subscriber_is_cut_off():
+    bus = InMemoryTaskEventBus(max_pending=2)
+
+    async def run():
+        subscription = bus.subscribe()
+        for i in range(4):
+            bus.publish(event(f"t{i}"))
+        await asyncio.sleep(0.01)
+        return subscription.overflowed, await subscription.next_event(timeout=0.01), len(bus._subscribers)
+
+    assert asyncio.run(run()) == (True, None, 0)
+
+
+def stream_event(task_id, seq):
+    return TaskEvent(
+        id=f"p{seq}", type=TaskEventType.UPDATED, task_id=task_id, shard_id="shard-1", sequence_number=str(seq)
+    )
+
+
+def test_mark_lost_reaches_open_subscriptions():
+    bus = InMemoryTaskEventBus()
+
+    async def run():
+        subscription = bus.subscribe()
+        bus.mark_lost()
+        return await subscription.next_event(timeout=1), subscription.lost
+
+    assert asyncio.run(run()) == (None, True)
+
+
+def test_resume_from_another_environment_replays_then_skips_duplicates():
+    bus = InMemoryTaskEventBus()
+    requested = []
+
+    def replay(position):
+        requested.append(position)
+        return [stream_event("t1", 1), stream_event("t2", 2)], "p2"
+
+    bus.set_replay_source(replay)
+
+    async def run():
+        subscription = bus.subscribe(last_event_id="p0")
+        # 読み直しと同時にライブで届いた変更は1回だけ配信する
+        bus.publish(stream_event("t2", 2))
+        bus.publish(stream_event("t3", 3))
+        received = [await subscription.next_event(timeout=1) for _ in range(3)]
+        return subscription.lost, [e.task_id for e in received], subscription.position
+
+    assert asyncio.run(run()) == (False, ["t1", "t2", "t3"], "p3")
+    assert requested == ["p0"]
+
+
+def test_resume_reports_lost_when_replay_is_not_possible():
+    bus = InMemoryTaskEventBus()
+    bus.set_replay_source(lambda position: None)
+    bus.publish_position("p9")
+
+    async def run():
+        subscription = bus.subscribe(last_event_id="p0")
+        return await subscription.next_event(timeout=1), subscription.lost, subscription.position
+
+    assert asyncio.run(run()) == (None, True, "p9")
+
+
+def test_activity_hooks_follow_the_first_and_last_subscription():
+    bus = InMemoryTaskEventBus()
+    calls = []
+    bus.set_activity_hooks(lambda: calls.append("active"), lambda: calls.append("idle"))
+    bus.publish(event())
+
+    async def run():
+        first = bus.subscribe()
+        second = bus.subscribe()
+        first.close()
+        first.close()
+        states = [list(calls)]
+        second.close()
+        states.append(list(calls))
+        bus.subscribe().close()
+        return states
+
+    assert asyncio.run(run()) == [["active"], ["active", "idle"]]
+    assert calls == ["active", "idle", "active", "idle"]
+    # 発行元が止まっていた間の変更は履歴に無いため、履歴は捨てる
+    assert len(bus._history) == 0
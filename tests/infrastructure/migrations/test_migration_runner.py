@@ -0,0 +1,140 @@
+import pytest
+
+from src.domains.models.task import Task
+from src.exceptions.errors import InvalidParameterError
+from src.infrastructure.migrations.runner import CapacityBudget, MigrationRunner
+from src.infrastructure.migrations.task_migrations import MIGRATIONS, TaskMigration
+from src.infrastructure.repositories.task_repository import TaskDynamoDBRepository
+
+
+@pytest.fixture
+def table(tasks_table):
+    for i in range(10):
+        tasks_table.put_item(
+            Item={
+                "id": f"550e8400-e29b-41d4-a716-4466554400{i:02d}",
+                "title": f"Task {i}",
+                "description": "Description",
+                "due_date": "2025/1/5",
+                "status": "TODO",
+                "priority": "HIGH",
+            }
+        )
+    return tasks_table
+
+
+def items(table):
+    return sorted(table.scan()["Items"], key=lambda item: item["id"])
+
+
+def test_dry_run_reports_changes_without_writing(table, repository):
+    before = items(table)
+
+    report = MigrationRunner(repository, MIGRATIONS, segments=3, dry_run=True).run()
+
+    assert items(table) == before
+    assert (report.scanned, report.migrated) == (10, 10)
+    assert report.changed_by_migration == {
+        "backfill_sync_attributes": 10,
+        "compact_encoding": 10,
+        "normalize_due_date": 10,
+    }
+    assert report.consumed_wcu == 10
+    assert report.completed_segments == [0, 1, 2]
+
+
+def test_run_migrates_items_and_second_run_is_a_no_op(table, repository):
+    report = MigrationRunner(repository, MIGRATIONS, segments=2, page_size=3).run()
+
+    assert report.migrated == 10
+    assert all(item["schema_version"] == 3 and item["due_date"] == "2025-01-05" for item in items(table))
+    assert [task.title for task in sorted(repository.list_tasks(), key=lambda t: t.title)][:2] == ["Task 0", "Task 1"]
+
+    again = MigrationRunner(repository, MIGRATIONS, segments=2).run()
+    assert (again.scanned, again.up_to_date, again.migrated) == (10, 10, 0)
+
+
+def test_target_version_and_unchanged_items_are_not_written(table, repository):
+    noop = TaskMigration(version=4, name="noop", transform=lambda item: item)
+    MigrationRunner(repository, MIGRATIONS).run()
+
+    report = MigrationRunner(repository, MIGRATIONS + [noop]).run()
+
+    assert (report.unchanged, report.migrated) == (10, 0)
+    assert all(item["schema_version"] == 3 for item in items(table))
+
+
+def test_concurrent_writes_are_reported_as_conflicts(table, repository):
+    def touch_then_rename(item):
+        # 移行が読み取った後にアプリケーションが書き込んだ状況を作る
+        if item["id"].endswith("00"):
+            table.update_item(
+                Key={"id": item["id"]},
+                UpdateExpression="SET updated_at = :now",
+                ExpressionAttributeValues={":now": "2025-01-01T00:00:00+00:00"},
+            )
+        return dict(item, title="renamed")
+
+    migration = TaskMigration(version=1, name="rename", transform=touch_then_rename)
+
+    report = MigrationRunner(repository, [migration]).run()
+
+    assert (report.migrated, report.conflicts) == (9, 1)
+    assert table.get_item(Key={"id": "550e8400-e29b-41d4-a716-446655440000"})["Item"]["title"] == "Task 0"
+
+
+def test_resumes_from_checkpoint_after_failure(table, repository, tmp_path, monkeypatch):
+    checkpoint = tmp_path / "checkpoint.json"
+    scan_items = repository.scan_items
+    calls = []
+
+    def fail_on_second_page(*args, **kwargs):
+        calls.append(kwargs.get("start_key"))
+        if len(calls) == 2:
+            raise RuntimeError("interrupted")
+        return scan_items(*args, **kwargs)
+
+    monkeypatch.setattr(repository, "scan_items", fail_on_second_page)
+    with pytest.raises(RuntimeError):
+        MigrationRunner(repository, MIGRATIONS, segments=1, page_size=4, checkpoint_path=str(checkpoint)).run()
+    assert checkpoint.exists()
+    assert sum(1 for item in items(table) if "schema_version" in item) == 4
+
+    monkeypatch.setattr(repository, "scan_items", scan_items)
+    report = MigrationRunner(repository, MIGRATIONS, segments=1, page_size=4, checkpoint_path=str(checkpoint)).run()
+
+    assert report.migrated == 10
+    assert all(item["schema_version"] == 3 for item in items(table))
+    assert not checkpoint.exists()
+    with pytest.raises(InvalidParameterError):
+        checkpoint.write_text('{"total_segments": 2, "target_version": 3}')
+        MigrationRunner(repository, MIGRATIONS, segments=1, checkpoint_path=str(checkpoint)).run()
+
+
+def test_capacity_budget_paces_callers():
+    now = [0.0]
+    slept = []
+
+    def sleep(seconds):
+        slept.append(seconds)
+        now[0] += seconds
+
+    budget = CapacityBudget(10, clock=lambda: now[0], sleep=sleep)
+    for _ in range(30):
+        budget.acquire(1)
+
+    # 最初の1秒分 (10) は待たずに使え、残り 20 ユニットに 2 秒かかる
+    assert now[0] == pytest.approx(2.0)
+    assert len(slept) == 20
+
+
+def test_content_changes_are_returned_by_list_changes(tasks_table):
+    repository = TaskDynamoDBRepository(tasks_table.name, sync_safety_window_seconds=0)
+    task = Task.create(title="t", description="d", due_date="2025/1/5", priority="LOW")
+    repository.create_task(task)
+    _, position, _ = repository.list_changes(None, 10)
+
+    MigrationRunner(repository, MIGRATIONS).run()
+    changes, _, _ = repository.list_changes(position, 10)
+
+    assert [(t.id, t.due_date) for t in changes] == [(task.id, "2025-01-05")]
@@ -0,0 +1,78 @@
+import pytest
+
+from src.infrastructure.migrations.task_migrations import (
+    MIGRATIONS,
+    backfill_sync_attributes,
+    compact_encoding,
+    normalize_due_date,
+)
+from src.infrastructure.repositories.task_item_codec import decode_task_item
+
+TASK_ID = "550e8400-e29b-41d4-a716-446655440001"
+
+LEGACY_ITEM = {
+    "id": TASK_ID,
+    "title": "Task 1",
+    "description": "説明" * 400,
+    "due_date": "2025/1/5",
+    "status": "IN_PROGRESS",
+    "priority": "URGENT",
+}
+
+
+def apply_all(item):
+    for migration in MIGRATIONS:
+        item = migration.transform(item)
+    return item
+
+
+def test_all_migrations_preserve_the_task_and_are_idempotent():
+    migrated = apply_all(dict(LEGACY_ITEM))
+
+    assert (migrated["status"], migrated["priority"]) == (1, 3)
+    assert isinstance(migrated["description"], bytes)
+    assert migrated["sync_key"].endswith("#" + TASK_ID)
+    assert apply_all(dict(migrated)) == migrated
+    task = decode_task_item(migrated)
+    assert (task.title, task.description, task.due_date) == ("Task 1", "説明" * 400, "2025-01-05")
+
+
+def test_backfill_keeps_existing_updated_at():
+    item = dict(LEGACY_ITEM, updated_at="2025-01-01T00:00:00+00:00")
+
+    migrated = backfill_sync_attributes(item)
+
+    assert migrated["updated_at"] == "2025-01-01T00:00:00+00:00"
+    assert migrated["sync_key"] == f"1735689600000#{TASK_ID}"
+
+
+def test_compact_encoding_leaves_short_text_as_string():
+    migrated = compact_encoding(dict(LEGACY_ITEM, description="short"))
+
+    assert migrated["description"] == "short"
+
+
+@pytest.mark.parametrize(
+    ("due_date", "expected"),
+    [
+        ("2025/1/5", "2025-01-05"),
+        ("2025年12月31日", "2025-12-31"),
+        ("2025.02.03", "2025-02-03"),
+        ("2025-02-30", "2025-02-30"),
+        ("next week", "next week"),
+        ("", ""),
+        (None, None),
+    ],
+)
+def test_normalize_due_date(due_date, expected):
+    assert normalize_due_date(dict(LEGACY_ITEM, due_date=due_date))["due_date"] == expected
+
+
+def test_normalize_due_date_marks_the_item_as_changed():
+    item = backfill_sync_attributes(dict(LEGACY_ITEM, updated_at="2025-01-01T00:00:00+00:00"))
+
+    migrated = normalize_due_date(item)
+
+    assert migrated["updated_at"] > item["updated_at"]
+    assert migrated["sync_key"] > item["sync_key"]
+    assert normalize_due_date(migrated) is migrated
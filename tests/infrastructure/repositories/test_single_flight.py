@@ -0,0 +1,157 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from src.core.metrics import metrics
+from src.domains.models.task import Task
+from src.exceptions.errors import DataNotFoundError
+from src.infrastructure.repositories.single_flight import AsyncSingleFlight, SingleFlight
+from src.infrastructure.repositories.task_repository import TaskDynamoDBRepository
+
+
+def test_single_flight_shares_result_between_concurrent_callers():
+    flight = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+    executions = []
+
+    def slow():
+        executions.append(1)
+        started.set()
+        release.wait(timeout=5)
+        return "value"
+
+    with ThreadPoolExecutor(max_workers=5) as pool:
+        leader = pool.submit(flight.do, "key", slow)
+        started.wait(timeout=5)
+        followers = [pool.submit(flight.do, "key", slow) for _ in range(4)]
+        # フォロワーが待機状態に入るまで待つ
+        while flight.stats().calls < 5:
+            time.sleep(0.001)
+        release.set()
+        results = [leader.result()] + [f.result() for f in followers]
+
+    assert results == ["value"] * 5
+    assert len(executions) == 1
+    stats = flight.stats()
+    assert stats.calls == 5
+    assert stats.executions == 1
+    assert stats.saved == 4
+
+
+def test_single_flight_propagates_errors_and_runs_again_after_completion():
+    flight = SingleFlight()
+
+    def fail():
+        raise DataNotFoundError(resource_name="Task")
+
+    with pytest.raises(DataNotFoundError):
+        flight.do("key", fail)
+
+    # 完了後の呼び出しは改めて実行される
+    assert flight.do("key", lambda: 1) == 1
+    assert flight.stats().executions == 2
+
+
+def test_async_single_flight_shares_result_between_concurrent_callers():
+    flight = AsyncSingleFlight()
+    executions = []
+
+    async def slow():
+        executions.append(1)
+        await asyncio.sleep(0.01)
+        return "value"
+
+    async def run():
+        return await asyncio.gather(*(flight.do("key", slow) for _ in range(10)))
+
+    results = asyncio.run(run())
+
+    assert results == ["value"] * 10
+    assert len(executions) == 1
+    assert flight.stats().saved == 9
+
+
+def test_async_single_flight_cancelled_waiter_does_not_cancel_others():
+    flight = AsyncSingleFlight()
+
+    async def slow():
+        await asyncio.sleep(0.01)
+        return "value"
+
+    async def run():
+        first = asyncio.ensure_future(flight.do("key", slow))
+        second = asyncio.ensure_future(flight.do("key", slow))
+        await asyncio.sleep(0)
+        first.cancel()
+        return await second
+
+    assert asyncio.run(run()) == "value"
+
+
+def test_repository_coalesces_concurrent_get_task(repository):
+    task = Task.create(title="popular", description="d", due_date="2025-01-01", priority="HIGH")
+    repository.create_task(task)
+
+    original_get_item = repository.table.get_item
+    calls = []
+
+    def slow_get_item(**kwargs):
+        calls.append(kwargs)
+        time.sleep(0.05)
+        return original_get_item(**kwargs)
+
+    repository.table.get_item = slow_get_item
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(lambda _: repository.get_task(str(task.id)), range(8)))
+
+    assert all(result.id == task.id for result in results)
+    assert len(calls) < 8
+    assert repository.coalescing_stats()["sync"].saved == 8 - len(calls)
+
+
+def test_repository_async_path(repository):
+    task = Task.create(title="popular", description="d", due_date="2025-01-01", priority="HIGH")
+    repository.create_task(task)
+
+    async def run():
+        return await asyncio.gather(
+            *(repository.get_task_async(str(task.id)) for _ in range(5)),
+            repository.list_tasks_async(),
+        )
+
+    *tasks, listed = asyncio.run(run())
+
+    assert all(result.id == task.id for result in tasks)
+    assert [t.id for t in listed] == [task.id]
+    stats = repository.coalescing_stats()
+    assert stats["async"].saved == 4
+    # asyncio 経路の呼び出しはスレッド経路の統計に二重に数えない
+    assert stats["sync"].calls == 0
+
+
+def test_followers_record_saved_calls_metric():
+    flight = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+    metrics._values.clear()
+
+    def slow():
+        started.set()
+        release.wait(timeout=5)
+        return "value"
+
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        leader = pool.submit(flight.do, "key", slow)
+        started.wait(timeout=5)
+        followers = [pool.submit(flight.do, "key", slow) for _ in range(2)]
+        while flight.stats().calls < 3:
+            time.sleep(0.001)
+        release.set()
+        [f.result() for f in [leader, *followers]]
+
+    assert metrics.snapshot()["coalescing.saved"] == [1, 1]
@@ -0,0 +1,136 @@
+import gzip
+from datetime import date, datetime, timezone
+
+import boto3
+import pytest
+from moto import mock_aws
+
+from src.domains.models.archive import ArchivePolicy
+from src.domains.models.task import Task, TaskPriority, TaskStatus
+from src.exceptions.errors import DataNotFoundError, InvalidParameterError
+from src.infrastructure.repositories.task_archive import LocalTaskArchive, S3TaskArchive
+from src.infrastructure.repositories.task_repository import TaskDynamoDBRepository
+
+
+@pytest.fixture
+def repository(tasks_table):
+    return TaskDynamoDBRepository(tasks_table.name, archive_policy=ArchivePolicy(retention_days=7))
+
+
+def make_task(title="t", status=TaskStatus.DONE):
+    task = Task.create(title=title, description="d", due_date="2025-01-01", priority="LOW")
+    return task.model_copy(update={"status": status})
+
+
+def test_local_archive_writes_date_partitioned_gzip_files(tmp_path):
+    archive = LocalTaskArchive(str(tmp_path))
+    first = [make_task("a"), make_task("b")]
+    second = [make_task("c")]
+
+    archive.archive_tasks(first, archived_at=datetime(2025, 1, 1, 12, tzinfo=timezone.utc))
+    archive.archive_tasks(second, archived_at=datetime(2025, 1, 2, 12, tzinfo=timezone.utc))
+    archive.archive_tasks([], archived_at=datetime(2025, 1, 3, 12, tzinfo=timezone.utc))
+
+    files = sorted(p.relative_to(tmp_path).as_posix() for p in tmp_path.rglob("*.jsonl.gz"))
+    assert [f.split("/")[0] for f in files] == ["dt=2025-01-01", "dt=2025-01-02"]
+    assert gzip.decompress((tmp_path / files[0]).read_bytes()).decode().count("\n") == 2
+
+    tasks, cursor = archive.list_archived_tasks(date(2025, 1, 1), date(2025, 1, 3))
+    assert [task.title for task in tasks] == ["a", "b", "c"]
+    assert cursor is None
+    assert archive.get_archived_task(str(second[0].id)).title == "c"
+    with pytest.raises(DataNotFoundError):
+        archive.get_archived_task("missing")
+
+
+def test_s3_archive_round_trip():
+    with mock_aws():
+        boto3.client("s3").create_bucket(
+            Bucket="archive", CreateBucketConfiguration={"LocationConstraint": "ap-northeast-1"}
+        )
+        archive = S3TaskArchive(bucket="archive")
+        task = make_task("a")
+
+        archive.archive_tasks([task], archived_at=datetime(2025, 1, 1, tzinfo=timezone.utc))
+
+        tasks, _ = archive.list_archived_tasks(date(2025, 1, 1), date(2025, 1, 1))
+        assert [t.id for t in tasks] == [task.id]
+        assert archive.get_archived_task(str(task.id)).title == "a"
+        with pytest.raises(DataNotFoundError):
+            archive.get_archived_task(str(make_task().id))
+
+
+def test_list_archived_tasks_pages_within_the_date_range(tmp_path, monkeypatch):
+    archive = LocalTaskArchive(str(tmp_path))
+    for day in range(1, 6):
+        tasks = [make_task(f"{day}-{i}") for i in range(3)]
+        archive.archive_tasks(tasks, archived_at=datetime(2025, 1, day, tzinfo=timezone.utc), batch_id=str(day))
+    read = []
+    original = archive._get
+    monkeypatch.setattr(archive, "_get", lambda key: read.append(key) or original(key))
+
+    titles, cursor = [], None
+    while True:
+        tasks, cursor = archive.list_archived_tasks(date(2025, 1, 2), date(2025, 1, 3), cursor, limit=2)
+        titles.extend(task.title for task in tasks)
+        if cursor is None:
+            break
+
+    assert titles == ["2-0", "2-1", "2-2", "3-0", "3-1", "3-2"]
+    assert {key.split("/")[0] for key in read} == {"dt=2025-01-02", "dt=2025-01-03"}
+    with pytest.raises(InvalidParameterError):
+        archive.list_archived_tasks(date(2025, 1, 2), date(2025, 1, 3), "broken")
+
+
+def test_get_archived_task_reads_only_the_indexed_file(tmp_path, monkeypatch):
+    archive = LocalTaskArchive(str(tmp_path))
+    tasks = [make_task(f"t{i}") for i in range(3)]
+    for i, task in enumerate(tasks):
+        archive.archive_tasks([task], archived_at=datetime(2025, 1, i + 1, tzinfo=timezone.utc), batch_id=str(i))
+    read = []
+    get = archive._get
+    monkeypatch.setattr(archive, "_get", lambda key: read.append(key) or get(key))
+
+    assert archive.get_archived_task(str(tasks[1].id)).title == "t1"
+    assert read == [f"index/{tasks[1].id}", "dt=2025-01-02/000000-1.jsonl.gz"]
+    with pytest.raises(DataNotFoundError):
+        archive.get_archived_task("../../etc/passwd")
+
+
+def test_archive_policy_expires_only_done_tasks():
+    policy = ArchivePolicy(retention_days=2)
+    completed_at = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+    assert policy.expires_at(make_task(status=TaskStatus.DONE), completed_at) == int(completed_at.timestamp()) + 172800
+    assert policy.expires_at(make_task(status=TaskStatus.TODO), completed_at) is None
+
+
+def test_repository_sets_ttl_on_completion(repository, tasks_table):
+    # Arrange
+    task = make_task(status=TaskStatus.TODO)
+    repository.create_task(task)
+    assert "ttl" not in tasks_table.get_item(Key={"id": str(task.id)})["Item"]
+
+    # Act
+    repository.update_task(task.model_copy(update={"status": TaskStatus.DONE}))
+
+    # Assert
+    ttl = tasks_table.get_item(Key={"id": str(task.id)})["Item"]["ttl"]
+    assert ttl > datetime.now(timezone.utc).timestamp() + 6 * 86400
+
+    # 完了のまま更新しても退避時刻は変わらない
+    repository.update_task(task.model_copy(update={"status": TaskStatus.DONE, "title": "renamed"}))
+    assert tasks_table.get_item(Key={"id": str(task.id)})["Item"]["ttl"] == ttl
+
+    # 未完了に戻すと TTL は外れる
+    repository.update_task(task.model_copy(update={"status": TaskStatus.IN_PROGRESS}))
+    assert "ttl" not in tasks_table.get_item(Key={"id": str(task.id)})["Item"]
+
+
+def test_repository_sets_ttl_when_created_done(repository, tasks_table):
+    task = make_task(status=TaskStatus.DONE)
+
+    repository.create_task(task)
+
+    assert "ttl" in tasks_table.get_item(Key={"id": str(task.id)})["Item"]
+    assert repository.get_task(str(task.id)).priority == TaskPriority.LOW
@@ -0,0 +1,155 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from src.domains.models.task import Task, TaskStatus
+from src.exceptions.errors import DataNotFoundError, InvalidParameterError, SyncTokenExpiredError
+from src.infrastructure.repositories.task_repository import TaskDynamoDBRepository, sync_key
+
+
+def create_tasks(repository, count):
+    start = datetime.now(timezone.utc) - timedelta(minutes=1)
+    tasks = []
+    for i in range(count):
+        task = Task.create(title=f"task {i}", description="d", due_date="2025-01-01", priority="LOW")
+        task.updated_at = start + timedelta(seconds=i)
+        repository.create_task(task)
+        tasks.append(task)
+    return tasks
+
+
+def test_list_changes_pages_through_all_shards_in_order(repository):
+    tasks = create_tasks(repository, 7)
+
+    first, position, has_more = repository.list_changes(None, 3)
+    assert [t.id for t in first] == [t.id for t in tasks[:3]]
+    assert has_more
+
+    rest, position, has_more = repository.list_changes(position, 10)
+    assert [t.id for t in rest] == [t.id for t in tasks[3:]]
+    assert not has_more
+
+    empty, next_position, has_more = repository.list_changes(position, 10)
+    assert empty == []
+    assert next_position >= position
+    assert not has_more
+
+
+def test_list_changes_advances_an_idle_position_to_the_safety_window(repository):
+    now = datetime.now(timezone.utc)
+    idle = sync_key(now - timedelta(days=20), "x")
+
+    changes, position, has_more = repository.list_changes(idle, 10)
+
+    assert (changes, has_more) == ([], False)
+    assert sync_key(now - timedelta(seconds=10), "") < position < sync_key(now - timedelta(seconds=4), "")
+
+
+def test_list_changes_returns_updates_and_tombstones(repository):
+    tasks = create_tasks(repository, 3)
+    _, position, _ = repository.list_changes(None, 10)
+
+    repository.update_task(tasks[0].model_copy(update={"status": TaskStatus.DONE, "updated_at": None}))
+    repository.delete_task(str(tasks[1].id))
+    changes, _, _ = repository.list_changes(position, 10)
+
+    assert {str(t.id): t.deleted for t in changes} == {str(tasks[0].id): False, str(tasks[1].id): True}
+
+
+def test_tombstones_are_hidden_from_reads_and_writes(repository):
+    tasks = create_tasks(repository, 2)
+    repository.delete_task(str(tasks[0].id))
+
+    assert [t.id for t in repository.list_tasks()] == [tasks[1].id]
+    with pytest.raises(DataNotFoundError):
+        repository.get_task(str(tasks[0].id))
+    with pytest.raises(DataNotFoundError):
+        repository.update_task(tasks[0])
+    with pytest.raises(DataNotFoundError):
+        repository.delete_task(str(tasks[0].id))
+
+
+def test_write_tombstones_reports_archived_tasks_as_deleted(repository):
+    tasks = create_tasks(repository, 1)
+    _, position, _ = repository.list_changes(None, 10)
+
+    repository.write_tombstones(tasks)
+    changes, _, _ = repository.list_changes(position, 10)
+
+    assert [(t.id, t.deleted) for t in changes] == [(tasks[0].id, True)]
+
+
+def test_list_changes_rejects_positions_older_than_tombstone_retention(repository):
+    expired = sync_key(datetime.now(timezone.utc) - timedelta(days=31), "x")
+
+    with pytest.raises(SyncTokenExpiredError):
+        repository.list_changes(expired, 10)
+    with pytest.raises(InvalidParameterError):
+        repository.list_changes("not-a-position", 10)
+
+
+def test_list_changes_returns_writes_committed_late_with_earlier_timestamps(repository):
+    now = datetime.now(timezone.utc)
+    later = Task.create(title="B", description="d", due_date="2025-01-01", priority="LOW")
+    later.updated_at = now
+    repository.create_task(later)
+
+    first, position, _ = repository.list_changes(None, 10)
+    assert [t.id for t in first] == [later.id]
+
+    # 時計の遅れたサーバーが、B より前の時刻で後から書き込む
+    earlier = Task.create(title="A", description="d", due_date="2025-01-01", priority="LOW")
+    earlier.updated_at = now - timedelta(milliseconds=50)
+    repository.create_task(earlier)
+    changes, _, _ = repository.list_changes(position, 10)
+
+    assert [t.id for t in changes] == [earlier.id, later.id]
+
+
+def test_list_changes_does_not_advance_past_the_safety_window(repository):
+    tasks = create_tasks(repository, 2)
+    recent = Task.create(title="recent", description="d", due_date="2025-01-01", priority="LOW")
+    repository.create_task(recent)
+
+    changes, position, has_more = repository.list_changes(None, 10)
+
+    assert [t.id for t in changes] == [t.id for t in tasks] + [recent.id]
+    assert not has_more
+    assert position < sync_key(datetime.now(timezone.utc) - timedelta(seconds=4), "")
+    again, _, _ = repository.list_changes(position, 10)
+    assert [t.id for t in again] == [recent.id]
+
+
+def test_list_changes_does_not_skip_a_shard_cut_short_by_the_size_limit(repository):
+    start = datetime.now(timezone.utc) - timedelta(minutes=10)
+    expected = set()
+    for i in range(80):
+        task = Task.create(title=f"task {i}", description="d", due_date="2025-01-01", priority="LOW")
+        task.updated_at = start + timedelta(seconds=i)
+        repository.create_task(task)
+        expected.add(task.id)
+
+    query = repository.table.query
+
+    def query_with_size_limit(**kwargs):
+        # シャード 0 だけ、1MB に達したように3件で打ち切る
+        response = query(**kwargs)
+        shard = kwargs["KeyConditionExpression"].get_expression()["values"][0].get_expression()["values"][1]
+        if shard == 0 and len(response["Items"]) > 3:
+            items = response["Items"][:3]
+            last = items[-1]
+            response = dict(
+                response,
+                Items=items,
+                LastEvaluatedKey={"id": last["id"], "sync_shard": last["sync_shard"], "sync_key": last["sync_key"]},
+            )
+        return response
+
+    repository.table.query = query_with_size_limit
+
+    received, position, has_more = set(), None, True
+    while has_more:
+        changes, position, has_more = repository.list_changes(position, 20)
+        received.update(t.id for t in changes)
+
+    assert received == expected
@@ -0,0 +1,85 @@
+import zlib
+from decimal import Decimal
+
+import pytest
+from boto3.dynamodb.types import Binary, TypeSerializer
+from pydantic import ValidationError
+
+from src.domains.models.task import Task, TaskPriority, TaskStatus
+from src.infrastructure.repositories.task_item_codec import (
+    decode_task_attribute_values,
+    decode_task_item,
+    encode_task_attributes,
+    encode_text,
+)
+
+TASK_ID = "550e8400-e29b-41d4-a716-446655440001"
+
+
+def test_encode_text_compresses_only_large_compressible_text():
+    assert encode_text("short", compress_threshold=16) == "short"
+    assert isinstance(encode_text("a" * 100, compress_threshold=16), bytes)
+    # 圧縮しても小さくならないテキストは文字列のまま
+    assert encode_text("abcdefghijklmnopq", compress_threshold=16) == "abcdefghijklmnopq"
+    assert encode_text(None) is None
+
+
+def test_round_trip_as_read_by_boto3():
+    task = Task(id=TASK_ID, title="t", description="説明" * 500, status=TaskStatus.IN_PROGRESS, priority="MEDIUM")
+    encoded = encode_task_attributes(task)
+    # boto3 の resource は N を Decimal、B を Binary として返す
+    item = {
+        "id": TASK_ID,
+        "title": encoded["title"],
+        "description": Binary(encoded["description"]),
+        "status": Decimal(encoded["status"]),
+        "priority": Decimal(encoded["priority"]),
+    }
+
+    assert decode_task_item(item) == task
+
+
+def test_decodes_items_written_before_compact_encoding():
+    item = {"id": TASK_ID, "title": "t", "description": "d", "status": "DONE", "priority": "HIGH"}
+
+    task = decode_task_item(item)
+
+    assert (task.status, task.priority) == (TaskStatus.DONE, TaskPriority.HIGH)
+
+
+def test_unknown_codes_fail_validation():
+    with pytest.raises(ValidationError):
+        decode_task_item({"id": TASK_ID, "title": "t", "status": Decimal(9), "priority": Decimal(0)})
+
+
+def low_level(item: dict) -> dict:
+    serializer = TypeSerializer()
+    return {name: serializer.serialize(value) for name, value in item.items()}
+
+
+@pytest.mark.parametrize(
+    "item",
+    [
+        {"id": TASK_ID, "title": "t", "description": "d", "due_date": None, "status": "DONE", "priority": "HIGH"},
+        {
+            "id": TASK_ID,
+            "title": "t",
+            "description": zlib.compress(("説明" * 500).encode("utf-8")),
+            "status": 1,
+            "priority": 3,
+            "updated_at": "2025-01-01T00:00:00+00:00",
+            "deleted": True,
+            "sync_shard": 2,
+        },
+        {"id": TASK_ID, "title": "t", "priority": 0},
+    ],
+)
+def test_fast_decoder_matches_validated_decoder(item):
+    fast = decode_task_attribute_values(low_level(item))
+
+    assert fast.model_dump() == decode_task_item(item).model_dump()
+
+
+def test_fast_decoder_falls_back_to_validation():
+    with pytest.raises(ValidationError):
+        decode_task_attribute_values(low_level({"id": "not-a-uuid", "title": "t", "priority": "LOW"}))
@@ -1,6 +1,5 @@
-import boto3
 import pytest
-from moto import mock_aws
+from boto3.dynamodb.types import Binary
 
 from src.domains.models.task import Task, TaskPriority, TaskStatus
 from src.exceptions.errors import DataAccessError, DataNotFoundError, InvalidParameterError
@@ -8,26 +7,6 @@ from src.infrastructure.repositories.task_repository import TaskDynamoDBReposito
 
 # filepath: src/repositories/test_task_repository.py
 
-TABLE_NAME = "Tasks"
-
-
-@pytest.fixture
-def dynamodb_mock():
-    with mock_aws():
-        dynamodb = boto3.resource("dynamodb")
-        table = dynamodb.create_table(
-            TableName=TABLE_NAME,
-            KeySchema=[{"AttributeName": "id", "KeyType": "HASH"}],
-            AttributeDefinitions=[{"AttributeName": "id", "AttributeType": "S"}],
-            ProvisionedThroughput={"ReadCapacityUnits": 5, "WriteCapacityUnits": 5},
-        )
-        yield table
-
-
-@pytest.fixture
-def repository(dynamodb_mock):
-    return TaskDynamoDBRepository(TABLE_NAME)
-
 
 def test_create_task(repository):
     # Arrange
@@ -52,9 +31,9 @@ def test_create_task(repository):
         repository.get_task("non-existent-id")
 
 
-def test_delete_task(repository, dynamodb_mock):
+def test_delete_task(repository, tasks_table):
     # Arrange
-    dynamodb_mock.put_item(
+    tasks_table.put_item(
         Item={
             "id": "550e8400-e29b-41d4-a716-446655440001",
             "title": "Task 1",
@@ -73,9 +52,9 @@ def test_delete_task(repository, dynamodb_mock):
         repository.delete_task("550e8400-e29b-41d4-a716-446655440001")
 
 
-def test_get_task(repository, dynamodb_mock):
+def test_get_task(repository, tasks_table):
     # Arrange
-    dynamodb_mock.put_item(
+    tasks_table.put_item(
         Item={
             "id": "550e8400-e29b-41d4-a716-446655440001",
             "title": "Task 1",
@@ -95,9 +74,9 @@ def test_get_task(repository, dynamodb_mock):
     assert task.description == "Description 1"
 
 
-def test_update_task(repository, dynamodb_mock):
+def test_update_task(repository, tasks_table):
     # Arrange
-    dynamodb_mock.put_item(
+    tasks_table.put_item(
         Item={
             "id": "550e8400-e29b-41d4-a716-446655440001",
             "title": "Task 1",
@@ -141,7 +120,7 @@ def test_update_task(repository, dynamodb_mock):
         repository.update_task(non_exist_updated_task)
 
 
-def test_list_tasks(repository, dynamodb_mock):
+def test_list_tasks(repository, tasks_table):
     # Arrange
     item_1 = {
         "id": "550e8400-e29b-41d4-a716-446655440000",
@@ -159,8 +138,8 @@ def test_list_tasks(repository, dynamodb_mock):
         "status": "DONE",
         "priority": "LOW",
     }
-    dynamodb_mock.put_item(Item=item_1)
-    dynamodb_mock.put_item(Item=item_2)
+    tasks_table.put_item(Item=item_1)
+    tasks_table.put_item(Item=item_2)
 
     # Act
     tasks = repository.list_tasks()
@@ -171,3 +150,54 @@ def test_list_tasks(repository, dynamodb_mock):
     assert tasks[0].title == item_1["title"]
     assert str(tasks[1].id) == item_2["id"]
     assert tasks[1].title == item_2["title"]
+
+
+def test_batch_create_tasks(repository):
+    # Arrange
+    tasks = [Task.create(title=f"Task {i}", description="d", due_date="2025-12-31", priority="LOW") for i in range(30)]
+
+    # Act
+    repository.batch_create_tasks(tasks)
+
+    # Assert
+    result = repository.list_tasks()
+    assert len(result) == 30
+    assert {task.title for task in result} == {task.title for task in tasks}
+
+
+def test_create_task_stores_compact_item(repository, tasks_table):
+    description = "長い説明文です。" * 200
+    task = Task.create(title="Task 1", description=description, due_date="2025-12-31", priority="URGENT")
+
+    repository.create_task(task)
+
+    item = tasks_table.get_item(Key={"id": str(task.id)})["Item"]
+    assert item["title"] == "Task 1"
+    assert isinstance(item["description"], Binary)
+    assert len(item["description"].value) < len(description.encode("utf-8"))
+    assert (item["status"], item["priority"]) == (0, 3)
+    stored = repository.get_task(str(task.id))
+    assert (stored.description, stored.status, stored.priority) == (description, TaskStatus.TODO, TaskPriority.URGENT)
+
+
+def test_list_tasks_fast_reads_matches_resource_path(repository, tasks_table):
+    tasks_table.put_item(
+        Item={
+            "id": "550e8400-e29b-41d4-a716-446655440001",
+            "title": "Task 1",
+            "description": "Description 1",
+            "due_date": "2025-12-31",
+            "status": "TODO",
+            "priority": "HIGH",
+        }
+    )
+    repository.create_task(Task.create(title="Task 2", description="長い説明" * 300, due_date="", priority="LOW"))
+    deleted = Task.create(title="Task 3", description="", due_date="", priority="LOW")
+    repository.create_task(deleted)
+    repository.delete_task(str(deleted.id))
+
+    fast = TaskDynamoDBRepository(tasks_table.name, fast_reads=True).list_tasks()
+
+    by_id = lambda tasks: {str(t.id): t.model_dump() for t in tasks}  # noqa: E731
+    assert by_id(fast) == by_id(repository.list_tasks())
+    assert len(fast) == 2
@@ -0,0 +1,48 @@
+from datetime import datetime, timezone
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.core.auth import get_current_user
+from src.domains.models.task import Task
+from src.infrastructure.repositories.task_archive import LocalTaskArchive
+from src.main import app
+from src.routers.task import get_task_service
+from src.usecase.task_handler import TaskManager
+
+
+@pytest.fixture
+def archive(tmp_path):
+    archive = LocalTaskArchive(str(tmp_path))
+    for day in (1, 2):
+        tasks = [Task.create(title=f"{day}-{i}", description="", due_date="", priority="LOW") for i in range(2)]
+        archive.archive_tasks(tasks, archived_at=datetime(2025, 1, day, tzinfo=timezone.utc))
+    return archive
+
+
+@pytest.fixture
+def client(fake_repository, archive):
+    service = TaskManager(fake_repository, archive=archive)
+    app.dependency_overrides[get_task_service] = lambda: service
+    app.dependency_overrides[get_current_user] = lambda: {"username": "tester"}
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+
+
+def test_archived_pages_through_the_date_range(client):
+    first = client.get("/tasks/archived", params={"from": "2025-01-01", "to": "2025-01-02", "limit": 3}).json()
+    second = client.get(
+        "/tasks/archived", params={"from": "2025-01-01", "to": "2025-01-02", "cursor": first["next_cursor"]}
+    ).json()
+
+    assert [task["title"] for task in first["tasks"]] == ["1-0", "1-1", "2-0"]
+    assert [task["title"] for task in second["tasks"]] == ["2-1"]
+    assert second["next_cursor"] is None
+
+
+@pytest.mark.parametrize(
+    "params",
+    [{"from": "2025-01-02", "to": "2025-01-01"}, {"from": "2025-01-01", "to": "2025-03-01"}, {"cursor": "broken"}],
+)
+def test_archived_rejects_invalid_parameters(client, params):
+    assert client.get("/tasks/archived", params=params).status_code == 400
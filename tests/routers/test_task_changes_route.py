@@ -0,0 +1,35 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from src.core.auth import get_current_user
+from src.exceptions.errors import SyncTokenExpiredError
+from src.main import app
+from src.routers.task import get_task_service
+from src.usecase.task_handler import TaskManager, encode_sync_token
+
+
+@pytest.fixture
+def client(fake_repository, monkeypatch):
+    def list_changes(since, limit):
+        if since is not None:
+            raise SyncTokenExpiredError()
+        return [], "0000000000001#a", False
+
+    monkeypatch.setattr(fake_repository, "list_changes", list_changes)
+    service = TaskManager(fake_repository)
+    app.dependency_overrides[get_task_service] = lambda: service
+    app.dependency_overrides[get_current_user] = lambda: {"username": "tester"}
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+
+
+def test_changes_returns_next_token(client):
+    response = client.get("/tasks/changes")
+
+    assert response.status_code == 200
+    assert response.json() == {"changes": [], "next_token": encode_sync_token("0000000000001#a"), "has_more": False}
+
+
+@pytest.mark.parametrize(("since", "status"), [(encode_sync_token("0000000000001#a"), 410), ("%%%", 400)])
+def test_changes_maps_token_errors(client, since, status):
+    assert client.get("/tasks/changes", params={"since": since}).status_code == status
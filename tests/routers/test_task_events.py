@@ -0,0 +1,80 @@
+import threading
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.core.auth import get_current_user
+from src.core.config import get_settings
+from src.infrastructure.events.in_memory_event_bus import InMemoryTaskEventBus
+from src.main import app
+from src.routers.dto.task import CreateTaskRequest
+from src.routers.task import get_task_service
+from src.usecase.task_handler import TaskManager
+
+
+@pytest.fixture
+def service(fake_repository, monkeypatch):
+    settings = get_settings()
+    monkeypatch.setattr(settings, "sse_heartbeat_seconds", 0.05)
+    monkeypatch.setattr(settings, "sse_max_duration_seconds", 0.3)
+    service = TaskManager(fake_repository, event_bus=InMemoryTaskEventBus())
+    app.dependency_overrides[get_task_service] = lambda: service
+    app.dependency_overrides[get_current_user] = lambda: {"username": "tester"}
+    yield service
+    app.dependency_overrides.clear()
+
+
+def read_stream(headers=None):
+    with TestClient(app) as client:
+        with client.stream("GET", "/tasks/events", headers=headers or {}) as response:
+            assert response.status_code == 200
+            assert response.headers["content-type"].startswith("text/event-stream")
+            return response.read().decode()
+
+
+def test_stream_replays_after_last_event_id_and_sends_heartbeats(service):
+    first = service.create_task(CreateTaskRequest(title="first", priority="LOW"))
+    second = service.create_task(CreateTaskRequest(title="second", priority="LOW"))
+    service.delete_task(str(first.id))
+
+    body = read_stream({"Last-Event-ID": "1"})
+
+    assert body.startswith("retry: 3000\n\n")
+    assert "event: reset" not in body
+    assert "id: 2\nevent: created\ndata: " in body
+    assert str(second.id) in body
+    assert f'id: 3\nevent: deleted\ndata: {{"id":"3","type":"deleted","task_id":"{first.id}"' in body
+    assert "id: 1\n" not in body
+    assert ": heartbeat\n\n" in body
+
+
+def test_stream_delivers_live_events(service):
+    timer = threading.Timer(0.1, lambda: service.create_task(CreateTaskRequest(title="live", priority="LOW")))
+    timer.start()
+
+    body = read_stream()
+    timer.join()
+
+    assert "event: created" in body
+    assert '"title":"live"' in body
+
+
+def test_stream_requests_reset_when_history_is_gone(service):
+    body = read_stream({"Last-Event-ID": "42"})
+
+    assert "event: reset\ndata: {}\n\n" in body
+
+
+def test_stream_sends_position_with_heartbeat_and_resets_when_events_are_lost(service):
+    bus = service.event_bus
+    timer = threading.Timer(0.1, lambda: bus.publish_position("1700000000000/shard-1:5"))
+    lost = threading.Timer(0.2, bus.mark_lost)
+    timer.start()
+    lost.start()
+
+    body = read_stream()
+    timer.join()
+    lost.join()
+
+    assert ": heartbeat\n\nid: 1700000000000/shard-1:5\n\n" in body
+    assert "id: 1700000000000/shard-1:5\nevent: reset\ndata: {}\n\n" in body
@@ -0,0 +1,48 @@
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.core.auth import get_current_user
+from src.main import app
+from src.routers.task import get_task_importer
+from src.usecase.task_importer import TaskImporter
+
+
+@pytest.fixture
+def client(repository):
+    importer = TaskImporter(repository, workers=2, batch_size=10)
+    app.dependency_overrides[get_task_importer] = lambda: importer
+    app.dependency_overrides[get_current_user] = lambda: {"username": "tester"}
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+
+
+def test_import_ndjson(client, repository):
+    body = "".join(json.dumps({"title": f"Task {i}", "priority": "LOW"}) + "\n" for i in range(25))
+
+    response = client.post(
+        "/tasks/import", content=body.encode(), headers={"Content-Type": "application/x-ndjson; charset=utf-8"}
+    )
+
+    assert response.status_code == 200
+    assert response.json()["imported"] == 25
+    assert len(repository.list_tasks()) == 25
+
+
+def test_import_csv_reports_row_errors(client, repository):
+    body = "title,priority\nタスク,HIGH\n,LOW\n"
+
+    response = client.post("/tasks/import", content=body.encode(), headers={"Content-Type": "text/csv"})
+
+    report = response.json()
+    assert response.status_code == 200
+    assert (report["processed"], report["imported"], report["failed"]) == (2, 1, 1)
+    assert report["errors"][0]["row"] == 3
+    assert [task.title for task in repository.list_tasks()] == ["タスク"]
+
+
+def test_import_rejects_unknown_content_type(client):
+    response = client.post("/tasks/import", content=b"{}", headers={"Content-Type": "application/json"})
+
+    assert response.status_code == 415
@@ -1,41 +1,18 @@
+from datetime import date
+
 import pytest
 
-from src.domains.interfaces.task_repository import ITaskRepository
+from src.domains.interfaces.task_archive import ITaskArchive
 from src.domains.models.task import Task, TaskPriority, TaskStatus
-from src.exceptions.errors import DataNotFoundError
+from src.domains.models.task_event import TaskEventType
+from src.exceptions.errors import DataNotFoundError, InvalidParameterError, ServiceUnavailableError
 from src.routers.dto.task import CreateTaskRequest, UpdateTaskRequest
-from src.usecase.task_handler import TaskManager
-
-
-class FakeRepository(ITaskRepository):
-    def __init__(self):
-        self.tasks = {}
-
-    def list_tasks(self):
-        return list(self.tasks.values())
-
-    def create_task(self, task):
-        self.tasks[task.id] = task
-
-    def get_task(self, task_id):
-        if task_id not in self.tasks:
-            raise DataNotFoundError(resource_name="Task")
-        return self.tasks[task_id]
-
-    def update_task(self, updated_task):
-        if updated_task.id not in self.tasks:
-            raise DataNotFoundError(resource_name="Task")
-        self.tasks[updated_task.id] = updated_task
-
-    def delete_task(self, task_id):
-        if task_id not in self.tasks:
-            raise DataNotFoundError()
-        del self.tasks[task_id]
+from src.usecase.task_handler import TaskManager, decode_sync_token, encode_sync_token
 
 
 @pytest.fixture
-def service():
-    return TaskManager(FakeRepository())
+def service(fake_repository):
+    return TaskManager(fake_repository)
 
 
 import uuid
@@ -68,7 +45,7 @@ def test_create_task(service):
 
 
 def test_list_tasks(service):
-    # FakeRepositoryにタスクを追加
+    # InMemoryTaskRepositoryにタスクを追加
     service.create_task(make_task_request(title="Task 1"))
     service.create_task(make_task_request(title="Task 2"))
 
@@ -116,3 +93,92 @@ def test_delete_task(service):
 
     with pytest.raises(DataNotFoundError):
         service.get_task(pre_res[0].id)
+
+
+class FakeArchive(ITaskArchive):
+    def __init__(self, tasks):
+        self.tasks = tasks
+
+    def archive_tasks(self, tasks, archived_at, batch_id=None):
+        self.tasks.extend(tasks)
+
+    def list_archived_tasks(self, archived_from, archived_to, cursor=None, limit=100):
+        return self.tasks[:limit], "next" if len(self.tasks) > limit else None
+
+    def get_archived_task(self, task_id):
+        for task in self.tasks:
+            if str(task.id) == task_id:
+                return task
+        raise DataNotFoundError(resource_name="Task")
+
+
+def test_include_archived(fake_repository):
+    archived = make_task(title="archived", status=TaskStatus.DONE)
+    service = TaskManager(fake_repository, archive=FakeArchive([archived]))
+    service.create_task(make_task_request(title="active"))
+
+    assert [task.title for task in service.list_tasks()] == ["active"]
+    page = service.list_archived_tasks(date(2025, 1, 1), date(2025, 1, 31))
+    assert [task.title for task in page.tasks] == ["archived"]
+    assert page.next_cursor is None
+
+    with pytest.raises(DataNotFoundError):
+        service.get_task(str(archived.id))
+    assert service.get_task(str(archived.id), include_archived=True).title == "archived"
+
+
+def test_list_archived_tasks_rejects_invalid_ranges(fake_repository):
+    service = TaskManager(fake_repository, archive=FakeArchive([]))
+
+    with pytest.raises(InvalidParameterError):
+        service.list_archived_tasks(date(2025, 1, 2), date(2025, 1, 1))
+    with pytest.raises(InvalidParameterError):
+        service.list_archived_tasks(date(2025, 1, 1), date(2025, 2, 1))
+    with pytest.raises(ServiceUnavailableError):
+        TaskManager(fake_repository).list_archived_tasks(date(2025, 1, 1), date(2025, 1, 1))
+
+
+def test_writes_publish_events(fake_repository, recording_bus):
+    service = TaskManager(fake_repository, event_bus=recording_bus)
+
+    created = service.create_task(make_task_request(title="t"))
+    service.update_task(
+        created.id,
+        UpdateTaskRequest(title="u", description="d", due_date="2025-01-02", status="DONE", priority="LOW"),
+    )
+    service.delete_task(created.id)
+
+    assert [(e.type, e.task_id) for e in recording_bus.events] == [
+        (TaskEventType.CREATED, str(created.id)),
+        (TaskEventType.UPDATED, str(created.id)),
+        (TaskEventType.DELETED, str(created.id)),
+    ]
+    assert recording_bus.events[1].task.title == "u"
+
+
+def test_writes_do_not_publish_when_events_come_from_stream(fake_repository, recording_bus):
+    service = TaskManager(fake_repository, event_bus=recording_bus, publish_events=False)
+
+    service.create_task(make_task_request(title="t"))
+
+    assert recording_bus.events == []
+
+
+def test_list_changes_wraps_positions_in_opaque_tokens(service):
+    service.create_task(make_task_request(title="first"))
+    service.create_task(make_task_request(title="second"))
+
+    first = service.list_changes(limit=1)
+    second = service.list_changes(first.next_token, limit=5)
+
+    assert [t.title for t in first.changes] == ["first"]
+    assert first.has_more
+    assert decode_sync_token(first.next_token) == "1"
+    assert [t.title for t in second.changes] == ["second"]
+    assert not second.has_more
+
+
+@pytest.mark.parametrize("token", ["%%%", encode_sync_token("x")[:-3], "eyJ2IjoyLCJrIjoieCJ9"])
+def test_list_changes_rejects_malformed_tokens(service, token):
+    with pytest.raises(InvalidParameterError):
+        service.list_changes(token)
@@ -0,0 +1,112 @@
+import io
+import json
+
+from src.domains.models.task import TaskPriority
+from src.exceptions.errors import DataAccessError, DataNotFoundError
+from src.usecase.task_importer import TaskImporter
+
+
+def ndjson(*rows):
+    return io.StringIO("".join(json.dumps(row) + "\n" for row in rows))
+
+
+def test_import_ndjson_in_batches(fake_repository):
+    importer = TaskImporter(fake_repository, workers=3, batch_size=10, max_pending_batches=2)
+    rows = [{"title": f"Task {i}", "priority": "LOW"} for i in range(95)]
+
+    report = importer.import_stream(ndjson(*rows), "ndjson")
+
+    assert report.processed == 95
+    assert report.imported == 95
+    assert report.failed == 0
+    assert sorted(fake_repository.batches) == [5] + [10] * 9
+    assert {task.title for task in fake_repository.list_tasks()} == {row["title"] for row in rows}
+
+
+def test_import_csv(fake_repository):
+    importer = TaskImporter(fake_repository)
+    stream = io.StringIO(
+        'title,description,due_date,priority\r\nTask 1,first,2025-01-01,HIGH\r\nTask 2,"multi\nline",,URGENT\r\n'
+    )
+
+    report = importer.import_stream(stream, "csv")
+
+    assert report.imported == 2
+    tasks = {task.title: task for task in fake_repository.list_tasks()}
+    assert tasks["Task 1"].due_date == "2025-01-01"
+    assert tasks["Task 2"].description == "multi\nline"
+    assert tasks["Task 2"].priority == TaskPriority.URGENT
+
+
+def test_import_reports_row_errors(fake_repository):
+    importer = TaskImporter(fake_repository, batch_size=2)
+    stream = io.StringIO(
+        '{"title": "ok", "priority": "LOW"}\n'
+        "{broken json\n"
+        "\n"
+        '{"title": "no priority"}\n'
+        '{"title": "bad priority", "priority": "SOMEDAY"}\n'
+        '{"title": "", "priority": "LOW"}\n'
+    )
+
+    report = importer.import_stream(stream, "ndjson")
+
+    assert report.processed == 5
+    assert report.imported == 1
+    assert report.failed == 4
+    assert [error.row for error in report.errors] == [2, 4, 5, 6]
+    assert "priority" in report.errors[1].message
+
+
+def test_import_reports_failed_batches_and_truncates_errors(fake_repository):
+    fake_repository.fail_titles = {"poison"}
+    importer = TaskImporter(fake_repository, workers=1, batch_size=3, max_errors=2)
+    rows = [{"title": "poison" if i == 1 else f"Task {i}", "priority": "LOW"} for i in range(6)]
+
+    report = importer.import_stream(ndjson(*rows), "ndjson")
+
+    assert report.imported == 3
+    assert report.failed == 3
+    assert [error.row for error in report.errors] == [1, 2]
+    assert report.errors_truncated
+
+
+def test_import_reports_progress(fake_repository):
+    importer = TaskImporter(fake_repository, workers=2, batch_size=5)
+    snapshots = []
+
+    importer.import_stream(
+        ndjson(*[{"title": f"Task {i}", "priority": "LOW"} for i in range(20)]), "ndjson", progress=snapshots.append
+    )
+
+    assert len(snapshots) == 4
+    assert [snapshot.imported for snapshot in snapshots] == [5, 10, 15, 20]
+
+
+def test_import_stops_with_partial_report_on_invalid_utf8(fake_repository):
+    importer = TaskImporter(fake_repository, batch_size=10)
+    # 先頭のチャンクは読めるよう、壊れたバイト列の前に十分な行を置く
+    body = ('{"title": "ok", "priority": "LOW"}\n' * 1000).encode() + b'{"title": "\xff\xfe", "priority": "LOW"}\n'
+    stream = io.TextIOWrapper(io.BytesIO(body), encoding="utf-8", newline="")
+
+    report = importer.import_stream(stream, "ndjson")
+
+    assert report.aborted
+    assert "utf-8" in report.abort_reason
+    assert 0 < report.imported == report.processed < 1000
+    assert len(fake_repository.tasks) == report.imported
+
+
+def test_import_accepts_large_csv_fields_and_aborts_beyond_the_item_limit(fake_repository):
+    importer = TaskImporter(fake_repository)
+    large = "x" * 200_000
+    too_large = "y" * 500_000
+    stream = io.StringIO(
+        f"title,description,priority\r\nlarge,{large},LOW\r\ntoo large,{too_large},LOW\r\nafter,,LOW\r\n"
+    )
+
+    report = importer.import_stream(stream, "csv")
+
+    assert report.aborted
+    assert report.abort_reason.startswith("Stopped reading after row 2: field larger than field limit")
+    assert [task.description for task in fake_repository.list_tasks()] == [large]
@@ -0,0 +1,69 @@
+import pytest
+
+from src.domains.models.task import Task, TaskStatus
+from src.usecase.task_snapshot_exporter import TaskSnapshotExporter
+
+pa = pytest.importorskip("pyarrow")
+pq = pytest.importorskip("pyarrow.parquet")
+
+
+@pytest.fixture
+def repository(fake_repository):
+    # タスクを区分に振り分け、1ページ3件で返す
+    fake_repository.page_size = 3
+    return fake_repository
+
+
+def add_tasks(repository, count):
+    tasks = []
+    for i in range(count):
+        task = Task.create(title=f"task {i}", description="d" * i, due_date="2025-01-01", priority="HIGH")
+        if i % 2:
+            task.status = TaskStatus.DONE
+        tasks.append(task)
+    repository.batch_create_tasks(tasks)
+    return tasks
+
+
+def test_export_parquet_writes_dictionary_encoded_row_groups(repository, tmp_path):
+    tasks = add_tasks(repository, 20)
+    exporter = TaskSnapshotExporter(repository, segments=3, row_group_size=4)
+
+    report = exporter.export(str(tmp_path))
+
+    assert report.rows == 20
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["part-0000.parquet", "part-0001.parquet", "part-0002.parquet"]
+    first = pq.ParquetFile(tmp_path / "part-0000.parquet")
+    assert [first.metadata.row_group(i).num_rows for i in range(first.num_row_groups)] == [4, 3]
+    table = pq.read_table(tmp_path)
+    assert pa.types.is_dictionary(table.schema.field("status").type)
+    assert sorted(table.column("id").to_pylist()) == sorted(str(task.id) for task in tasks)
+    done = pq.read_table(tmp_path, filters=[("status", "=", "DONE")])
+    assert done.num_rows == 10
+    assert table.column("updated_at").type == pa.timestamp("ms", tz="UTC")
+
+
+def test_export_arrow_can_be_memory_mapped(repository, tmp_path):
+    add_tasks(repository, 5)
+    exporter = TaskSnapshotExporter(repository, segments=2, fmt="arrow", compression=None)
+
+    report = exporter.export(str(tmp_path))
+
+    rows = 0
+    for path in report.files:
+        with pa.memory_map(path) as source:
+            table = pa.ipc.open_file(source).read_all()
+        rows += table.num_rows
+        assert table.column("priority").to_pylist() == ["HIGH"] * table.num_rows
+    assert rows == 5
+    assert report.finished_at >= report.started_at
+
+
+def test_export_skips_empty_segments(repository, tmp_path):
+    add_tasks(repository, 1)
+    exporter = TaskSnapshotExporter(repository, segments=4)
+
+    report = exporter.export(str(tmp_path))
+
+    assert [p.name for p in tmp_path.iterdir()] == ["part-0000.parquet"]
+    assert report.rows == 1